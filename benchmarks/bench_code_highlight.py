@@ -0,0 +1,57 @@
+"""Benchmark the (docutils) syntax highlighting of a large code block.
+
+Renders a generated python code block, of 10,000 lines by default,
+then prints the time taken and the number of nodes created,
+with the code highlighted to a node per token, and to pre-rendered HTML.
+Run with ``python benchmarks/bench_code_highlight.py``.
+"""
+
+import argparse
+import io
+import time
+
+from docutils.core import publish_doctree
+
+from myst_parser.parsers.docutils_ import Parser
+
+
+def generate(lines: int) -> str:
+    """Generate a markdown document, with a single large python code block."""
+    body = "".join(
+        f"def function_{i}(value: int = {i}) -> str:  # comment {i}\n"
+        if i % 2 == 0
+        else f'    return f"{{value}} is {i}" + str([1, 2.5, None])\n'
+        for i in range(lines)
+    )
+    return f"```python\n{body}```\n\n```python\nprint('small')\n```\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-l", "--lines", type=int, default=10000)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = generate(args.lines)
+    for html in (False, True):
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            document = publish_doctree(
+                text,
+                parser=Parser(),
+                settings_overrides={
+                    "warning_stream": io.StringIO(),
+                    "myst_highlight_code_blocks_html": html,
+                },
+            )
+            times.append(time.perf_counter() - start)
+        num_nodes = sum(1 for _ in document.findall())
+        print(
+            f"{args.lines} lines, html={html}: {1e3 * min(times):.1f} ms "
+            f"(min of {args.repeat}), {num_nodes} nodes"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark the per-document cost of merging file-level (topmatter) configuration.
+
+Run with ``python benchmarks/bench_config.py``.
+"""
+
+import argparse
+import timeit
+
+from myst_parser.config.main import MdParserConfig, merge_file_level
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    config = MdParserConfig(
+        enable_extensions={"colon_fence", "deflist", "dollarmath", "substitution"},
+        substitutions={f"key{i}": f"value {i}" for i in range(100)},
+        inventories={f"inv{i}": (f"https://example.com/{i}", None) for i in range(20)},
+    )
+    topmatters = {
+        "empty": {"myst": {}},
+        "substitutions": {"myst": {"substitutions": {"key0": "other", "new": "x"}}},
+        "several": {
+            "myst": {
+                "heading_anchors": 2,
+                "enable_extensions": ["colon_fence", "dollarmath"],
+                "html_meta": {"description": "text"},
+            }
+        },
+    }
+
+    def warning(wtype, msg):
+        raise AssertionError(msg)
+
+    for name, topmatter in topmatters.items():
+        seconds = timeit.timeit(
+            lambda topmatter=topmatter: merge_file_level(config, topmatter, warning),
+            number=args.number,
+        )
+        print(
+            f"merge_file_level[{name}]: {1e6 * seconds / args.number:.1f} µs/document"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark loading a large (v2) ``objects.inv`` inventory.
+
+Generates a synthetic inventory, of 500,000 entries by default,
+with a real-world-like mixture of domains, ``$`` abbreviated locations,
+``-`` display names and names containing spaces,
+then prints the time taken to load it.
+Run with ``python benchmarks/bench_inventory_load.py``.
+"""
+
+import argparse
+import io
+import time
+import zlib
+
+from myst_parser.inventory import load
+
+_TYPES = (
+    "py:function",
+    "py:class",
+    "py:method",
+    "py:attribute",
+    "py:module",
+    "std:label",
+    "std:term",
+    "std:doc",
+    "c:function",
+    "cpp:class",
+)
+
+
+def generate(entries: int) -> bytes:
+    """Generate the bytes of a compressed v2 inventory."""
+    lines = []
+    for i in range(entries):
+        type_ = _TYPES[i % len(_TYPES)]
+        if type_ in ("std:label", "std:term") and i % 3 == 0:
+            name = f"term number {i}"
+        else:
+            name = f"package.module_{i % 997}.Object_{i}"
+        location = f"api/module_{i % 997}.html#$" if i % 2 else f"page_{i}.html"
+        text = "-" if i % 4 else f"Display name for object {i}"
+        lines.append(f"{name} {type_} {i % 3 - 1} {location} {text}\n")
+    return (
+        b"# Sphinx inventory version 2\n"
+        b"# Project: Benchmark\n"
+        b"# Version: 1.0\n"
+        b"# The remainder of this file is compressed using zlib.\n"
+        + zlib.compress("".join(lines).encode())
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-e", "--entries", type=int, default=500_000)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = generate(args.entries)
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        inventory = load(io.BytesIO(data))
+        times.append(time.perf_counter() - start)
+    num_objects = sum(
+        len(names)
+        for objtypes in inventory["objects"].values()
+        for names in objtypes.values()
+    )
+    print(
+        f"{args.entries} entries ({len(data) / 1e6:.1f} MB compressed): "
+        f"{1e3 * min(times):.1f} ms (min of {args.repeat}), {num_objects} objects"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark the peak memory of building the syntax tree, that is rendered to docutils,
+for a large generated document.
+
+Each measurement runs in a fresh subprocess, so that peak RSS is comparable.
+Run with ``python benchmarks/bench_render_memory.py``.
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+
+
+def generate(sections: int) -> str:
+    """Generate a large document."""
+    return "".join(
+        f"# Section {i}\n\n"
+        f"Some *emphasised* text, `code` and a [link](https://example.com/{i}).\n\n"
+        "- item one\n- item **two**\n\n"
+        f"```python\nprint({i})\n```\n\n"
+        f"| a | b |\n|---|---|\n| {i} | x |\n\n"
+        for i in range(sections)
+    )
+
+
+def measure(tree: str, sections: int) -> None:
+    """Parse the document and build its syntax tree, then print the peak RSS."""
+    from markdown_it.tree import SyntaxTreeNode
+
+    from myst_parser.config.main import MdParserConfig
+    from myst_parser.mdit_to_docutils.base import DocutilsRenderer, TokenNode
+    from myst_parser.parsers.mdit import create_md_parser
+
+    md = create_md_parser(MdParserConfig(), DocutilsRenderer)
+    tokens = md.parse(generate(sections))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if tree == "SyntaxTreeNode":
+        # the line number rewriting applied before rendering, with a plain tree
+        for token in tokens:
+            if token.map:
+                token.map = [token.map[0] + 1, token.map[1] + 1]
+                for child in token.children or []:
+                    child.map = token.map
+        node = SyntaxTreeNode(tokens)
+    else:
+        node = TokenNode(tokens)
+    num_nodes = sum(1 for _ in node.walk())
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{tree}: {num_nodes} nodes, +{(peak - baseline) / 1024:.1f} MiB peak RSS")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-s", "--sections", type=int, default=20000)
+    parser.add_argument("--measure", choices=["SyntaxTreeNode", "TokenNode"])
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.sections)
+        return
+    for tree in ("SyntaxTreeNode", "TokenNode"):
+        subprocess.run(
+            [sys.executable, __file__, "--measure", tree, "-s", str(args.sections)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
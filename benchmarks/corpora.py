@@ -0,0 +1,150 @@
+"""Synthetic corpora of MyST documents, for benchmarking.
+
+Each corpus is a mapping of document names to source text,
+along with the extensions it requires,
+and is sized by a ``scale`` factor (1 being the default size).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Corpus:
+    """A set of documents to benchmark."""
+
+    name: str
+    documents: dict[str, str]
+    extensions: list[str] = field(default_factory=list)
+
+    @property
+    def num_lines(self) -> int:
+        return sum(text.count("\n") for text in self.documents.values())
+
+
+def _section(i: int) -> str:
+    return (
+        f"## Section {i}\n\n"
+        f"Some *emphasised* and **strong** text, with `code` in paragraph {i},\n"
+        "which continues over a second line.\n\n"
+        "- a list item\n- another item, with *emphasis*\n\n"
+        "> a block quote\n\n"
+    )
+
+
+def many_small(scale: float) -> Corpus:
+    """Many small documents."""
+    return Corpus(
+        "many_small",
+        {
+            f"doc{n}": f"# Document {n}\n\n" + "".join(_section(i) for i in range(3))
+            for n in range(max(1, int(200 * scale)))
+        },
+    )
+
+
+def one_huge(scale: float) -> Corpus:
+    """A single, very large document."""
+    return Corpus(
+        "one_huge",
+        {
+            "index": "# Huge\n\n"
+            + "".join(_section(i) for i in range(int(3000 * scale)))
+        },
+    )
+
+
+def directive_heavy(scale: float) -> Corpus:
+    """Documents dominated by directives."""
+
+    def directives(i: int) -> str:
+        return (
+            f"## Directives {i}\n\n"
+            f"```{{note}}\nA note with *emphasis*, number {i}.\n```\n\n"
+            ":::{admonition} A title\n:class: tip\n\nAn admonition.\n:::\n\n"
+            "```{code-block} python\n:linenos:\n\nprint('hallo')\n```\n\n"
+            "```{list-table}\n:header-rows: 1\n\n* - a\n  - b\n* - 1\n  - 2\n```\n\n"
+            "```{warning}\n:::{note}\nNested.\n:::\n```\n\n"
+        )
+
+    return Corpus(
+        "directive_heavy",
+        {
+            f"doc{n}": f"# Document {n}\n\n" + "".join(directives(i) for i in range(20))
+            for n in range(max(1, int(20 * scale)))
+        },
+        extensions=["colon_fence"],
+    )
+
+
+def directive_dense(scale: float) -> Corpus:
+    """A single document, with thousands of small directives."""
+    return Corpus(
+        "directive_dense",
+        {
+            "index": "# Directives\n\n"
+            + "".join(
+                f"```{{code-block}} python\nprint({i})\n```\n\n"
+                f"```{{note}}\nNote {i}.\n```\n\n"
+                for i in range(int(2000 * scale))
+            )
+        },
+    )
+
+
+def link_heavy(scale: float) -> Corpus:
+    """Documents dominated by internal and external links."""
+    num_docs = max(1, int(20 * scale))
+
+    def links(n: int, i: int) -> str:
+        other = (n + 1) % num_docs
+        return (
+            f"({n}-target-{i})=\n## Links {i}\n\n"
+            f"An [external link](https://example.com/{i}), <https://example.com>,\n"
+            f"a [local link](#{n}-target-{i}), a [heading link](#links-{i}),\n"
+            f"a [document link](doc{other}.md), a [reference][ref{i}]\n"
+            f"and [another document](<project:doc{other}.md#links-{i}>).\n\n"
+            f"[ref{i}]: https://example.com/ref/{i}\n\n"
+        )
+
+    return Corpus(
+        "link_heavy",
+        {
+            f"doc{n}": f"# Document {n}\n\n" + "".join(links(n, i) for i in range(30))
+            for n in range(num_docs)
+        },
+    )
+
+
+def math_heavy(scale: float) -> Corpus:
+    """Documents dominated by math."""
+
+    def maths(i: int) -> str:
+        return (
+            f"## Math {i}\n\n"
+            f"Inline $x_{i}^2 + y^2 = z^2$ and $\\alpha_{i}$ maths.\n\n"
+            f"$$\n\\int_0^{i} f(x) dx\n$$ (eq-{i})\n\n"
+            "\\begin{gather*}\na_1=b_1+c_1\\\\\na_2=b_2+c_2-d_2+e_2\n\\end{gather*}\n\n"
+        )
+
+    return Corpus(
+        "math_heavy",
+        {
+            f"doc{n}": f"# Document {n}\n\n" + "".join(maths(i) for i in range(40))
+            for n in range(max(1, int(20 * scale)))
+        },
+        extensions=["dollarmath", "amsmath"],
+    )
+
+
+CORPORA: dict[str, Callable[[float], Corpus]] = {
+    "many_small": many_small,
+    "one_huge": one_huge,
+    "directive_heavy": directive_heavy,
+    "directive_dense": directive_dense,
+    "link_heavy": link_heavy,
+    "math_heavy": math_heavy,
+}
+"""The corpora, by name."""
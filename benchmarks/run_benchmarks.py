@@ -0,0 +1,287 @@
+"""Benchmark the stages of the MyST docutils and sphinx pipelines,
+over synthetic corpora, and output the timings as JSON.
+
+The stages are:
+
+- ``create_md_parser``: creating the markdown-it parser
+- ``parse``: ``MarkdownIt.parse`` of each document
+- ``render``: ``DocutilsRenderer.render`` of each document's tokens
+- ``transform:<name>``: each transform in ``myst_parser.mdit_to_docutils.transforms``
+- ``docutils_html5``: the ``myst-docutils-html5`` CLI, for each document
+- ``sphinx_build``: a full (fresh) sphinx HTML build of the corpus
+- ``MystReferenceResolver.run``: the total time spent in this post-transform,
+  during the sphinx build
+
+Run with e.g. ``python benchmarks/run_benchmarks.py --scale 0.5 -o results.json``,
+and compare results between releases with ``--compare old.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from corpora import CORPORA, Corpus
+from docutils.frontend import get_default_settings
+from docutils.utils import new_document
+
+from myst_parser.config.main import MdParserConfig
+from myst_parser.mdit_to_docutils import transforms
+from myst_parser.mdit_to_docutils.base import DocutilsRenderer
+from myst_parser.parsers.docutils_ import Parser, cli_html5
+from myst_parser.parsers.mdit import create_md_parser
+
+TRANSFORMS = sorted(
+    (
+        transforms.UnreferencedFootnotesDetector,
+        transforms.SortFootnotes,
+        transforms.CollectFootnotes,
+        transforms.AddSlugIds,
+        transforms.PrioritiseExplicitIds,
+        transforms.ResolveAnchorIds,
+    ),
+    key=lambda transform: transform.default_priority,
+)
+"""The MyST transforms, in the order they are applied."""
+
+Stage = Callable[[Corpus, Path], dict[str, float]]
+"""A function to run one repetition of a benchmark, returning the seconds per stage."""
+
+
+def _config(corpus: Corpus) -> MdParserConfig:
+    return MdParserConfig(enable_extensions=set(corpus.extensions), heading_anchors=2)
+
+
+def _new_document(name: str):
+    settings = get_default_settings(Parser)
+    settings.warning_stream = io.StringIO()
+    settings.report_level = 5
+    return new_document(name, settings)
+
+
+def _render_all(md, parsed: dict[str, tuple[list, dict]]) -> tuple[list, float]:
+    """Render the parsed documents, returning the documents and the time taken."""
+    documents = []
+    seconds = 0.0
+    for name, (tokens, env) in parsed.items():
+        document = _new_document(name)
+        md.options["document"] = document
+        start = time.perf_counter()
+        md.renderer.render(tokens, md.options, dict(env))
+        seconds += time.perf_counter() - start
+        documents.append(document)
+    md.options.pop("document", None)
+    return documents, seconds
+
+
+def bench_parser(corpus: Corpus, workdir: Path) -> dict[str, float]:
+    """Benchmark parser creation, parsing, rendering and the MyST transforms."""
+    config = _config(corpus)
+    start = time.perf_counter()
+    md = create_md_parser(config, DocutilsRenderer)
+    results = {"create_md_parser": time.perf_counter() - start}
+
+    parsed = {}
+    start = time.perf_counter()
+    for name, text in corpus.documents.items():
+        env: dict[str, Any] = {}
+        parsed[name] = (md.parse(text, env), env)
+    results["parse"] = time.perf_counter() - start
+
+    documents, results["render"] = _render_all(md, parsed)
+    for transform in TRANSFORMS:
+        start = time.perf_counter()
+        for document in documents:
+            transform(document).apply()
+        results[f"transform:{transform.__name__}"] = time.perf_counter() - start
+    return results
+
+
+def bench_docutils_cli(corpus: Corpus, workdir: Path) -> dict[str, float]:
+    """Benchmark the ``myst-docutils-html5`` CLI, for each document."""
+    srcdir = workdir / "docutils"
+    srcdir.mkdir(exist_ok=True)
+    paths = []
+    for name, text in corpus.documents.items():
+        path = srcdir / f"{name}.md"
+        path.write_text(text, encoding="utf8")
+        paths.append(path)
+    options = ["--report=5", "--myst-heading-anchors=2"]
+    if corpus.extensions:
+        options.append(f"--myst-enable-extensions={','.join(corpus.extensions)}")
+    start = time.perf_counter()
+    for path in paths:
+        cli_html5([str(path), str(path.with_suffix(".html")), *options])
+    return {"docutils_html5": time.perf_counter() - start}
+
+
+@contextlib.contextmanager
+def _time_method(cls: type, name: str, totals: dict[str, float]) -> Iterator[None]:
+    """Accumulate the time spent in a method."""
+    original = getattr(cls, name)
+    key = f"{cls.__name__}.{name}"
+    totals[key] = 0.0
+
+    def _wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            totals[key] += time.perf_counter() - start
+
+    setattr(cls, name, _wrapper)
+    try:
+        yield
+    finally:
+        setattr(cls, name, original)
+
+
+def bench_sphinx(corpus: Corpus, workdir: Path) -> dict[str, float]:
+    """Benchmark a full sphinx HTML build."""
+    from sphinx.application import Sphinx
+
+    from myst_parser.sphinx_ext.myst_refs import MystReferenceResolver
+
+    srcdir = workdir / "sphinx"
+    srcdir.mkdir(exist_ok=True)
+    (srcdir / "conf.py").write_text(
+        "extensions = ['myst_parser']\n"
+        f"myst_enable_extensions = {corpus.extensions!r}\n"
+        "myst_heading_anchors = 2\n"
+        "suppress_warnings = ['myst', 'toc']\n",
+        encoding="utf8",
+    )
+    documents = dict(corpus.documents)
+    if "index" not in documents:
+        documents["index"] = "# Index\n\n```{toctree}\n:glob:\n\n*\n```\n"
+    for name, text in documents.items():
+        (srcdir / f"{name}.md").write_text(text, encoding="utf8")
+
+    results: dict[str, float] = {}
+    with _time_method(MystReferenceResolver, "run", results):
+        start = time.perf_counter()
+        app = Sphinx(
+            str(srcdir),
+            str(srcdir),
+            str(workdir / "sphinx_build"),
+            str(workdir / "sphinx_build" / ".doctrees"),
+            "html",
+            status=None,
+            warning=io.StringIO(),
+            freshenv=True,
+        )
+        app.build(force_all=True)
+        results["sphinx_build"] = time.perf_counter() - start
+    return results
+
+
+STAGES: dict[str, Stage] = {
+    "parser": bench_parser,
+    "docutils": bench_docutils_cli,
+    "sphinx": bench_sphinx,
+}
+"""The benchmark groups, by name."""
+
+
+def run(
+    corpus_names: list[str], group_names: list[str], scale: float, repeat: int
+) -> list[dict[str, Any]]:
+    """Run the benchmarks, returning a result per corpus and stage."""
+    results = []
+    for corpus_name in corpus_names:
+        corpus = CORPORA[corpus_name](scale)
+        for group_name in group_names:
+            timings: dict[str, list[float]] = {}
+            for _ in range(repeat):
+                with tempfile.TemporaryDirectory() as tempdir:
+                    for stage, seconds in STAGES[group_name](
+                        corpus, Path(tempdir)
+                    ).items():
+                        timings.setdefault(stage, []).append(seconds)
+            for stage, times in timings.items():
+                results.append(
+                    {
+                        "corpus": corpus.name,
+                        "stage": stage,
+                        "documents": len(corpus.documents),
+                        "lines": corpus.num_lines,
+                        "times": times,
+                        "min": min(times),
+                        "median": statistics.median(times),
+                        "mean": statistics.mean(times),
+                    }
+                )
+                print(
+                    f"{corpus.name:16} {stage:40} {1e3 * min(times):10.2f} ms",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> None:
+    """Print the relative change in minimum time, per corpus and stage."""
+    previous = {(r["corpus"], r["stage"]): r["min"] for r in old["results"]}
+    for result in new["results"]:
+        key = (result["corpus"], result["stage"])
+        if previous.get(key):
+            change = 100 * (result["min"] - previous[key]) / previous[key]
+            print(f"{key[0]:16} {key[1]:40} {change:+7.1f}%", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "-c", "--corpus", action="append", choices=list(CORPORA), help="(repeatable)"
+    )
+    parser.add_argument(
+        "-g", "--group", action="append", choices=list(STAGES), help="(repeatable)"
+    )
+    parser.add_argument("-s", "--scale", type=float, default=1.0)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", type=Path, help="write JSON to this file")
+    parser.add_argument("--compare", type=Path, help="a previous JSON output")
+    args = parser.parse_args()
+
+    output = {
+        "meta": {
+            "datetime": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "versions": {
+                name: version(name)
+                for name in ("myst-parser", "markdown-it-py", "docutils", "sphinx")
+            },
+            "scale": args.scale,
+            "repeat": args.repeat,
+        },
+        "results": run(
+            args.corpus or list(CORPORA),
+            args.group or list(STAGES),
+            args.scale,
+            args.repeat,
+        ),
+    }
+    if args.compare:
+        compare(json.loads(args.compare.read_text(encoding="utf8")), output)
+    if args.output:
+        args.output.write_text(json.dumps(output, indent=2), encoding="utf8")
+    else:
+        print(json.dumps(output, indent=2))
+
+
+if __name__ == "__main__":
+    main()
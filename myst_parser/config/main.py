@@ -1,10 +1,15 @@
 """The configuration for the myst parser."""
 
+import copy
 import dataclasses as dc
-from collections.abc import Callable, Iterable, Iterator, Sequence
+import hashlib
+import sys
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
 from importlib import import_module
+from types import CodeType
 from typing import (
     Any,
+    Literal,
     TypedDict,
 )
 
@@ -181,6 +186,77 @@ def check_fence_as_directive(
     setattr(inst, field.name, set(value))
 
 
+def _freeze_value(value: Any) -> Hashable:
+    """Convert a field value to an immutable, hashable equivalent.
+
+    Mappings are converted to a frozenset of their items,
+    so that (as for dataclass equality) their order is not significant.
+    """
+    if isinstance(value, dict):
+        return frozenset((key, _freeze_value(val)) for key, val in value.items())
+    if isinstance(value, set | frozenset):
+        return frozenset(_freeze_value(val) for val in value)
+    if isinstance(value, list | tuple):
+        return tuple(_freeze_value(val) for val in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _is_importable(value: Any) -> bool:
+    """Return whether an object can be retrieved by its module and qualified name,
+    which is not the case for lambdas, locally defined functions or bound methods.
+    """
+    obj = sys.modules.get(getattr(value, "__module__", None) or "")
+    for name in getattr(value, "__qualname__", "<unknown>").split("."):
+        obj = getattr(obj, name, None)
+    return obj is value
+
+
+def _code_digest(code: CodeType) -> str:
+    """Return a digest of a code object, which changes if the function is edited."""
+    hasher = hashlib.sha256(code.co_code)
+    hasher.update(repr(code.co_names).encode("utf8"))
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            hasher.update(_code_digest(const).encode("utf8"))
+        else:
+            hasher.update(repr(const).encode("utf8"))
+    return hasher.hexdigest()[:16]
+
+
+def _is_process_local(value: Hashable) -> bool:
+    """Return whether a frozen field value can only be identified within the process."""
+    if isinstance(value, tuple | frozenset):
+        return any(_is_process_local(val) for val in value)
+    return callable(value) and not _is_importable(value)
+
+
+def _fingerprint_value(value: Hashable) -> str:
+    """Return a string for a frozen field value.
+
+    This is stable across processes, unless the value includes a callable
+    that cannot be imported, which is then identified by its (per-process) id.
+    """
+    if isinstance(value, tuple):
+        return f"({','.join(_fingerprint_value(val) for val in value)})"
+    if isinstance(value, frozenset):
+        # the iteration order of sets depends on the (per-process) hash seed
+        return f"{{{','.join(sorted(_fingerprint_value(val) for val in value))}}}"
+    if callable(value) and hasattr(value, "__qualname__"):
+        # the repr of a function includes its (per-process) memory address
+        name = f"{getattr(value, '__module__', None)}.{value.__qualname__}"
+        if isinstance(code := getattr(value, "__code__", None), CodeType):
+            name += f":{_code_digest(code)}"
+        if not _is_importable(value):
+            # e.g. lambdas with the same code, but different closures
+            name += f" at {id(value):#x}"
+        return f"<{name}>"
+    return repr(value)
+
+
 @dc.dataclass()
 class MdParserConfig:
     """Configuration options for the Markdown Parser.
@@ -481,6 +557,59 @@ class MdParserConfig:
         },
     )
 
+    render_engine: Literal["tree", "stream"] = dc.field(
+        default="tree",
+        metadata={
+            "validator": in_(["tree", "stream"]),
+            "help": "Render the syntax tree of the whole document (tree), "
+            "or of each top-level block in turn (stream), "
+            "which lowers peak memory for large documents",
+        },
+    )
+
+    render_chunk_lines: int = dc.field(
+        default=0,
+        metadata={
+            "validator": instance_of(int),
+            "help": "If above zero, parse and render the source in chunks "
+            "of (at least) this many lines, split at top-level headings, "
+            "which bounds peak memory for very large documents",
+        },
+    )
+
+    token_cache: bool = dc.field(
+        default=False,
+        metadata={
+            "validator": instance_of(bool),
+            "help": "Cache the parsed tokens of each document on disk, "
+            "keyed by its source text and the parser configuration, "
+            "so that unchanged documents are not re-parsed "
+            "(in sphinx, stored in the doctree directory)",
+            "global_only": True,
+        },
+    )
+
+    token_cache_max_size: int = dc.field(
+        default=256,
+        metadata={
+            "validator": instance_of(int),
+            "help": "Maximum size of the token cache in MiB, "
+            "beyond which the least recently used entries are evicted",
+            "global_only": True,
+        },
+    )
+
+    profile: bool = dc.field(
+        default=False,
+        metadata={
+            "validator": instance_of(bool),
+            "help": "Record the time spent in each phase of parsing and rendering, "
+            "and report a summary at the end of the build "
+            "(also enabled by the MYST_PROFILE environment variable)",
+            "global_only": True,
+        },
+    )
+
     # docutils only (replicating aspects of sphinx config)
 
     suppress_warnings: Sequence[str] = dc.field(
@@ -502,6 +631,27 @@ class MdParserConfig:
         },
     )
 
+    highlight_code_blocks_html: bool = dc.field(
+        default=False,
+        metadata={
+            "validator": instance_of(bool),
+            "help": "Output highlighted code blocks as pre-rendered HTML, "
+            "rather than a node per token "
+            "(which is still used for other writers, or if raw content is disabled)",
+            "omit": ["sphinx"],
+        },
+    )
+
+    token_cache_dir: str = dc.field(
+        default=".myst_cache",
+        metadata={
+            "validator": instance_of(str),
+            "help": "Directory of the token cache",
+            "omit": ["sphinx"],
+            "global_only": True,
+        },
+    )
+
     inventories: dict[str, tuple[str, str | None]] = dc.field(
         default_factory=dict,
         repr=False,
@@ -513,9 +663,109 @@ class MdParserConfig:
         },
     )
 
+    inventory_max_memory: int = dc.field(
+        default=256,
+        metadata={
+            "validator": instance_of(int),
+            "help": "Maximum (estimated) memory in MiB of the loaded inventories, "
+            "which are shared by all documents in a process, "
+            "beyond which the least recently used are evicted",
+            "omit": ["sphinx"],
+            "global_only": True,
+        },
+    )
+
+    inventory_cache: bool = dc.field(
+        default=False,
+        metadata={
+            "validator": instance_of(bool),
+            "help": "Cache the loaded inventories on disk, "
+            "so that they are shared across documents and runs",
+            "omit": ["sphinx"],
+            "global_only": True,
+        },
+    )
+
+    inventory_cache_dir: str = dc.field(
+        default="",
+        metadata={
+            "validator": instance_of(str),
+            "help": "Directory of the inventory cache "
+            "(by default, `myst-parser/inventories` in the user cache directory)",
+            "omit": ["sphinx"],
+            "global_only": True,
+        },
+    )
+
+    inventory_cache_ttl: int = dc.field(
+        default=86400,
+        metadata={
+            "validator": instance_of(int),
+            "help": "Time in seconds, for which a loaded (or cached) remote inventory "
+            "is used, before it is reloaded (with a conditional request, if cached)",
+            "omit": ["sphinx"],
+            "global_only": True,
+        },
+    )
+
     def __post_init__(self):
         validate_fields(self)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # invalidate the cached snapshots
+        self.__dict__.pop("_frozen", None)
+        self.__dict__.pop("_fingerprint", None)
+
+    def freeze(self) -> tuple[tuple[str, Hashable], ...]:
+        """Return an immutable, hashable snapshot of the field values,
+        as ``(name, value)`` pairs.
+
+        The snapshot is cached until a field is next set.
+        Note, in-place mutation of a field value (e.g. of the ``substitutions`` dict)
+        is not detected.
+        """
+        try:
+            return self.__dict__["_frozen"]
+        except KeyError:
+            pass
+        frozen = tuple(
+            (field.name, _freeze_value(getattr(self, field.name)))
+            for field in dc.fields(self)
+        )
+        self.__dict__["_frozen"] = frozen
+        return frozen
+
+    def fingerprint(self) -> str:
+        """Return a content-based hash of the configuration.
+
+        Equal configurations have the same fingerprint, so it can be used as a cache key.
+        Callables are identified by their import path and code,
+        except those that cannot be imported (such as lambdas or local functions),
+        which are identified by their object id,
+        see :meth:`is_fingerprint_stable`.
+        Caching is as for :meth:`freeze`.
+        """
+        try:
+            return self.__dict__["_fingerprint"]
+        except KeyError:
+            pass
+        content = ";".join(
+            f"{name}={_fingerprint_value(value)}" for name, value in self.freeze()
+        )
+        fingerprint = hashlib.sha256(content.encode("utf8")).hexdigest()
+        self.__dict__["_fingerprint"] = fingerprint
+        return fingerprint
+
+    def is_fingerprint_stable(self) -> bool:
+        """Return whether the fingerprint is stable across processes,
+        so that it can be used to persist data (such as parsed tokens).
+
+        This is not the case if any value includes a callable that cannot be imported,
+        such as a lambda or locally defined function.
+        """
+        return not any(_is_process_local(value) for _, value in self.freeze())
+
     def copy(self, **kwargs: Any) -> "MdParserConfig":
         """Return a new object replacing specified fields with new values.
 
@@ -534,9 +784,8 @@ class MdParserConfig:
 
     def as_triple(self) -> Iterable[tuple[str, Any, dc.Field]]:
         """Yield triples of (name, value, field)."""
-        fields = {f.name: f for f in dc.fields(self.__class__)}
-        for name, value in dc.asdict(self).items():
-            yield name, value, fields[name]
+        for field in dc.fields(self):
+            yield field.name, getattr(self, field.name), field
 
 
 def merge_file_level(
@@ -549,7 +798,8 @@ def merge_file_level(
     :param config: Global config.
     :param topmatter: Topmatter from the file.
     :param warning: Function to call with a warning (type, message).
-    :returns: A new config object
+    :returns: A new config object,
+        which shares the (unchanged) field values of the global config
     """
     # get updates
     updates: dict[str, Any] = {}
@@ -574,16 +824,18 @@ def merge_file_level(
         )
         updates["substitutions"] = topmatter["substitutions"]
 
-    new = config.copy()
+    # the global config has already been validated,
+    # so only the updated fields need validating, and the rest can be shared
+    new = copy.copy(config)
 
     # validate each update
-    fields = {name: (value, field) for name, value, field in config.as_triple()}
+    fields = {field.name: field for field in config.get_fields()}
     for name, value in updates.items():
         if name not in fields:
             warning(MystWarnings.MD_TOPMATTER, f"Unknown field: {name}")
             continue
 
-        old_value, field = fields[name]
+        old_value, field = getattr(config, name), fields[name]
 
         try:
             validate_field(new, field, value)
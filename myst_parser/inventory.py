@@ -11,12 +11,30 @@ from __future__ import annotations
 import argparse
 import functools
 import json
+import os
+import pickle
+import posixpath
 import re
+import sys
+import threading
+import time
 import zlib
-from collections.abc import Iterator
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import (
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
 from dataclasses import asdict, dataclass
-from typing import IO, TYPE_CHECKING, TypedDict
-from urllib.request import urlopen
+from hashlib import sha256
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, TypedDict, cast
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 
 import yaml
 
@@ -140,24 +158,18 @@ def _load_v2(stream: InventoryFileReader, base_url: str | None) -> InventoryType
     if "zlib" not in line:
         raise ValueError(f"invalid inventory header (not compressed): {line}")
 
-    for line in stream.read_compressed_lines():
-        # be careful to handle names with embedded spaces correctly
-        m = re.match(r"(?x)(.+?)\s+(\S+)\s+(-?\d+)\s+?(\S*)\s+(.*)", line.rstrip())
-        if not m:
+    objects = invdata["objects"]
+    for line in stream.read_compressed_text().split("\n")[:-1]:
+        fields = _split_v2_line(line.rstrip())
+        if fields is None:
             continue
-        name: str
-        type: str
-        name, type, _, location, text = m.groups()
+        name, type, location, text = fields
         if ":" not in type:
             # wrong type value. type should be in the form of "{domain}:{objtype}"
             #
             # Note: To avoid the regex DoS, this is implemented in python (refs: #8175)
             continue
-        if (
-            type == "py:module"
-            and type in invdata["objects"]
-            and name in invdata["objects"][type]
-        ):
+        if type == "py:module" and type in objects and name in objects[type]:
             # due to a bug in 1.1 and below,
             # two inventory entries are created
             # for Python modules, and the first
@@ -166,16 +178,49 @@ def _load_v2(stream: InventoryFileReader, base_url: str | None) -> InventoryType
         if location.endswith("$"):
             location = location[:-1] + name
         domain, objtype = type.split(":", 1)
-        invdata["objects"].setdefault(domain, {}).setdefault(objtype, {})
-        if not text or text == "-":
-            text = None
-        invdata["objects"][domain][objtype][name] = {"loc": location, "text": text}
+        objects.setdefault(domain, {}).setdefault(objtype, {})[name] = {
+            "loc": location,
+            "text": None if not text or text == "-" else text,
+        }
     return invdata
 
 
 _BUFSIZE = 16 * 1024
 
 
+_REGEX_V2_LINE = re.compile(r"(?x)(.+?)\s+(\S+)\s+(-?\d+)\s+?(\S*)\s+(.*)")
+
+
+def _split_v2_line(line: str) -> tuple[str, str, str, str] | None:
+    """Split a (right-stripped) v2 inventory line into name, type, location, text.
+
+    Lines whose fields are separated by single spaces, with no other whitespace
+    before the text (by far the most common layout), are split directly;
+    anything else falls back to the regex,
+    which also handles names with embedded spaces.
+    Returns ``None`` if the line is not a valid entry.
+    """
+    parts = line.split(" ", 4)
+    if len(parts) == 5:
+        name, type, priority, location, text = parts
+        if (
+            name
+            and type
+            and text
+            and text[0] != " "
+            and (priority[1:] if priority[:1] == "-" else priority).isdecimal()
+            # any whitespace other than the single space separators
+            # is not printable, so needs the regex to be split correctly
+            and line[: len(line) - len(text)].isprintable()
+            and text[0].isprintable()
+        ):
+            return name, type, location, text
+    m = _REGEX_V2_LINE.match(line)
+    if not m:
+        return None
+    return m[1], m[2], m[4], m[5]
+
+
 class InventoryFileReader:
     """A file reader for an inventory file.
 
@@ -221,15 +266,20 @@ class InventoryFileReader:
             self.buffer = b""
         yield decompressor.flush()
 
+    def read_compressed_text(self) -> str:
+        """Decompress the rest of the stream, in a single buffer."""
+        chunks = [self.buffer]
+        self.buffer = b""
+        if not self.eof:
+            chunks.append(self.stream.read())
+            self.eof = True
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(b"".join(chunks)) + decompressor.flush()
+        return data.decode()
+
     def read_compressed_lines(self) -> Iterator[str]:
-        buf = b""
-        for chunk in self.read_compressed_chunks():
-            buf += chunk
-            pos = buf.find(b"\n")
-            while pos != -1:
-                yield buf[:pos].decode()
-                buf = buf[pos + 1 :]
-                pos = buf.find(b"\n")
+        # the text after the final newline (if any) is not a complete line
+        yield from self.read_compressed_text().split("\n")[:-1]
 
 
 @functools.lru_cache(maxsize=256)
@@ -290,6 +340,203 @@ class InvMatch:
         return asdict(self)
 
 
+def _literal_segments(pattern: str) -> list[str]:
+    r"""Split a pattern into the literal text between its `*` wildcards.
+
+    `\*` is translated as a literal `*` (as in :func:`match_with_wildcard`).
+    """
+    segments = [""]
+    backslash_last = False
+    for char in pattern:
+        if backslash_last:
+            backslash_last = False
+            if char == "*":
+                segments[-1] += "*"
+                continue
+            segments[-1] += "\\"
+        if char == "\\":
+            backslash_last = True
+        elif char == "*":
+            segments.append("")
+        else:
+            segments[-1] += char
+    # note, a trailing backslash is ignored
+    return segments
+
+
+class InventoryIndex:
+    """An index of the targets in a set of inventories,
+    to filter them without matching every target against the filters.
+
+    Targets are grouped by (inventory, domain, object type),
+    in the iteration order of the inventories, and indexed by exact name,
+    and by sorted name (for patterns starting with a literal prefix).
+    """
+
+    def __init__(self, groups: Iterable[tuple[str, str, str, Iterable[str]]]):
+        """Initialise the index.
+
+        :param groups: the (inventory, domain, object type, names) of each group
+        """
+        self.groups: list[tuple[str, str, str]] = []
+        """The (inventory, domain, object type) of each group."""
+        self.entries: list[tuple[int, str]] = []
+        """The (group index, name) of each target, in iteration order."""
+        self._group_ranges: list[range] = []
+        self._by_name: dict[str, list[int]] = {}
+        for inv_name, domain, otype, names in groups:
+            start = len(self.entries)
+            group = len(self.groups)
+            self.groups.append((inv_name, domain, otype))
+            for name in names:
+                self._by_name.setdefault(name, []).append(len(self.entries))
+                self.entries.append((group, name))
+            self._group_ranges.append(range(start, len(self.entries)))
+        self._sorted_names = sorted(self._by_name)
+
+    def size(self) -> int:
+        """Estimate the memory used by the index, in bytes
+        (excluding the names, which are shared with the inventories).
+        """
+        getsizeof = sys.getsizeof
+        return (
+            getsizeof(self.groups)
+            + getsizeof(self.entries)
+            + len(self.entries) * getsizeof((0, ""))
+            + getsizeof(self._group_ranges)
+            + getsizeof(self._by_name)
+            + sum(map(getsizeof, self._by_name.values()))
+            + getsizeof(self._sorted_names)
+        )
+
+    @classmethod
+    def from_inventories(
+        cls, inventories: Mapping[str, InventoryType]
+    ) -> InventoryIndex:
+        """Build the index of a set of inventories.
+
+        The index must be rebuilt if the inventories are subsequently changed.
+        """
+        return cls(
+            (name, domain, otype, names)
+            for name, data in inventories.items()
+            for domain, otype, names in _inventory_groups(data)
+        )
+
+    @classmethod
+    def from_sphinx_inventories(
+        cls, inventories: Mapping[str, SphinxInventoryType]
+    ) -> InventoryIndex:
+        """Build the index of a set of sphinx style inventories.
+
+        The index must be rebuilt if the inventories are subsequently changed.
+        """
+        return cls(
+            (name, domain, otype, names)
+            for name, data in inventories.items()
+            for domain, otype, names in _sphinx_inventory_groups(data)
+        )
+
+    def filter(
+        self,
+        *,
+        invs: str | None = None,
+        domains: str | None = None,
+        otypes: str | None = None,
+        targets: str | None = None,
+    ) -> Iterator[tuple[str, str, str, str]]:
+        """Yield the (inventory, domain, object type, name) of each matching target,
+        in iteration order.
+
+        Filters are as for :func:`filter_inventories`.
+        """
+        groups = [
+            match_with_wildcard(inv_name, invs)
+            and match_with_wildcard(domain, domains)
+            and match_with_wildcard(otype, otypes)
+            for inv_name, domain, otype in self.groups
+        ]
+        segments = None if targets is None else _literal_segments(targets)
+        indices: Iterable[int]
+        if segments is not None and len(segments) == 1:
+            # an exact name
+            indices = self._by_name.get(segments[0], ())
+        elif segments is not None and segments[0]:
+            # a name starting with a literal prefix
+            prefix = segments[0]
+            regex = _create_regex(cast(str, targets))
+            found = []
+            position = bisect_left(self._sorted_names, prefix)
+            while position < len(self._sorted_names):
+                name = self._sorted_names[position]
+                if not name.startswith(prefix):
+                    break
+                if regex.fullmatch(name) is not None:
+                    found.extend(self._by_name[name])
+                position += 1
+            indices = sorted(found)
+        else:
+            # no literal prefix, so every target of the selected groups is checked
+            full_regex = None if targets is None else _create_regex(targets)
+            for group, selected in enumerate(groups):
+                if not selected:
+                    continue
+                inv_name, domain, otype = self.groups[group]
+                for index in self._group_ranges[group]:
+                    name = self.entries[index][1]
+                    if full_regex is None or full_regex.fullmatch(name) is not None:
+                        yield inv_name, domain, otype, name
+            return
+        for index in indices:
+            group, name = self.entries[index]
+            if groups[group]:
+                yield (*self.groups[group], name)
+
+
+def _inventory_groups(
+    inv_data: InventoryType,
+) -> Iterator[tuple[str, str, dict[str, InventoryItemType]]]:
+    for domain_name, dom_data in inv_data["objects"].items():
+        for obj_type, obj_data in dom_data.items():
+            yield domain_name, obj_type, obj_data
+
+
+def _sphinx_inventory_groups(
+    inv_data: SphinxInventoryType,
+) -> Iterator[tuple[str, str, dict[str, Any]]]:
+    for domain_obj_name, data in inv_data.items():
+        if ":" not in domain_obj_name:
+            continue
+        domain_name, obj_type = domain_obj_name.split(":", 1)
+        yield domain_name, obj_type, data
+
+
+def _scan_targets(
+    inventories: Mapping[str, Any],
+    groups: Callable[[Any], Iterable[tuple[str, str, Iterable[str]]]],
+    *,
+    invs: str | None,
+    domains: str | None,
+    otypes: str | None,
+    targets: str | None,
+) -> Iterator[tuple[str, str, str, str]]:
+    """Yield the (inventory, domain, object type, name) of each matching target,
+    matching every target against the filters.
+    """
+    for inv_name, inv_data in inventories.items():
+        if not match_with_wildcard(inv_name, invs):
+            continue
+        for domain_name, obj_type, names in groups(inv_data):
+            if not (
+                match_with_wildcard(domain_name, domains)
+                and match_with_wildcard(obj_type, otypes)
+            ):
+                continue
+            for target in names:
+                if match_with_wildcard(target, targets):
+                    yield inv_name, domain_name, obj_type, target
+
+
 def filter_inventories(
     inventories: dict[str, InventoryType],
     *,
@@ -297,6 +544,7 @@ def filter_inventories(
     domains: str | None = None,
     otypes: str | None = None,
     targets: str | None = None,
+    index: InventoryIndex | None = None,
 ) -> Iterator[InvMatch]:
     r"""Filter a set of inventories.
 
@@ -308,29 +556,35 @@ def filter_inventories(
     :param domains: the domain name filter
     :param otypes: the object type filter
     :param targets: the target name filter
+    :param index: An index of the inventories (built after any change to them),
+        to find the matching targets without matching every target
     """
-    for inv_name, inv_data in inventories.items():
-        if not match_with_wildcard(inv_name, invs):
-            continue
-        for domain_name, dom_data in inv_data["objects"].items():
-            if not match_with_wildcard(domain_name, domains):
-                continue
-            for obj_type, obj_data in dom_data.items():
-                if not match_with_wildcard(obj_type, otypes):
-                    continue
-                for target, item_data in obj_data.items():
-                    if match_with_wildcard(target, targets):
-                        yield InvMatch(
-                            inv=inv_name,
-                            domain=domain_name,
-                            otype=obj_type,
-                            name=target,
-                            project=inv_data["name"],
-                            version=inv_data["version"],
-                            base_url=inv_data["base_url"],
-                            loc=item_data["loc"],
-                            text=item_data["text"],
-                        )
+    matches = (
+        _scan_targets(
+            inventories,
+            _inventory_groups,
+            invs=invs,
+            domains=domains,
+            otypes=otypes,
+            targets=targets,
+        )
+        if index is None
+        else index.filter(invs=invs, domains=domains, otypes=otypes, targets=targets)
+    )
+    for inv_name, domain_name, obj_type, target in matches:
+        inv_data = inventories[inv_name]
+        item_data = inv_data["objects"][domain_name][obj_type][target]
+        yield InvMatch(
+            inv=inv_name,
+            domain=domain_name,
+            otype=obj_type,
+            name=target,
+            project=inv_data["name"],
+            version=inv_data["version"],
+            base_url=inv_data["base_url"],
+            loc=item_data["loc"],
+            text=item_data["text"],
+        )
 
 
 def filter_sphinx_inventories(
@@ -340,6 +594,7 @@ def filter_sphinx_inventories(
     domains: str | None = None,
     otypes: str | None = None,
     targets: str | None = None,
+    index: InventoryIndex | None = None,
 ) -> Iterator[InvMatch]:
     r"""Filter a set of sphinx style inventories.
 
@@ -351,43 +606,44 @@ def filter_sphinx_inventories(
     :param domains: the domain name filter
     :param otypes: the object type filter
     :param targets: the target name filter
+    :param index: An index of the inventories (built after any change to them),
+        to find the matching targets without matching every target
     """
-    for inv_name, inv_data in inventories.items():
-        if not match_with_wildcard(inv_name, invs):
-            continue
-        for domain_obj_name, data in inv_data.items():
-            if ":" not in domain_obj_name:
-                continue
-            domain_name, obj_type = domain_obj_name.split(":", 1)
-            if not (
-                match_with_wildcard(domain_name, domains)
-                and match_with_wildcard(obj_type, otypes)
-            ):
-                continue
-            for target in data:
-                if match_with_wildcard(target, targets):
-                    data_target = data[target]
-                    if hasattr(data_target, "project_name"):
-                        # Sphinx >= 8.2
-                        project = data_target.project_name
-                        version = data_target.project_version
-                        loc = data_target.uri
-                        text = data_target.display_name
-                    else:
-                        project, version, loc, text = data_target
-                    yield (
-                        InvMatch(
-                            inv=inv_name,
-                            domain=domain_name,
-                            otype=obj_type,
-                            name=target,
-                            project=project,
-                            version=version,
-                            base_url=None,
-                            loc=loc,
-                            text=None if (not text or text == "-") else text,
-                        )
-                    )
+    matches = (
+        _scan_targets(
+            inventories,
+            _sphinx_inventory_groups,
+            invs=invs,
+            domains=domains,
+            otypes=otypes,
+            targets=targets,
+        )
+        if index is None
+        else index.filter(invs=invs, domains=domains, otypes=otypes, targets=targets)
+    )
+    for inv_name, domain_name, obj_type, target in matches:
+        data_target = inventories[inv_name][f"{domain_name}:{obj_type}"][target]
+        if hasattr(data_target, "project_name"):
+            # Sphinx >= 8.2
+            project = data_target.project_name
+            version = data_target.project_version
+            loc = data_target.uri
+            text = data_target.display_name
+        else:
+            project, version, loc, text = data_target
+        yield (
+            InvMatch(
+                inv=inv_name,
+                domain=domain_name,
+                otype=obj_type,
+                name=target,
+                project=project,
+                version=version,
+                base_url=None,
+                loc=loc,
+                text=None if (not text or text == "-") else text,
+            )
+        )
 
 
 def filter_string(
@@ -411,9 +667,19 @@ def filter_string(
 
 
 def fetch_inventory(
-    uri: str, *, timeout: None | float = None, base_url: None | str = None
+    uri: str,
+    *,
+    timeout: None | float = None,
+    base_url: None | str = None,
+    cache: InventoryCache | None = None,
 ) -> InventoryType:
-    """Fetch an inventory from a URL or local path."""
+    """Fetch an inventory from a URL or local path.
+
+    :param cache: If given, re-use the inventory stored by a previous fetch,
+        whilst it is still valid
+    """
+    if cache is not None:
+        return cache.fetch(uri, timeout=timeout, base_url=base_url)
     if uri.startswith(("http://", "https://")):
         with urlopen(uri, timeout=timeout) as stream:
             return load(stream, base_url=base_url)
@@ -421,10 +687,552 @@ def fetch_inventory(
         return load(stream, base_url=base_url)
 
 
+def user_cache_dir() -> Path:
+    """Return the default directory of the inventory cache,
+    within the cache directory of the current user.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / "myst-parser" / "inventories"
+
+
+class InventoryCache:
+    """An on-disk cache of loaded inventories, keyed by URI and base URL,
+    which can be shared across documents, processes and runs.
+
+    Each entry is stored as a zlib compressed pickle in a separate file.
+    Local files are reloaded when their size or modification time changes.
+    Remote inventories are re-used for ``ttl`` seconds after they were last checked,
+    then revalidated with a conditional request,
+    using the ``ETag`` and ``Last-Modified`` headers of the previous response,
+    so that an unchanged inventory is not downloaded and parsed again.
+    """
+
+    suffix = ".inventory"
+
+    def __init__(self, path: str | os.PathLike[str], ttl: float = 86400) -> None:
+        """Initialise the cache.
+
+        :param path: The directory to store entries in (created on first write)
+        :param ttl: The time, in seconds, for which a remote inventory is re-used,
+            before it is revalidated
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        # guards the counters, since the cache is shared by loading threads
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.path)!r}, {self.ttl})"
+
+    @staticmethod
+    def key(uri: str, base_url: str | None) -> str:
+        """Return the cache key for an inventory."""
+        return sha256(f"{uri}\n{base_url}".encode("utf8", "surrogatepass")).hexdigest()
+
+    def fetch(
+        self, uri: str, *, timeout: float | None = None, base_url: str | None = None
+    ) -> InventoryType:
+        """Fetch an inventory from a URL or local path,
+        re-using the stored inventory, if it is still valid.
+        """
+        key = self.key(uri, base_url)
+        entry = self._read(key)
+
+        if not uri.startswith(("http://", "https://")):
+            stat = os.stat(uri)
+            validator: tuple[Any, Any] = (stat.st_mtime_ns, stat.st_size)
+            if entry is not None and entry["validator"] == validator:
+                with self._lock:
+                    self.hits += 1
+                return cast(InventoryType, entry["inventory"])
+            with open(uri, "rb") as stream:
+                invdata = load(stream, base_url=base_url)
+            with self._lock:
+                self.misses += 1
+            self._write(key, validator, invdata)
+            return invdata
+
+        if entry is not None and time.time() - entry["checked"] < self.ttl:
+            with self._lock:
+                self.hits += 1
+            return cast(InventoryType, entry["inventory"])
+        request = Request(uri)
+        if entry is not None:
+            etag, last_modified = entry["validator"]
+            if etag:
+                request.add_header("If-None-Match", etag)
+            if last_modified:
+                request.add_header("If-Modified-Since", last_modified)
+        try:
+            with urlopen(request, timeout=timeout) as stream:
+                invdata = load(stream, base_url=base_url)
+                validator = (
+                    stream.headers.get("ETag"),
+                    stream.headers.get("Last-Modified"),
+                )
+        except HTTPError as exc:
+            exc.close()
+            if exc.code != 304 or entry is None:
+                raise
+            # not modified
+            with self._lock:
+                self.revalidations += 1
+            self._write(key, entry["validator"], entry["inventory"])
+            return cast(InventoryType, entry["inventory"])
+        with self._lock:
+            self.misses += 1
+        self._write(key, validator, invdata)
+        return invdata
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        if self.path.is_dir():
+            for entry in self.path.glob("*" + self.suffix):
+                entry.unlink(missing_ok=True)
+
+    def report(self) -> str:
+        """Return a one-line summary of the cache usage."""
+        return (
+            f"{self.hits} hits, {self.revalidations} revalidations, "
+            f"{self.misses} misses"
+        )
+
+    def _read(self, key: str) -> dict[str, Any] | None:
+        """Return a stored entry, or None if not cached."""
+        entry = self.path / (key + self.suffix)
+        try:
+            return cast(
+                dict[str, Any], pickle.loads(zlib.decompress(entry.read_bytes()))
+            )
+        except FileNotFoundError:
+            return None
+        except (
+            OSError,
+            EOFError,
+            ValueError,
+            zlib.error,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+            TypeError,
+        ):
+            # a corrupt (e.g. partially written) entry
+            entry.unlink(missing_ok=True)
+            return None
+
+    def _write(
+        self, key: str, validator: tuple[Any, Any], invdata: InventoryType
+    ) -> None:
+        """Store an entry, ignoring any failure to do so."""
+        data = zlib.compress(
+            pickle.dumps(
+                {"validator": validator, "checked": time.time(), "inventory": invdata},
+                pickle.HIGHEST_PROTOCOL,
+            )
+        )
+        entry = self.path / (key + self.suffix)
+        temp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            temp.write_bytes(data)
+            # atomic, so that concurrent builds never read a partial entry
+            os.replace(temp, entry)
+        except OSError:
+            with suppress(OSError):
+                temp.unlink(missing_ok=True)
+
+
+_INVENTORY_CACHES: dict[tuple[str, float], InventoryCache] = {}
+_INVENTORY_CACHES_LOCK = threading.Lock()
+
+
+def get_inventory_cache(
+    path: str | os.PathLike[str], ttl: float = 86400
+) -> InventoryCache:
+    """Return the (process-wide) cache for a directory,
+    so that its usage statistics accumulate over a build.
+
+    :param path: The directory to store entries in
+    :param ttl: The time, in seconds, for which a remote inventory is re-used
+    """
+    key = (os.path.abspath(path), ttl)
+    with _INVENTORY_CACHES_LOCK:
+        try:
+            return _INVENTORY_CACHES[key]
+        except KeyError:
+            cache = _INVENTORY_CACHES[key] = InventoryCache(key[0], ttl)
+            return cache
+
+
+def inventory_size(invdata: InventoryType) -> int:
+    """Estimate the memory used by an inventory, in bytes."""
+    getsizeof = sys.getsizeof
+    size = getsizeof(invdata["objects"])
+    for objtypes in invdata["objects"].values():
+        size += getsizeof(objtypes)
+        for items in objtypes.values():
+            size += getsizeof(items)
+            for name, item in items.items():
+                size += getsizeof(name) + getsizeof(item) + getsizeof(item["loc"])
+                if item["text"] is not None:
+                    size += getsizeof(item["text"])
+    return size
+
+
+InventorySource = tuple[str, str | None, str | None]
+"""The (uri, path, base_url) of an inventory,
+where ``path`` defaults to ``objects.inv`` under the ``uri``."""
+
+
+@dataclass
+class InventorySet:
+    """A set of loaded inventories, with an index of their targets."""
+
+    inventories: dict[str, InventoryType]
+    """Mapping of inventory key to inventory data."""
+    index: InventoryIndex
+    """The index of the inventories."""
+    errors: dict[str, Exception]
+    """Mapping of inventory key to the exception raised when loading it."""
+
+
+class InventoryRegistry:
+    """An in-memory store of loaded inventories,
+    so that they are shared by all the documents rendered in a process.
+
+    Inventories are keyed by their source (uri, path, base_url),
+    and the least recently used are evicted,
+    once their total (estimated) size exceeds ``max_size`` bytes.
+    Local files are reloaded when their size or modification time changes,
+    remote inventories once ``ttl`` seconds old,
+    and failures to load remote inventories once ``failure_ttl`` seconds old,
+    so that a transient (e.g. network) error is soon retried.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float = 86400,
+        max_workers: int = 8,
+        failure_ttl: float = 60,
+    ) -> None:
+        """Initialise the registry.
+
+        :param max_size: The maximum total size of the inventories, in bytes
+        :param ttl: The time, in seconds, for which a remote inventory is re-used
+        :param max_workers: The maximum number of inventories to load concurrently
+        :param failure_ttl: The time, in seconds,
+            for which a failure to load a remote inventory is re-used
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.failure_ttl = failure_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size = 0
+        # source -> (inventory or exception, validator, size)
+        self._entries: OrderedDict[
+            InventorySource, tuple[InventoryType | Exception, Any, int]
+        ] = OrderedDict()
+        # sources -> (set, size)
+        self._sets: dict[
+            tuple[tuple[str, InventorySource], ...], tuple[InventorySet, int]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.max_size}, {self.ttl})"
+
+    def get_set(
+        self,
+        sources: Mapping[str, InventorySource],
+        *,
+        timeout: float | None = None,
+        cache: InventoryCache | None = None,
+        on_load: Callable[[str, str], None] | None = None,
+    ) -> InventorySet:
+        """Return the set of inventories for a mapping of keys to sources,
+        concurrently loading those not already stored.
+
+        The same set (and so index) is returned for the same sources,
+        until any of the inventories is reloaded or evicted.
+
+        :param timeout: The timeout for fetching a remote inventory
+        :param cache: The on-disk cache to fetch inventories through
+        :param on_load: Called with the key and the URL or path of each inventory,
+            before it is loaded (i.e. only if not already stored)
+        """
+        results = self.get_many(sources, timeout=timeout, cache=cache, on_load=on_load)
+        key = tuple(sources.items())
+        with self._lock:
+            stored = self._sets.get(key)
+        if stored is not None:
+            inv_set = stored[0]
+            if all(
+                inv_set.inventories.get(name, inv_set.errors.get(name)) is result
+                for name, result in results.items()
+            ):
+                return inv_set
+        inventories: dict[str, InventoryType] = {}
+        errors: dict[str, Exception] = {}
+        for name, result in results.items():
+            if isinstance(result, Exception):
+                errors[name] = result
+            else:
+                inventories[name] = result
+        inv_set = InventorySet(
+            inventories, InventoryIndex.from_inventories(inventories), errors
+        )
+        size = inv_set.index.size()
+        with self._lock:
+            if size <= self.max_size and all(
+                self._entries.get(source, (None,))[0] is results[name]
+                for name, source in sources.items()
+            ):
+                previous = self._sets.pop(key, None)
+                if previous is not None:
+                    self._size -= previous[1]
+                self._sets[key] = (inv_set, size)
+                self._size += size
+                self._evict()
+        return inv_set
+
+    def get_many(
+        self,
+        sources: Mapping[str, InventorySource],
+        *,
+        timeout: float | None = None,
+        cache: InventoryCache | None = None,
+        on_load: Callable[[str, str], None] | None = None,
+    ) -> dict[str, InventoryType | Exception]:
+        """Return the inventories for a mapping of keys to sources,
+        concurrently loading those not already stored.
+
+        :param timeout: The timeout for fetching a remote inventory
+        :param cache: The on-disk cache to fetch inventories through
+        :param on_load: Called with the key and the URL or path of each inventory,
+            before it is loaded (i.e. only if not already stored)
+        :returns: A mapping of the keys to the inventory,
+            or the exception raised when loading it
+        """
+        results: dict[str, InventoryType | Exception] = {}
+        missing: dict[str, InventorySource] = {}
+        for key, source in sources.items():
+            result = self._lookup(source)
+            if result is None:
+                missing[key] = source
+            else:
+                results[key] = result
+        if on_load is not None:
+            for key, source in missing.items():
+                on_load(key, self._load_path(source))
+
+        if len(missing) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(min(self.max_workers, len(missing))) as pool:
+                futures = {
+                    key: pool.submit(self._load, source, timeout, cache)
+                    for key, source in missing.items()
+                }
+                for key, future in futures.items():
+                    results[key] = future.result()
+        else:
+            for key, source in missing.items():
+                results[key] = self._load(source, timeout, cache)
+
+        return {key: results[key] for key in sources}
+
+    def size(self) -> int:
+        """Return the total (estimated) size of the inventories, in bytes."""
+        return self._size
+
+    def clear(self) -> None:
+        """Remove all inventories from the registry."""
+        with self._lock:
+            self._entries.clear()
+            self._sets.clear()
+            self._size = 0
+
+    def report(self) -> str:
+        """Return a one-line summary of the registry usage."""
+        return (
+            f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions "
+            f"({self.size() / 2**20:.1f} MiB)"
+        )
+
+    @staticmethod
+    def _load_path(source: InventorySource) -> str:
+        """Return the URL or local path to load an inventory from."""
+        uri, path, _ = source
+        return posixpath.join(uri, "objects.inv") if path is None else path
+
+    def _validator(self, load_path: str) -> Any:
+        """Return the expiry time of a remote inventory,
+        or a value that changes when a local inventory file changes.
+        """
+        if load_path.startswith(("http://", "https://")):
+            return time.time() + self.ttl
+        try:
+            stat = os.stat(load_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _lookup(self, source: InventorySource) -> InventoryType | Exception | None:
+        """Return a stored inventory (or exception),
+        or None if not stored (or outdated).
+        """
+        load_path = self._load_path(source)
+        remote = load_path.startswith(("http://", "https://"))
+        validator = None if remote else self._validator(load_path)
+        with self._lock:
+            entry = self._entries.get(source)
+            if entry is not None and (
+                entry[1] > time.time() if remote else entry[1] == validator
+            ):
+                self._entries.move_to_end(source)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def _load(
+        self,
+        source: InventorySource,
+        timeout: float | None,
+        cache: InventoryCache | None,
+    ) -> InventoryType | Exception:
+        """Load an inventory (or the exception raised when loading it),
+        and store it.
+        """
+        load_path = self._load_path(source)
+        validator = self._validator(load_path)
+        result: InventoryType | Exception
+        try:
+            result = fetch_inventory(
+                load_path, timeout=timeout, base_url=source[2], cache=cache
+            )
+        except Exception as exc:
+            result = exc
+        size = 0 if isinstance(result, Exception) else inventory_size(result)
+        if isinstance(result, Exception) and load_path.startswith(
+            ("http://", "https://")
+        ):
+            validator = time.time() + min(self.failure_ttl, self.ttl)
+        with self._lock:
+            self._discard(source)
+            if size <= self.max_size:
+                self._entries[source] = (result, validator, size)
+                self._size += size
+                self._evict()
+        return result
+
+    def _discard(self, source: InventorySource) -> None:
+        """Remove a stored inventory, and the sets that include it
+        (with the lock held).
+        """
+        entry = self._entries.pop(source, None)
+        if entry is None:
+            return
+        self._size -= entry[2]
+        for key in [key for key in self._sets if any(s == source for _, s in key)]:
+            self._size -= self._sets.pop(key)[1]
+
+    def _evict(self) -> None:
+        """Remove the least recently used inventories,
+        until within the maximum size (with the lock held).
+        """
+        while self._size > self.max_size and self._entries:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+
+_INVENTORY_REGISTRIES: dict[tuple[int, float], InventoryRegistry] = {}
+_INVENTORY_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_inventory_registry(max_size: int, ttl: float = 86400) -> InventoryRegistry:
+    """Return the (process-wide) inventory registry, with a maximum size and TTL.
+
+    :param max_size: The maximum total size of the inventories, in bytes
+    :param ttl: The time, in seconds, for which a remote inventory is re-used
+    """
+    key = (max_size, ttl)
+    with _INVENTORY_REGISTRIES_LOCK:
+        try:
+            return _INVENTORY_REGISTRIES[key]
+        except KeyError:
+            registry = _INVENTORY_REGISTRIES[key] = InventoryRegistry(max_size, ttl)
+            return registry
+
+
+def _fetch_cli_inventory(
+    uri: str, timeout: float | None, cache: InventoryCache | None
+) -> tuple[InventoryType, str | None]:
+    """Fetch an inventory for the CLI, from a URL (of the file or its parent)
+    or a local path, returning it and its base URL.
+    """
+    if uri.startswith(("http://", "https://")):
+        try:
+            invdata = fetch_inventory(uri, timeout=timeout, cache=cache)
+            return invdata, uri.rsplit("/", 1)[0]
+        except Exception:
+            invdata = fetch_inventory(
+                uri + "/objects.inv", timeout=timeout, cache=cache
+            )
+            return invdata, uri
+    return fetch_inventory(uri, cache=cache), None
+
+
+def _filter_cli_inventory(
+    invdata: InventoryType, base_url: str | None, args: argparse.Namespace
+) -> InventoryType:
+    """Filter an inventory by the CLI arguments.
+
+    Each target is matched against the filters (without building an index),
+    since the inventory is only filtered once.
+    """
+    filtered: InventoryType = {
+        "name": invdata["name"],
+        "version": invdata["version"],
+        "base_url": base_url,
+        "objects": {},
+    }
+    for domain_name, obj_type, items in _inventory_groups(invdata):
+        if not (
+            match_with_wildcard(domain_name, args.domain)
+            and match_with_wildcard(obj_type, args.object_type)
+        ):
+            continue
+        for name, item in items.items():
+            if not match_with_wildcard(name, args.name):
+                continue
+            if args.loc and not match_with_wildcard(item["loc"], args.loc):
+                continue
+            filtered["objects"].setdefault(domain_name, {}).setdefault(obj_type, {})[
+                name
+            ] = {"loc": item["loc"], "text": item["text"]}
+    return filtered
+
+
 def inventory_cli(inputs: None | list[str] = None):
-    """Command line interface for fetching and parsing an inventory."""
-    parser = argparse.ArgumentParser(description="Parse an inventory file.")
-    parser.add_argument("uri", metavar="[URL|PATH]", help="URI of the inventory file")
+    """Command line interface for fetching and parsing inventories."""
+    parser = argparse.ArgumentParser(description="Parse inventory files.")
+    parser.add_argument(
+        "uris",
+        nargs="+",
+        metavar="[URL|PATH]",
+        help="URI of the inventory file (multiple URIs are fetched concurrently)",
+    )
     parser.add_argument(
         "-d",
         "--domain",
@@ -465,47 +1273,67 @@ def inventory_cli(inputs: None | list[str] = None):
         metavar="SECONDS",
         help="Timeout for fetching the inventory",
     )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        help="Cache fetched inventories in this directory",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=86400,
+        metavar="SECONDS",
+        help="Time for which a cached remote inventory is used, before revalidation",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=8,
+        metavar="N",
+        help="Maximum number of inventories to fetch concurrently",
+    )
     args = parser.parse_args(inputs)
 
-    base_url = None
-    if args.uri.startswith("http://") or args.uri.startswith("https://"):
-        try:
-            with urlopen(args.uri, timeout=args.timeout) as stream:
-                invdata = load(stream)
-            base_url = args.uri.rsplit("/", 1)[0]
-        except Exception:
-            with urlopen(args.uri + "/objects.inv", timeout=args.timeout) as stream:
-                invdata = load(stream)
-            base_url = args.uri
-    else:
-        with open(args.uri, "rb") as stream:
-            invdata = load(stream)
+    cache = (
+        None
+        if args.cache_dir is None
+        else InventoryCache(args.cache_dir, args.cache_ttl)
+    )
 
-    filtered: InventoryType = {
-        "name": invdata["name"],
-        "version": invdata["version"],
-        "base_url": base_url,
-        "objects": {},
-    }
-    for match in filter_inventories(
-        {"": invdata},
-        domains=args.domain,
-        otypes=args.object_type,
-        targets=args.name,
-    ):
-        if args.loc and not match_with_wildcard(match.loc, args.loc):
-            continue
-        filtered["objects"].setdefault(match.domain, {}).setdefault(match.otype, {})[
-            match.name
-        ] = {
-            "loc": match.loc,
-            "text": match.text,
+    if len(args.uris) == 1:
+        invdata, base_url = _fetch_cli_inventory(args.uris[0], args.timeout, cache)
+        filtered = _filter_cli_inventory(invdata, base_url, args)
+        if args.format == "json":
+            print(json.dumps(filtered, indent=2, sort_keys=False))
+        else:
+            print(yaml.dump(filtered, sort_keys=False))
+        return
+
+    # output each inventory as soon as it is fetched,
+    # as a YAML document or a JSON line, identified by its URI
+    failed = False
+    with ThreadPoolExecutor(max(1, min(args.jobs, len(args.uris)))) as pool:
+        futures = {
+            pool.submit(_fetch_cli_inventory, uri, args.timeout, cache): uri
+            for uri in args.uris
         }
-
-    if args.format == "json":
-        print(json.dumps(filtered, indent=2, sort_keys=False))
-    else:
-        print(yaml.dump(filtered, sort_keys=False))
+        for future in as_completed(futures):
+            uri = futures[future]
+            try:
+                invdata, base_url = future.result()
+            except Exception as exc:
+                print(f"Failed to load inventory {uri!r}: {exc}", file=sys.stderr)
+                failed = True
+                continue
+            output = {"uri": uri, **_filter_cli_inventory(invdata, base_url, args)}
+            if args.format == "json":
+                print(json.dumps(output, sort_keys=False), flush=True)
+            else:
+                print(yaml.dump(output, sort_keys=False, explicit_start=True), end="")
+                sys.stdout.flush()
+    if failed:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
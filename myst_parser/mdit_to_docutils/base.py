@@ -2,25 +2,29 @@
 
 from __future__ import annotations
 
-import inspect
 import json
 import os
 import posixpath
 import re
+from collections import OrderedDict
 from collections.abc import (
     Callable,
     Container,
+    Hashable,
     Iterable,
     Iterator,
+    Mapping,
     MutableMapping,
     Sequence,
 )
 from contextlib import contextmanager, suppress
 from datetime import date, datetime
-from types import ModuleType
+from functools import lru_cache
+from types import MethodType, ModuleType
 from typing import (
     TYPE_CHECKING,
     Any,
+    ClassVar,
     cast,
 )
 from urllib.parse import urlparse
@@ -36,13 +40,18 @@ from docutils.parsers.rst.directives.misc import Include
 from docutils.parsers.rst.languages import get_language as get_language_rst
 from docutils.statemachine import StringList
 from docutils.utils import Reporter, SystemMessage, new_document
-from docutils.utils.code_analyzer import Lexer, LexerError, NumberLines
+from docutils.utils.code_analyzer import (
+    Lexer,
+    LexerError,
+    NumberLines,
+    with_pygments,
+)
 from markdown_it import MarkdownIt
 from markdown_it.renderer import RendererProtocol
 from markdown_it.token import Token
 from markdown_it.tree import SyntaxTreeNode
 
-from myst_parser import inventory
+from myst_parser import inventory, profiling
 from myst_parser._compat import findall
 from myst_parser.config.main import MdParserConfig, UrlSchemeType
 from myst_parser.mocking import (
@@ -58,6 +67,7 @@ from myst_parser.parsers.directives import (
     MarkupError,
     parse_directive_text,
 )
+from myst_parser.parsers.mdit import iter_source_chunks
 from myst_parser.slugs import github_slugify, unique_slug
 from myst_parser.warnings_ import MystWarnings, create_warning
 
@@ -83,16 +93,221 @@ and documents that specify schemes must do so with lowercase letters.
 REGEX_URI_TEMPLATE = re.compile(
     r"{{\s*(uri|scheme|netloc|path|params|query|fragment)\s*}}"
 )
+REGEX_REFERENCE_DEFINITION = re.compile(r"^ {0,3}\[[^\]\n]+\]:", re.MULTILINE)
 REGEX_DIRECTIVE_START = re.compile(r"^[\s]{0,3}([`]{3,10}|[~]{3,10}|[:]{3,10})\{")
 
 
 def token_line(token: SyntaxTreeNode, default: int | None = None) -> int:
-    """Retrieve the initial line of a token."""
+    """Retrieve the initial (1-based) line of a token.
+
+    The map of a ``TokenNode`` is already 1-based (and offset to the source),
+    whereas the map of any other syntax tree node is as parsed (0-based).
+    """
+    if isinstance(token, TokenNode):
+        if token.line is not None:
+            return token.line
+        if default is not None:
+            return default
+        raise ValueError(f"token map not set: {token}")
     if not getattr(token, "map", None):
         if default is not None:
             return default
         raise ValueError(f"token map not set: {token}")
-    return token.map[0]  # type: ignore[index]
+    return token.map[0] + 1  # type: ignore[index]
+
+
+RenderFunction = Callable[[Any, SyntaxTreeNode], None]
+"""A function to render a syntax tree node, taking the renderer as first argument."""
+
+
+def iter_top_level_blocks(tokens: Sequence[Token]) -> Iterator[list[Token]]:
+    """Yield the tokens of each top-level block,
+    i.e. each opening token up to its matching closing token (or a single token).
+    """
+    start = 0
+    level = 0
+    for index, token in enumerate(tokens):
+        level += token.nesting
+        if level == 0:
+            yield list(tokens[start : index + 1])
+            start = index + 1
+    if start < len(tokens):
+        # unbalanced tokens
+        yield list(tokens[start:])
+
+
+_REGISTRY_ATTRIBUTES = (
+    "ids",
+    "nameids",
+    "refnames",
+    "refids",
+    "footnotes",
+    "autofootnotes",
+    "autofootnote_refs",
+    "symbol_footnotes",
+    "symbol_footnote_refs",
+    "footnote_refs",
+    "citations",
+    "citation_refs",
+    "substitution_defs",
+    "substitution_refs",
+)
+"""Attributes of the document, which register nodes for later transforms."""
+
+_REGISTERED_NODE_ATTRIBUTES = ("ids", "names", "refid", "refname", "backrefs", "refdoc")
+"""Attributes of nodes, which link them to other parts of the document (or project)."""
+
+_UNCONTAINED_NODES = (
+    nodes.pending,
+    nodes.section,
+    nodes.system_message,
+    nodes.substitution_definition,
+    nodes.substitution_reference,
+    nodes.target,
+)
+"""Nodes, which cannot be rendered in isolation from the rest of the document."""
+
+
+def registry_state(document: nodes.document) -> tuple[int, ...]:
+    """Return a signature of the nodes registered with the document."""
+    return (
+        *(len(getattr(document, name, ())) for name in _REGISTRY_ATTRIBUTES),
+        len(document.transformer.transforms),
+    )
+
+
+def is_self_contained(node: nodes.Node) -> bool:
+    """Return whether the node can be rendered in isolation from the document,
+    i.e. it neither registers with nor references other parts of it.
+    """
+    for child in node.findall(nodes.Element):
+        if isinstance(child, _UNCONTAINED_NODES):
+            return False
+        if any(child.get(name) for name in _REGISTERED_NODE_ATTRIBUTES):
+            return False
+    return True
+
+
+class TokenNode(SyntaxTreeNode):
+    """A syntax tree node, used between parsing and rendering,
+    which gives the source lines of its tokens without modifying them.
+
+    The tokens keep their ``map`` as parsed (0-based, relative to the parsed text),
+    and the (1-based) source lines of a node are given by its ``map`` and ``line``,
+    which add an offset to the token map,
+    and inline tokens (which have no map) take the lines of their parent block.
+    Leaf nodes also share an empty tuple of children, rather than each having a list.
+
+    Note, this is not a compact representation of the tokens:
+    the tree of a large document uses only a few percent less memory
+    (see ``benchmarks/bench_render_memory.py``).
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[Token] = (),
+        *,
+        create_root: bool = True,
+        line_offset: int = 1,
+        line_token: Token | None = None,
+    ) -> None:
+        """Initialize a node from a token stream.
+
+        :param tokens: The tokens of the node
+        :param create_root: Create a root node for the token stream
+        :param line_offset: The offset added to the (0-based) token maps
+        :param line_token: The token of the parent block (for inline tokens)
+        """
+        self._line_offset = line_offset
+        self._line_token = line_token
+        super().__init__(tokens, create_root=create_root)
+        if not self._children:
+            self._children = ()  # type: ignore[assignment]
+
+    def _add_child(self, tokens: Sequence[Token]) -> None:
+        # the children of an unnested token (or of an inline node) are inline tokens
+        child = type(self)(
+            tokens,
+            create_root=False,
+            line_offset=self._line_offset,
+            line_token=self._line_token or self.token,
+        )
+        child._parent = self
+        self._children.append(child)
+
+    @property
+    def _source_token(self) -> Token | None:
+        """The token providing the source lines of the node."""
+        if self._line_token is not None:
+            return self._line_token
+        if self.nester_tokens is not None:
+            return self.nester_tokens.opening
+        return self.token
+
+    @property
+    def line(self) -> int | None:
+        """The first line of the node in the source, or None if not mapped."""
+        token = self._source_token
+        if token is None or not token.map:
+            return None
+        return token.map[0] + self._line_offset
+
+    @property
+    def map(self) -> tuple[int, int] | None:
+        """Source map info (1-based). Format: `tuple[ line_begin, line_end ]`"""
+        token = self._source_token
+        if token is None or not token.map:
+            return None
+        return (token.map[0] + self._line_offset, token.map[1] + self._line_offset)
+
+
+class _RenderRules(MutableMapping[str, Callable[[SyntaxTreeNode], None]]):
+    """The (deprecated) ``rules`` of a renderer,
+    mapping ``render_<token type>`` to bound render methods.
+
+    Items are looked up in the render methods of the renderer's class,
+    and changes are recorded as overrides, which only apply to the renderer.
+    """
+
+    def __init__(self, renderer: DocutilsRenderer) -> None:
+        self.renderer = renderer
+        self.overrides: dict[str, Callable[[SyntaxTreeNode], None] | None] = {}
+        """The changed items, with None for deleted items."""
+
+    def __getitem__(self, key: str) -> Callable[[SyntaxTreeNode], None]:
+        if key in self.overrides:
+            value = self.overrides[key]
+            if value is None:
+                raise KeyError(key)
+            return value
+        if key.startswith("render_"):
+            func = self.renderer.get_render_methods().get(key[7:])
+            if func is not None:
+                return MethodType(func, self.renderer)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Callable[[SyntaxTreeNode], None]) -> None:
+        self.overrides[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        self[key]  # raise KeyError if missing
+        self.overrides[key] = None
+
+    def __iter__(self) -> Iterator[str]:
+        for token_type in self.renderer.get_render_methods():
+            if f"render_{token_type}" not in self.overrides:
+                yield f"render_{token_type}"
+        for key, value in self.overrides.items():
+            if value is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def _call_rule(rule: Callable[[SyntaxTreeNode], None]) -> RenderFunction:
+    """Adapt a (bound) rule to the signature of a render function."""
+    return lambda _renderer, node: rule(node)
 
 
 class DocutilsRenderer(RendererProtocol):
@@ -103,16 +318,17 @@ class DocutilsRenderer(RendererProtocol):
 
     __output__ = "docutils"
 
+    _token_renderers: ClassVar[dict[str, RenderFunction]] = {}
+    """Render functions registered on the class, via ``add_render_method``."""
+    _render_methods: ClassVar[dict[str, RenderFunction]]
+    """The computed mapping of token type to render function, per class."""
+    _rules: _RenderRules | None = None
+    """The (deprecated) per-instance mapping of render methods, once accessed."""
+
     def __init__(self, parser: MarkdownIt) -> None:
         """Load the renderer (called by ``MarkdownIt``)"""
         self.md = parser
-        self.rules = {
-            k: v
-            for k, v in inspect.getmembers(self, predicate=inspect.ismethod)
-            if k.startswith("render_") and k != "render_children"
-        }
-        # these are lazy loaded, when needed
-        self._inventories: None | dict[str, inventory.InventoryType] = None
+        self._num_warnings = 0
 
     def __getattr__(self, name: str):
         """Warn when the renderer has not been setup yet."""
@@ -134,6 +350,73 @@ class DocutilsRenderer(RendererProtocol):
             f"'{type(self).__name__}' object has no attribute '{name}'"
         )
 
+    @classmethod
+    def get_render_methods(cls) -> dict[str, RenderFunction]:
+        """Return the mapping of token type to render function, for this class.
+
+        This is computed once per class, from the ``render_<token type>`` methods
+        and the functions registered with ``add_render_method``,
+        with those defined on a subclass taking priority over its base classes.
+        """
+        try:
+            return cls.__dict__["_render_methods"]
+        except KeyError:
+            pass
+        methods: dict[str, RenderFunction] = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if (
+                    name.startswith("render_")
+                    and name != "render_children"
+                    and callable(value)
+                ):
+                    methods[name[7:]] = value
+            methods.update(vars(klass).get("_token_renderers", {}))
+        cls._render_methods = methods
+        return methods
+
+    @classmethod
+    def add_render_method(cls, token_type: str, func: RenderFunction) -> None:
+        """Register a function to render a token type, for this class and its subclasses.
+
+        This allows for rendering the tokens of third-party markdown-it plugins,
+        without needing to subclass the renderer.
+
+        :param token_type: The type of the (nested) token, e.g. ``myplugin``
+            for ``myplugin_open`` and ``myplugin_close`` tokens
+        :param func: A function that takes the renderer and the syntax tree node
+        """
+        if "_token_renderers" not in vars(cls):
+            cls._token_renderers = {}
+        cls._token_renderers[token_type] = func
+        # invalidate the computed mappings of this class and its subclasses
+        classes: list[type[DocutilsRenderer]] = [cls]
+        while classes:
+            klass = classes.pop()
+            if "_render_methods" in vars(klass):
+                del klass._render_methods
+            classes.extend(klass.__subclasses__())
+
+    @property
+    def rules(self) -> MutableMapping[str, Callable[[SyntaxTreeNode], None]]:
+        """Mapping of ``render_<token type>`` to bound render methods.
+
+        Changes to the mapping only apply to this renderer.
+
+        .. deprecated:: Use ``get_render_methods`` instead,
+            and ``add_render_method`` to add or replace a render method.
+        """
+        if self._rules is None:
+            self._rules = _RenderRules(self)
+        return self._rules
+
+    @rules.setter
+    def rules(self, value: Mapping[str, Callable[[SyntaxTreeNode], None]]) -> None:
+        rules = _RenderRules(self)
+        rules.overrides = dict.fromkeys(rules)
+        rules.update(value)
+        self._rules = rules
+
     def setup_render(
         self, options: dict[str, Any], env: MutableMapping[str, Any]
     ) -> None:
@@ -156,6 +439,36 @@ class DocutilsRenderer(RendererProtocol):
         }
         # mapping of section slug to (line, id, implicit_text)
         self._heading_slugs: dict[str, tuple[int | None, str, str]] = {}
+        # a cache of directive classes (and the directive registered for the name),
+        # by name and lookup context
+        self._directive_classes: dict[Hashable, tuple[type[Directive], Any]] = {}
+        # the mock states used to run directives, by nesting depth
+        self._mock_states: list[tuple[MockStateMachine, MockState]] = []
+        self._mock_depth: int = 0
+        # these are lazy loaded, when needed,
+        # from the inventories shared by all renderers in the process
+        self._inventories: None | inventory.InventorySet = None
+
+    def teardown_render(self) -> None:
+        """Release the per render variables,
+        so that a reused renderer does not keep the last document alive.
+        """
+        for name in (
+            "md_env",
+            "md_options",
+            "md_config",
+            "document",
+            "current_node",
+            "reporter",
+            "language_module_rst",
+            "_heading_offset",
+            "_level_to_section",
+            "_heading_slugs",
+            "_directive_classes",
+            "_mock_states",
+            "_inventories",
+        ):
+            self.__dict__.pop(name, None)
 
     @property
     def sphinx_env(self) -> BuildEnvironment | None:
@@ -179,6 +492,7 @@ class DocutilsRenderer(RendererProtocol):
         If the warning type is listed in the ``suppress_warnings`` configuration,
         then ``None`` will be returned and no warning logged.
         """
+        self._num_warnings += 1
         return create_warning(
             self.document,
             message,
@@ -188,31 +502,24 @@ class DocutilsRenderer(RendererProtocol):
             append_to=append_to,
         )
 
-    def _render_tokens(self, tokens: list[Token]) -> None:
-        """Render the tokens."""
-        # propagate line number down to inline elements
-        for token in tokens:
-            if not token.map:
-                continue
-            # For docutils we want 1 based line numbers (not 0)
-            token.map = [token.map[0] + 1, token.map[1] + 1]
-            for token_child in token.children or []:
-                token_child.map = token.map
-
-        # nest tokens
-        node_tree = SyntaxTreeNode(tokens)
-        # render
-        for child in node_tree.children:
-            # skip hidden?
-            if f"render_{child.type}" in self.rules:
-                self.rules[f"render_{child.type}"](child)
-            else:
-                self.create_warning(
-                    f"No render method for: {child.type}",
-                    MystWarnings.RENDER_METHOD,
-                    line=token_line(child, default=0),
-                    append_to=self.current_node,
-                )
+    def _render_tokens(self, tokens: list[Token], line_offset: int = 0) -> None:
+        """Render the tokens.
+
+        :param tokens: the tokens to render
+        :param line_offset: the offset of the (0-based) token maps within the source
+        """
+        # For docutils we want 1 based line numbers (not 0)
+        line_offset += 1
+        if self.md_config.render_engine == "stream":
+            # nest and render each top-level block in turn,
+            # so that only a single block's syntax tree exists at any time
+            for block_tokens in iter_top_level_blocks(tokens):
+                self.render_children(TokenNode(block_tokens, line_offset=line_offset))
+        else:
+            # nest tokens
+            node_tree = TokenNode(tokens, line_offset=line_offset)
+            # render
+            self.render_children(node_tree)
 
     def render(
         self, tokens: Sequence[Token], options, md_env: MutableMapping[str, Any]
@@ -230,6 +537,48 @@ class DocutilsRenderer(RendererProtocol):
         self._render_finalise()
         return self.document
 
+    def render_chunks(
+        self, text: str, options, md_env: MutableMapping[str, Any]
+    ) -> nodes.document:
+        """Parse and render the source text in chunks,
+        of (at least) ``render_chunk_lines`` lines each, split at top-level headings.
+
+        Only the tokens of a single chunk exist at any one time,
+        bounding peak memory to roughly one chunk plus the docutils document.
+
+        :param text: the source text to parse
+        :param options: params of parser instance
+        :param md_env: the markdown-it environment sandbox
+        """
+        self.setup_render(options, md_env)
+        self._render_initialise()
+        # replicate the markdown-it core normalization, so that line numbers agree
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        if "\0" in text:
+            text = text.replace("\0", "\ufffd")
+        chunk_lines = self.md_config.render_chunk_lines
+        rules = self.md.block.ruler.get_active_rules()
+        collect_references = bool(REGEX_REFERENCE_DEFINITION.search(text))
+        if collect_references:
+            # reference definitions apply to the whole document,
+            # so must all be known before inline parsing any chunk
+            for line_offset, chunk in iter_source_chunks(text, chunk_lines, rules):
+                num_duplicates = len(md_env.get("duplicate_refs", []))
+                self.md.block.parse(chunk, self.md, md_env, [])
+                for duplicate in md_env.get("duplicate_refs", [])[num_duplicates:]:
+                    duplicate["map"] = [line + line_offset for line in duplicate["map"]]
+        for line_offset, chunk in iter_source_chunks(text, chunk_lines, rules):
+            num_duplicates = len(md_env.get("duplicate_refs", []))
+            tokens = self.md.parse(chunk, md_env)
+            if collect_references:
+                # every definition was already recorded in the first pass
+                del md_env.get("duplicate_refs", [])[num_duplicates:]
+            self._render_tokens(tokens, line_offset)
+            del tokens
+        self._render_finalise()
+        return self.document
+
     def _render_initialise(self) -> None:
         """Initialise the render of the document."""
         self.current_node.extend(
@@ -321,13 +670,6 @@ class DocutilsRenderer(RendererProtocol):
         if tokens and tokens[0].type == "front_matter":
             tokens.pop(0)
 
-        # update the line numbers,
-        # note the maps stay 0-based here;
-        # ``_render_tokens`` applies the final 0-based to 1-based conversion
-        for token in tokens:
-            if token.map:
-                token.map = [token.map[0] + lineno, token.map[1] + lineno]
-
         @contextmanager
         def _restore():
             current_heading_offset = self._heading_offset
@@ -345,7 +687,7 @@ class DocutilsRenderer(RendererProtocol):
                 self._level_to_section = current_level_to_section
 
         with _restore():
-            self._render_tokens(tokens)
+            self._render_tokens(tokens, lineno)
 
     @contextmanager
     def current_node_context(
@@ -361,16 +703,31 @@ class DocutilsRenderer(RendererProtocol):
 
     def render_children(self, token: SyntaxTreeNode) -> None:
         """Render the children of a token."""
+        methods = self.get_render_methods()
+        overrides = self._rules.overrides if self._rules is not None else None
+        profiler = profiling.get_profiler()
         for child in token.children or []:
-            if f"render_{child.type}" in self.rules:
-                self.rules[f"render_{child.type}"](child)
-            else:
+            try:
+                if overrides and f"render_{child.type}" in overrides:
+                    rule = overrides[f"render_{child.type}"]
+                    if rule is None:
+                        raise KeyError(child.type)
+                    method = _call_rule(rule)
+                else:
+                    method = methods[child.type]
+            except KeyError:
                 self.create_warning(
                     f"No render method for: {child.type}",
                     MystWarnings.RENDER_METHOD,
                     line=token_line(child, default=0),
                     append_to=self.current_node,
                 )
+            else:
+                if profiler is None:
+                    method(self, child)
+                else:
+                    with profiler.record(f"render:{child.type}"):
+                        method(self, child)
 
     def add_line_and_source_path(self, node, token: SyntaxTreeNode) -> None:
         """Copy the line number and document source path to the docutils node."""
@@ -712,7 +1069,7 @@ class DocutilsRenderer(RendererProtocol):
                 text, classes=["code"] + ([lexer_name] if lexer_name else [])
             )
             try:
-                lex_tokens = Lexer(
+                lex_tokens = CachedLexer(
                     text,
                     lexer_name or "",
                     "short" if self.md_config.highlight_code_blocks else "none",
@@ -728,17 +1085,24 @@ class DocutilsRenderer(RendererProtocol):
                 )
                 lex_tokens = Lexer(text, lexer_name or "", "none")
 
-            if number_lines:
-                lex_tokens = NumberLines(
-                    lex_tokens, lineno_start, lineno_start + len(text.splitlines())
+            if (
+                self.md_config.highlight_code_blocks_html
+                and lex_tokens.lexer is not None
+                and not number_lines
+                and getattr(self.document.settings, "raw_enabled", True)
+            ):
+                # a single raw node, rather than a node per token
+                # (expanded by the ExpandHighlightedCode transform,
+                # for writers that do not support HTML)
+                node += nodes.raw(
+                    "", highlight_html(text, lex_tokens.lexer), format="html"
                 )
-
-            for classes, value in lex_tokens:
-                if classes:
-                    node += nodes.inline(value, value, classes=classes)
-                else:
-                    # insert as Text to decrease the verbosity of the output
-                    node += nodes.Text(value)
+            else:
+                if number_lines:
+                    lex_tokens = NumberLines(
+                        lex_tokens, lineno_start, lineno_start + len(text.splitlines())
+                    )
+                node.extend(lexed_nodes(lex_tokens))
 
         if source is not None:
             node.source = source
@@ -791,13 +1155,8 @@ class DocutilsRenderer(RendererProtocol):
                     token, name, arguments, additional_options=options
                 )
 
-        if not name and self.sphinx_env is not None:
-            # use the current highlight setting, via the ``highlight`` directive,
-            # or ``highlight_language`` configuration.
-            name = (
-                self.sphinx_env.temp_data.get("highlight_language")
-                or self.sphinx_env.config.highlight_language
-            )
+        if not name:
+            name = self.default_highlight_language()
 
         lineno_start = 1
         number_lines = name in self.md_config.number_code_blocks
@@ -1212,27 +1571,42 @@ class DocutilsRenderer(RendererProtocol):
         This will be overridden for sphinx, to use intersphinx config.
         """
         if self._inventories is None:
-            self._inventories = {}
-            for key, (uri, path) in self.md_config.inventories.items():
-                load_path = posixpath.join(uri, "objects.inv") if path is None else path
-                self.reporter.info(f"Loading inventory {key!r}: {load_path}")
-                try:
-                    inv = inventory.fetch_inventory(load_path, base_url=uri)
-                except Exception as exc:
-                    self.create_warning(
-                        f"Failed to load inventory {key!r}: {exc}",
-                        MystWarnings.INV_LOAD,
-                    )
-                else:
-                    self._inventories[key] = inv
+            cache = (
+                inventory.get_inventory_cache(
+                    self.md_config.inventory_cache_dir or inventory.user_cache_dir(),
+                    self.md_config.inventory_cache_ttl,
+                )
+                if self.md_config.inventory_cache
+                else None
+            )
+            registry = inventory.get_inventory_registry(
+                self.md_config.inventory_max_memory * 2**20,
+                self.md_config.inventory_cache_ttl,
+            )
+            self._inventories = registry.get_set(
+                {
+                    key: (uri, path, uri)
+                    for key, (uri, path) in self.md_config.inventories.items()
+                },
+                cache=cache,
+                on_load=lambda key, load_path: self.reporter.info(
+                    f"Loading inventory {key!r}: {load_path}"
+                ),
+            )
+            for key, exc in self._inventories.errors.items():
+                self.create_warning(
+                    f"Failed to load inventory {key!r}: {exc}",
+                    MystWarnings.INV_LOAD,
+                )
 
         return list(
             inventory.filter_inventories(
-                self._inventories,
+                self._inventories.inventories,
                 invs=invs,
                 domains=domains,
                 otypes=otypes,
                 targets=target,
+                index=self._inventories.index,
             )
         )
 
@@ -1814,6 +2188,73 @@ class DocutilsRenderer(RendererProtocol):
         )
         self.current_node += nodes_list
 
+    def default_highlight_language(self) -> str:
+        """Return the language of code blocks, which do not specify one."""
+        return ""
+
+    def directive_lookup_context(self) -> Hashable:
+        """Return the state of the document, which directive lookup depends on
+        (other than the directive name).
+        """
+        return None
+
+    def lookup_directive(
+        self, name: str
+    ) -> tuple[type[Directive] | None, list[SystemMessage]]:
+        """Return the class of a directive (and any lookup messages).
+
+        Successful lookups are cached for the document,
+        and invalidated if a directive is (re-)registered under the name.
+        """
+        key = (name, self.directive_lookup_context())
+        registered = directives._directives.get(name)
+        cached = self._directive_classes.get(key)
+        if cached is not None and cached[1] is registered:
+            profiler = profiling.get_profiler()
+            if profiler is not None:
+                profiler.add("directive_lookup:cached", 0.0)
+            return cached[0], []
+
+        with profiling.record("directive_lookup"):
+            output: tuple[type[Directive] | None, list[SystemMessage]] = (
+                directives.directive(name, self.language_module_rst, self.document)
+            )
+        directive_class, messages = output
+        if directive_class is None:
+            return None, messages
+
+        if issubclass(directive_class, Include):
+            # this is a Markdown only option,
+            # to allow for altering relative image reference links
+            directive_class.option_spec["relative-images"] = directives.flag
+            directive_class.option_spec["relative-docs"] = directives.path
+            directive_class.option_spec["heading-offset"] = directives.nonnegative_int
+
+        if not messages:
+            # note, a successful lookup may also register the directive
+            self._directive_classes[key] = (
+                directive_class,
+                directives._directives.get(name),
+            )
+        return directive_class, messages
+
+    def _acquire_mock_state(self, lineno: int) -> tuple[MockStateMachine, MockState]:
+        """Return a mock state machine and state, to run a directive at a position.
+
+        These are re-used for each directive of the document (at each nesting depth),
+        and must be released by decrementing ``_mock_depth``, once the directive is run.
+        """
+        if self._mock_depth < len(self._mock_states):
+            state_machine, state = self._mock_states[self._mock_depth]
+            state_machine.reset(lineno)
+            state.reset(lineno)
+        else:
+            state_machine = MockStateMachine(self, lineno)
+            state = MockState(self, state_machine, lineno)
+            self._mock_states.append((state_machine, state))
+        self._mock_depth += 1
+        return state_machine, state
+
     def run_directive(
         self,
         name: str,
@@ -1840,10 +2281,7 @@ class DocutilsRenderer(RendererProtocol):
         self.document.current_line = position
 
         # get directive class
-        output: tuple[Directive | None, list[SystemMessage]] = directives.directive(
-            name, self.language_module_rst, self.document
-        )
-        directive_class, messages = output
+        directive_class, messages = self.lookup_directive(name)
         if not directive_class:
             warn_node = self.create_warning(
                 f"Unknown directive type: {name!r}",
@@ -1852,13 +2290,6 @@ class DocutilsRenderer(RendererProtocol):
             )
             return ([warn_node] if warn_node else []) + messages
 
-        if issubclass(directive_class, Include):
-            # this is a Markdown only option,
-            # to allow for altering relative image reference links
-            directive_class.option_spec["relative-images"] = directives.flag
-            directive_class.option_spec["relative-docs"] = directives.path
-            directive_class.option_spec["heading-offset"] = directives.nonnegative_int
-
         try:
             parsed = parse_directive_text(
                 directive_class,
@@ -1897,8 +2328,7 @@ class DocutilsRenderer(RendererProtocol):
                 lineno=position,
             )
         else:
-            state_machine = MockStateMachine(self, position)
-            state = MockState(self, state_machine, position)
+            state_machine, state = self._acquire_mock_state(position)
             directive_instance = directive_class(
                 name=name,
                 # the list of positional arguments
@@ -1919,7 +2349,8 @@ class DocutilsRenderer(RendererProtocol):
 
         # run directive
         try:
-            result = directive_instance.run()
+            with profiling.record(f"directive:{name}"):
+                result = directive_instance.run()
         except DirectiveError as error:
             msg_node = self.reporter.system_message(
                 error.level, error.msg, line=position
@@ -1933,6 +2364,9 @@ class DocutilsRenderer(RendererProtocol):
                 line=position,
             )
             return [error_msg]
+        finally:
+            if not isinstance(directive_instance, MockIncludeDirective):
+                self._mock_depth -= 1
 
         assert isinstance(result, list), (
             f'Directive "{name}" must return a list of nodes.'
@@ -1970,14 +2404,11 @@ class DocutilsRenderer(RendererProtocol):
         if self.sphinx_env is not None:
             variable_context["env"] = self.sphinx_env
 
-        # fail on undefined variables
-        env = jinja2.Environment(undefined=jinja2.StrictUndefined)
-
         # try rendering
         try:
-            rendered = env.from_string(f"{{{{{token.content}}}}}").render(
-                variable_context
-            )
+            with profiling.record("substitution"):
+                template, references = compile_substitution(token.content)
+                rendered = template.render(variable_context)
         except Exception as error:
             self.create_warning(
                 f"Substitution error:{error.__class__.__name__}: {error}",
@@ -1988,12 +2419,8 @@ class DocutilsRenderer(RendererProtocol):
             return
 
         # handle circular references
-        ast = env.parse(f"{{{{{token.content}}}}}")
-        references = {
-            n.name for n in ast.find_all(jinja2.nodes.Name) if n.name != "env"
-        }
         self.document.sub_references = getattr(self.document, "sub_references", set())
-        cyclic = references.intersection(self.document.sub_references)
+        cyclic = self.document.sub_references.intersection(references)
         if cyclic:
             self.create_warning(
                 f"circular substitution reference: {cyclic}",
@@ -2012,13 +2439,285 @@ class DocutilsRenderer(RendererProtocol):
         # we record used references before nested parsing, then remove them after
         self.document.sub_references.update(references)
         try:
-            if inline and not REGEX_DIRECTIVE_START.match(rendered):
-                self.nested_render_text(rendered, position, inline=True)
-            else:
-                self.nested_render_text(rendered, position)
+            self._render_substitution_text(
+                rendered,
+                position,
+                inline and not REGEX_DIRECTIVE_START.match(rendered),
+            )
         finally:
             self.document.sub_references.difference_update(references)
 
+    def _render_substitution_text(self, text: str, position: int, inline: bool) -> None:
+        """Render the text of a substitution, re-using the nodes of a previous render
+        of the same text, if it has been rendered before.
+
+        The nodes are only cached, if they can be rendered in isolation from the
+        document, i.e. their rendering did not change any state of the document
+        (other than the wordcount), or emit any warnings.
+        """
+        key = self._substitution_fragment_key(text, inline)
+        if key is not None and key in _SUBSTITUTION_FRAGMENTS:
+            _SUBSTITUTION_FRAGMENTS.move_to_end(key)
+            cached_position, fragment, words = _SUBSTITUTION_FRAGMENTS[key]
+            source = self.document.get("source")
+            for node in fragment:
+                node = node.deepcopy()
+                for child in node.findall():
+                    if child.line is not None:
+                        child.line += position - cached_position
+                    if child.source is not None:
+                        child.source = source
+                self.current_node.append(node)
+            if words and "wordcount" in self.md_env:
+                wordcount = self.md_env["wordcount"]
+                wordcount["words"] = wordcount.get("words", 0) + words
+                wordcount["minutes"] = round(
+                    wordcount["words"] / self.md_config.words_per_minute
+                )
+            return
+
+        if key is None:
+            self.nested_render_text(text, position, inline=inline)
+            return
+
+        parent = self.current_node
+        num_children = len(parent.children)
+        registry = registry_state(self.document)
+        num_warnings = self._num_warnings
+        words = -self.md_env.get("wordcount", {}).get("words", 0)
+        messages: list[nodes.system_message] = []
+        self.reporter.attach_observer(messages.append)
+        try:
+            self.nested_render_text(text, position, inline=inline)
+        finally:
+            self.reporter.detach_observer(messages.append)
+        words += self.md_env.get("wordcount", {}).get("words", 0)
+        fragment = parent.children[num_children:]
+        if (
+            self.current_node is parent
+            and not messages
+            and num_warnings == self._num_warnings
+            and registry == registry_state(self.document)
+            and all(is_self_contained(node) for node in fragment)
+        ):
+            _SUBSTITUTION_FRAGMENTS[key] = (
+                position,
+                [node.deepcopy() for node in fragment],
+                words,
+            )
+            if len(_SUBSTITUTION_FRAGMENTS) > _SUBSTITUTION_FRAGMENTS_MAXSIZE:
+                _SUBSTITUTION_FRAGMENTS.popitem(last=False)
+
+    def _substitution_fragment_key(self, text: str, inline: bool) -> Hashable | None:
+        """Return the key to cache the rendered nodes of a substitution,
+        or None if they should not be cached.
+
+        The nodes are not cached if the text contains reference definitions
+        or (further) substitutions, which depend on the document,
+        or roles and directives that are not known to be independent of it.
+        The key includes the implementations that the roles and directives
+        resolve to (which a project may override), the docutils settings
+        that change the nodes, and the default highlight language,
+        which code blocks without a language are rendered with.
+        """
+        if "{{" in text or REGEX_REFERENCE_DEFINITION.search(text):
+            return None
+        implementations = []
+        for name in sorted(set(_REGEX_ROLE_OR_DIRECTIVE_NAME.findall(text))):
+            if name not in _PURE_DIRECTIVES and name not in _PURE_ROLES:
+                return None
+            directive_class = (
+                self.lookup_directive(name)[0] if name in _PURE_DIRECTIVES else None
+            )
+            role_func = (
+                roles.role(name, self.language_module_rst, 0, self.reporter)[0]
+                if name in _PURE_ROLES
+                else None
+            )
+            if directive_class is None and role_func is None:
+                return None
+            implementations.append((name, directive_class, role_func))
+        if "<" in text and (
+            "html_image" in self.md_config.enable_extensions
+            or "html_admonition" in self.md_config.enable_extensions
+        ):
+            # html may be converted to directives
+            return None
+        key = (
+            text,
+            inline,
+            self.md_config.fingerprint(),
+            type(self),
+            self.md_env.get("relative-images"),
+            self.md_env.get("relative-docs"),
+            self.default_highlight_language(),
+            tuple(implementations),
+            tuple(
+                getattr(self.document.settings, name, None)
+                for name in _SUBSTITUTION_SETTINGS
+            ),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            # e.g. a role implementation that is not hashable
+            return None
+        return key
+
+
+class CachedLexer(Lexer):
+    """A docutils ``Lexer``, which re-uses the pygments lexer instances of the process,
+    rather than looking up the lexer by name for every code block.
+    """
+
+    def __init__(self, code: str, language: str, tokennames: str = "short") -> None:
+        # initialise without a language, which skips the lexer lookup
+        super().__init__(code, "", tokennames)
+        self.language = language
+        if language in ("", "text") or tokennames == "none":
+            return
+        self.lexer = get_pygments_lexer(language)
+
+
+def lexed_nodes(tokens: Iterable[tuple[list[str], str]]) -> list[nodes.Node]:
+    """Return the nodes of lexed code: an inline per token with classes,
+    and text for the tokens without.
+    """
+    return [
+        nodes.inline(value, value, classes=classes)
+        if classes
+        # insert as Text to decrease the verbosity of the output
+        else nodes.Text(value)
+        for classes, value in tokens
+    ]
+
+
+def get_pygments_lexer(name: str) -> Any:
+    """Return the pygments lexer instance for a language name.
+
+    :raises LexerError: if pygments is not installed, or has no lexer for the name
+    """
+    if not with_pygments:
+        raise LexerError("Cannot analyze code. Pygments package not found.")
+    lexer = _find_pygments_lexer(name)
+    if lexer is None:
+        raise LexerError(f'Cannot analyze code. No Pygments lexer found for "{name}".')
+    return lexer
+
+
+@lru_cache(maxsize=256)
+def _find_pygments_lexer(name: str) -> Any:
+    """Find the pygments lexer instance for a language name (or None if not found)."""
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+
+    try:
+        return get_lexer_by_name(name)
+    except ClassNotFound:
+        return None
+
+
+def highlight_html(code: str, lexer: Any) -> str:
+    """Highlight code as HTML, with a ``<span>`` per token (without line wrapping),
+    using the same (short) CSS classes as docutils.
+    """
+    import pygments
+
+    html = pygments.highlight(code, lexer, _html_formatter())
+    return html.removesuffix("\n")
+
+
+@lru_cache(maxsize=1)
+def _html_formatter() -> Any:
+    from pygments.formatters.html import HtmlFormatter
+
+    return HtmlFormatter(nowrap=True)
+
+
+_SUBSTITUTION_ENV = jinja2.Environment(undefined=jinja2.StrictUndefined)
+"""The environment shared by all substitutions (failing on undefined variables)."""
+
+
+@lru_cache(maxsize=1024)
+def compile_substitution(expression: str) -> tuple[jinja2.Template, frozenset[str]]:
+    """Compile a substitution expression,
+    and find the variables it references (other than ``env``).
+
+    The result is cached, so each unique expression is compiled and analysed once.
+
+    :raises jinja2.TemplateSyntaxError: if the expression is invalid
+    """
+    source = f"{{{{{expression}}}}}"
+    template = _SUBSTITUTION_ENV.from_string(source)
+    references = frozenset(
+        n.name
+        for n in _SUBSTITUTION_ENV.parse(source).find_all(jinja2.nodes.Name)
+        if n.name != "env"
+    )
+    return template, references
+
+
+_SUBSTITUTION_FRAGMENTS: OrderedDict[Hashable, tuple[int, list[nodes.Node], int]] = (
+    OrderedDict()
+)
+"""A cache of the nodes rendered from substitution text, across documents,
+mapping a key to the line they were rendered at, the nodes, and the words counted.
+"""
+
+_SUBSTITUTION_FRAGMENTS_MAXSIZE = 512
+"""The maximum number of entries in the substitution nodes cache."""
+
+_REGEX_ROLE_OR_DIRECTIVE_NAME = re.compile(r"\{([^\s{}`]+)\}")
+"""The names of roles and directives, e.g. ``{name}`content` ``."""
+
+_PURE_DIRECTIVES = frozenset(
+    (
+        "admonition",
+        "attention",
+        "caution",
+        "danger",
+        "error",
+        "hint",
+        "important",
+        "note",
+        "tip",
+        "warning",
+        "container",
+        "rubric",
+        "epigraph",
+        "highlights",
+        "pull-quote",
+        "compound",
+        "code",
+        "code-block",
+        "sourcecode",
+    )
+)
+"""Directives, whose (default) implementations only depend on their input,
+so that the nodes they create can be cached and re-used.
+"""
+
+_PURE_ROLES = frozenset(
+    (
+        "code",
+        "emphasis",
+        "strong",
+        "literal",
+        "sub",
+        "subscript",
+        "sup",
+        "superscript",
+        "abbr",
+        "kbd",
+    )
+)
+"""Roles, whose (default) implementations only depend on their input,
+so that the nodes they create can be cached and re-used.
+"""
+
+_SUBSTITUTION_SETTINGS = ("language_code", "syntax_highlight", "tab_width")
+"""The docutils settings, which change the nodes rendered from a substitution."""
+
 
 _FM_FIELD_MAX_LENGTH = 100_000
 """Maximum number of items a front matter field may expand to when rendered."""
@@ -2117,11 +2816,11 @@ def compute_unique_slug(
 ) -> str:
     """Compute the slug for a heading token, unique against existing slugs."""
     slug_func = github_slugify if slug_func is None else slug_func
-    tokens = token_tree.to_tokens()
-    inline_token = tokens[1]
+    # the heading contains a single inline token, which holds the (flat) children
+    inline_token = token_tree.children[0].token if token_tree.children else None
     title = "".join(
         child.content
-        for child in (inline_token.children or [])
+        for child in ((inline_token and inline_token.children) or [])
         if child.type in ["text", "code_inline"]
     )
     return unique_slug(slug_func(title), slugs)
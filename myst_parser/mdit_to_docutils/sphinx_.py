@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Hashable
 from pathlib import Path
 from typing import cast
 from uuid import uuid4
@@ -17,6 +18,7 @@ from sphinx.util import logging
 
 from myst_parser import inventory
 from myst_parser.mdit_to_docutils.base import DocutilsRenderer, token_line
+from myst_parser.sphinx_ext.myst_refs import get_intersphinx_index
 from myst_parser.warnings_ import MystWarnings
 
 LOGGER = logging.getLogger(__name__)
@@ -33,6 +35,26 @@ class SphinxRenderer(DocutilsRenderer):
     def sphinx_env(self) -> BuildEnvironment:
         return self.document.settings.env
 
+    def default_highlight_language(self) -> str:
+        """Return the current highlight setting, via the ``highlight`` directive,
+        or ``highlight_language`` configuration.
+        """
+        current_document = getattr(self.sphinx_env, "current_document", None)
+        if current_document is not None:
+            language = current_document.highlight_language
+        else:  # sphinx < 8.2
+            language = self.sphinx_env.temp_data.get("highlight_language")
+        return language or self.sphinx_env.config.highlight_language
+
+    def directive_lookup_context(self) -> Hashable:
+        """Return the default domain, which sphinx looks up directives in."""
+        current_document = getattr(self.sphinx_env, "current_document", None)
+        if current_document is not None:
+            domain = current_document.default_domain
+        else:  # sphinx < 8.2
+            domain = self.sphinx_env.temp_data.get("default_domain")
+        return getattr(domain, "name", None)
+
     def _process_wrap_node(
         self,
         wrap_node: nodes.Element,
@@ -176,6 +198,7 @@ class SphinxRenderer(DocutilsRenderer):
                 domains=domains,
                 otypes=otypes,
                 targets=target,
+                index=get_intersphinx_index(self.sphinx_env),
             )
         )
 
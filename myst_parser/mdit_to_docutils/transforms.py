@@ -11,7 +11,8 @@ from docutils.transforms.references import Footnotes
 from markdown_it.common.normalize_url import normalizeLink
 
 from myst_parser._compat import findall
-from myst_parser.mdit_to_docutils.base import clean_astext
+from myst_parser.mdit_to_docutils.base import CachedLexer, clean_astext, lexed_nodes
+from myst_parser.profiling import profiled
 from myst_parser.warnings_ import MystWarnings, create_warning
 
 
@@ -26,6 +27,7 @@ class UnreferencedFootnotesDetector(Transform):
 
     # document: nodes.document
 
+    @profiled("transform:UnreferencedFootnotesDetector")
     def apply(self, **kwargs: t.Any) -> None:
         """Apply the transform."""
 
@@ -76,6 +78,7 @@ class SortFootnotes(Transform):
 
     # document: nodes.document
 
+    @profiled("transform:SortFootnotes")
     def apply(self, **kwargs: t.Any) -> None:
         """Apply the transform."""
         if not self.document.settings.myst_footnote_sort:
@@ -102,6 +105,7 @@ class CollectFootnotes(Transform):
 
     # document: nodes.document
 
+    @profiled("transform:CollectFootnotes")
     def apply(self, **kwargs: t.Any) -> None:
         """Apply the transform."""
         if not self.document.settings.myst_footnote_sort:
@@ -155,6 +159,7 @@ class AddSlugIds(Transform):
 
     default_priority = 700  # after all id assignment, before ResolveAnchorIds
 
+    @profiled("transform:AddSlugIds")
     def apply(self, **kwargs: t.Any) -> None:
         """Apply the transform."""
         if not getattr(self.document.settings, "myst_heading_anchors_html_ids", True):
@@ -188,6 +193,7 @@ class PrioritiseExplicitIds(Transform):
     # (261), so the ordering does not depend on transform insertion order
     default_priority = 262
 
+    @profiled("transform:PrioritiseExplicitIds")
     def apply(self, **kwargs: t.Any) -> None:
         """Apply the transform."""
         explicit_ids = {
@@ -208,6 +214,7 @@ class ResolveAnchorIds(Transform):
 
     default_priority = 879  # this is the same as Sphinx's StandardDomain.process_doc
 
+    @profiled("transform:ResolveAnchorIds")
     def apply(self, **kwargs: t.Any) -> None:
         """Apply the transform."""
         # gather the implicit heading slugs
@@ -365,3 +372,39 @@ class ResolveAnchorIds(Transform):
                 refnode += nodes.inline(
                     "#" + target, "#" + target, classes=["std", "std-ref"]
                 )
+
+
+class ExpandHighlightedCode(Transform):
+    """Replace the raw HTML of highlighted code blocks with a node per token,
+    for writers that do not support HTML.
+
+    Code blocks are highlighted to a single raw HTML node,
+    if ``myst_highlight_code_blocks_html`` is enabled,
+    but the writer is not known until the document is transformed.
+    """
+
+    default_priority = 880
+
+    @profiled("transform:ExpandHighlightedCode")
+    def apply(self, **kwargs: t.Any) -> None:
+        """Apply the transform."""
+        if not getattr(
+            self.document.settings, "myst_highlight_code_blocks_html", False
+        ):
+            return
+        writer = self.document.transformer.components.get("writer")
+        if writer is None or "null" in writer.supported or writer.supports("html"):
+            # a doctree (without a writer) may be written to HTML later
+            return
+        for node in findall(self.document)(nodes.literal_block):
+            if not (
+                len(node.children) == 1
+                and isinstance(node[0], nodes.raw)
+                and node[0].get("format") == "html"
+                and len(node["classes"]) == 2
+                and node["classes"][0] == "code"
+            ):
+                continue
+            lexer = CachedLexer(node.rawsource, node["classes"][1], "short")
+            del node[:]
+            node.extend(lexed_nodes(lexer))
@@ -123,6 +123,12 @@ class MockState:
 
         self.memo = Struct
 
+    def reset(self, lineno: int) -> None:
+        """Reset the state, to be re-used for a directive at a new position."""
+        self._lineno = lineno
+        self.inliner.parent = self._renderer.current_node
+        self.memo.section_level = max(self._renderer._level_to_section)
+
     def parse_directive_block(
         self,
         content: StringList,
@@ -322,6 +328,12 @@ class MockStateMachine:
         self.node: nodes.Element = renderer.current_node
         self.match_titles: bool = True
 
+    def reset(self, lineno: int) -> None:
+        """Reset the state machine, to be re-used for a directive at a new position."""
+        self._lineno = lineno
+        self.node = self._renderer.current_node
+        self.match_titles = True
+
     def get_source(self, lineno: int | None = None):
         """Return document source path."""
         return self.document["source"]
@@ -37,7 +37,9 @@ This is to allow for separation between the option block and content.
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
+from copy import deepcopy
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from textwrap import dedent
 from typing import Any
 
@@ -109,6 +111,96 @@ def parse_directive_text(
 
     :raises MarkupError: if there is a fatal parsing/validation error
     """
+    spec = _directive_spec(directive_class)
+    try:
+        hash(spec)
+    except TypeError:
+        # e.g. an option converter that is not hashable, so cannot be cached
+        return _parse_directive_text(
+            directive_class,
+            first_line,
+            content,
+            line=line,
+            validate_options=validate_options,
+            additional_options=additional_options,
+        )
+    # the result is cached, parsed as if on line 0, then rebased to the actual line
+    result = _parse_directive_text_cached(
+        directive_class,  # type: ignore[arg-type]
+        spec,
+        first_line,
+        content,
+        validate_options,
+        tuple(additional_options.items()) if additional_options else None,
+    )
+    return DirectiveParsingResult(
+        list(result.arguments),
+        deepcopy(result.options),
+        list(result.body),
+        result.body_offset,
+        [
+            replace(
+                warning,
+                lineno=None
+                if line is None or warning.lineno is None
+                else warning.lineno + line,
+            )
+            for warning in result.warnings
+        ],
+    )
+
+
+def _directive_spec(directive_class: type[Directive]) -> tuple[Any, ...]:
+    """Return a snapshot of the directive class attributes that change its parse.
+
+    Classes may be modified after first use (e.g. adding to ``option_spec``),
+    so this is part of the cache key, together with the class itself.
+    """
+    return (
+        directive_class.required_arguments,
+        directive_class.optional_arguments,
+        directive_class.final_argument_whitespace,
+        directive_class.has_content,
+        tuple((directive_class.option_spec or {}).items()),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _parse_directive_text_cached(
+    directive_class: type[Directive],
+    spec: tuple[Any, ...],
+    first_line: str,
+    content: str,
+    validate_options: bool,
+    additional_options: tuple[tuple[str, str], ...] | None,
+) -> DirectiveParsingResult:
+    """Parse the full directive text, with line numbers relative to the opening line.
+
+    Identical directive texts are common, so the result is cached
+    (it must be copied before use, since it is mutable).
+
+    :param spec: The snapshot of the directive class, from ``_directive_spec``
+    """
+    return _parse_directive_text(
+        directive_class,
+        first_line,
+        content,
+        line=0,
+        validate_options=validate_options,
+        additional_options=dict(additional_options) if additional_options else None,
+    )
+
+
+def _parse_directive_text(
+    directive_class: type[Directive],
+    first_line: str,
+    content: str,
+    *,
+    line: int | None,
+    validate_options: bool,
+    additional_options: dict[str, str] | None,
+) -> DirectiveParsingResult:
+    """Parse (and validate) the full directive text."""
     parse_warnings: list[ParseWarnings]
     options: dict[str, Any]
     body_lines: list[str]
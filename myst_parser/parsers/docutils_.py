@@ -1,10 +1,16 @@
 """MyST Markdown parser for docutils."""
 
+import argparse
+import os
+import sys
 from collections.abc import Callable, Iterable, Sequence
-from dataclasses import Field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import Field, dataclass, field
+from pathlib import Path
 from typing import (
     Any,
     Literal,
+    cast,
     get_args,
     get_origin,
 )
@@ -16,6 +22,7 @@ from docutils.frontend import filter_settings_spec
 from docutils.parsers.rst import Parser as RstParser
 from docutils.writers.html5_polyglot import HTMLTranslator, Writer
 
+from myst_parser import profiling
 from myst_parser.config.main import (
     MdParserConfig,
     TopmatterReadError,
@@ -26,12 +33,14 @@ from myst_parser.mdit_to_docutils.base import DocutilsRenderer
 from myst_parser.mdit_to_docutils.transforms import (
     AddSlugIds,
     CollectFootnotes,
+    ExpandHighlightedCode,
     PrioritiseExplicitIds,
     ResolveAnchorIds,
     SortFootnotes,
     UnreferencedFootnotesDetector,
 )
-from myst_parser.parsers.mdit import create_md_parser, linkify_available
+from myst_parser.parsers.mdit import MD_PARSER_POOL, linkify_available
+from myst_parser.parsers.token_cache import get_token_cache, token_caches
 from myst_parser.warnings_ import MystWarnings, create_warning
 
 
@@ -260,6 +269,7 @@ class Parser(RstParser):
             AddSlugIds,
             PrioritiseExplicitIds,
             ResolveAnchorIds,
+            ExpandHighlightedCode,
         ]
 
     def parse(self, inputstring: str, document: nodes.document) -> None:
@@ -327,9 +337,28 @@ class Parser(RstParser):
                 config = merge_file_level(config, topmatter, warning)
 
         # parse content
-        parser = create_md_parser(config, DocutilsRenderer)
-        parser.options["document"] = document
-        parser.render(inputstring)
+        with (
+            profiling.document(document.get("source") or "<string>", config.profile),
+            MD_PARSER_POOL.acquire(config, DocutilsRenderer) as parser,
+        ):
+            parser.options["document"] = document
+            if config.render_chunk_lines > 0:
+                with profiling.record("render"):
+                    cast(DocutilsRenderer, parser.renderer).render_chunks(
+                        inputstring, parser.options, {}
+                    )
+            else:
+                with profiling.record("parse"):
+                    if config.token_cache:
+                        cache = get_token_cache(
+                            config.token_cache_dir, config.token_cache_max_size * 2**20
+                        )
+                        tokens, env = cache.parse(parser, inputstring, config)
+                    else:
+                        env = {}
+                        tokens = parser.parse(inputstring, env)
+                with profiling.record("render"):
+                    parser.renderer.render(tokens, parser.options, env)
 
         # post-processing
 
@@ -362,8 +391,174 @@ class SimpleWriter(Writer):
         self.translator_class = SimpleTranslator
 
 
+_BATCH_SUFFIXES = {
+    "html": ".html",
+    "html5": ".html",
+    "latex": ".tex",
+    "xml": ".xml",
+    "pseudoxml": ".pseudoxml",
+}
+"""The suffixes of output files, by writer, for batch conversions."""
+
+
+@dataclass
+class _BatchResult:
+    source: str
+    error: str | None = None
+    """The error message, if the conversion failed."""
+    profile: dict[str, dict[str, list[float]]] | None = None
+    """The profiling records of the conversion (if profiling is enabled)."""
+    token_caches: list[tuple[str, int, dict[str, int]]] = field(default_factory=list)
+    """The (path, max_size, counters) of the token caches used by the conversion."""
+
+
+def _convert_file(job: tuple[str, str, str, list[str]]) -> _BatchResult:
+    """Convert a single file (in a batch).
+
+    Parsers are pooled per process and configuration,
+    so each worker re-uses one parser per configuration.
+    Usage records are reset after each conversion,
+    so that the main process can sum them over all workers.
+    """
+    writer_name, source, destination, docutils_argv = job
+    result = _BatchResult(source)
+    try:
+        Path(destination).parent.mkdir(parents=True, exist_ok=True)
+        publish_cmdline(
+            parser=Parser(),
+            writer_name=writer_name,
+            argv=[*docutils_argv, source, destination],
+        )
+    except SystemExit as exc:
+        if exc.code:
+            result.error = f"exited with status {exc.code}"
+    except Exception as exc:
+        result.error = f"{exc.__class__.__name__}: {exc}"
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        result.profile = {key: dict(value) for key, value in profiler.documents.items()}
+        profiler.clear()
+    result.token_caches = [
+        (str(cache.path), cache.max_size, cache.pop_counters())
+        for cache in token_caches()
+    ]
+    return result
+
+
+def _batch_jobs(
+    writer_name: str, inputs: list[str], output_dir: str | None
+) -> list[tuple[str, str]]:
+    """Return the (source, destination) paths for a batch conversion.
+
+    Directories are searched recursively for Markdown files,
+    and their relative paths are kept in the output directory
+    (a source given more than once is converted once).
+
+    :raises ValueError: If two sources would be written to the same destination
+    """
+    suffix = _BATCH_SUFFIXES.get(writer_name, f".{writer_name}")
+    jobs: dict[str, str] = {}
+    for input_ in inputs:
+        path = Path(input_)
+        if path.is_dir():
+            sources = [
+                (source, source.relative_to(path))
+                for source in sorted(path.rglob("*"))
+                if source.suffix in (".md", ".markdown", ".myst") and source.is_file()
+            ]
+        else:
+            sources = [(path, Path(path.name))]
+        for source, relative in sources:
+            destination = (
+                Path(output_dir) / relative if output_dir is not None else source
+            ).with_suffix(suffix)
+            other = jobs.setdefault(str(destination), str(source))
+            if Path(other).resolve() != source.resolve():
+                raise ValueError(
+                    f"{other!r} and {str(source)!r} would both be written to "
+                    f"{str(destination)!r}"
+                )
+    return [(source, destination) for destination, source in jobs.items()]
+
+
+def _run_batch(writer_name: str, argv: list[str]) -> None:
+    """Convert many files, with a pool of processes."""
+    arg_parser = argparse.ArgumentParser(
+        prog=f"myst-docutils-{writer_name} --batch",
+        description=(
+            "Convert many MyST files, in parallel. "
+            "Other (docutils) options are applied to every file, "
+            "and must be given in the form --option=value."
+        ),
+    )
+    arg_parser.add_argument("--batch", action="store_true")
+    arg_parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Input files, or directories to search (recursively) for Markdown files",
+    )
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: number of CPUs)",
+    )
+    arg_parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Directory to write outputs to (default: alongside each input)",
+    )
+    args, docutils_argv = arg_parser.parse_known_args(argv)
+
+    try:
+        batch_jobs = _batch_jobs(writer_name, args.inputs, args.output_dir)
+    except ValueError as exc:
+        arg_parser.error(str(exc))
+    jobs = [
+        (writer_name, source, destination, docutils_argv)
+        for source, destination in batch_jobs
+    ]
+    if args.jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            results = list(
+                executor.map(
+                    _convert_file,
+                    jobs,
+                    chunksize=max(1, len(jobs) // (args.jobs * 4)),
+                )
+            )
+    else:
+        results = [_convert_file(job) for job in jobs]
+
+    failures = [result for result in results if result.error is not None]
+    for result in failures:
+        sys.stderr.write(f"{result.source}: {result.error}\n")
+    sys.stderr.write(
+        f"Converted {len(results) - len(failures)} of {len(results)} file(s)\n"
+    )
+    for result in results:
+        for path, max_size, counters in result.token_caches:
+            get_token_cache(path, max_size).add_counters(counters)
+    _report_token_caches()
+    profiles = [result.profile for result in results if result.profile is not None]
+    if profiles:
+        profiler = profiling.Profiler()
+        for records in profiles:
+            profiler.merge(records)
+        sys.stderr.write(f"MyST profile:\n{profiler.summary()}\n")
+    if failures:
+        sys.exit(1)
+
+
 def _run_cli(writer_name: str, writer_description: str, argv: list[str] | None):
     """Run the command line interface for a particular writer."""
+    for cache in token_caches():
+        # only report the usage of this run
+        cache.pop_counters()
+    if "--batch" in (sys.argv[1:] if argv is None else argv):
+        _run_batch(writer_name, sys.argv[1:] if argv is None else argv)
+        return
     publish_cmdline(
         parser=Parser(),
         writer_name=writer_name,
@@ -372,6 +567,18 @@ def _run_cli(writer_name: str, writer_description: str, argv: list[str] | None):
         ),
         argv=argv,
     )
+    _report_token_caches()
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        sys.stderr.write(f"MyST profile:\n{profiler.summary()}\n")
+
+
+def _report_token_caches() -> None:
+    """Write (and reset) the usage of the token caches, at the end of a run."""
+    for cache in token_caches():
+        if cache.hits or cache.misses:
+            sys.stderr.write(f"MyST token cache ({cache.path}): {cache.report()}\n")
+        cache.pop_counters()
 
 
 def cli_html(argv: list[str] | None = None) -> None:
@@ -0,0 +1,420 @@
+"""Incremental re-parsing of MyST documents, e.g. for editor live previews.
+
+The document is first parsed in full, recording the docutils nodes rendered
+for each top-level block of the source.
+An edit then only re-parses and re-renders the top-level blocks it affects,
+splicing their new nodes into the existing document.
+
+If the edit may have effects beyond these blocks,
+for example changing the section structure, reference definitions,
+or any targets or footnotes, the document is instead fully re-parsed.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from typing import Any, cast
+
+from docutils import nodes
+from docutils.frontend import get_default_settings
+from docutils.utils import new_document
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+from mdit_py_plugins.wordcount import basic_count
+
+from myst_parser.config.main import (
+    MdParserConfig,
+    TopmatterReadError,
+    merge_file_level,
+    read_topmatter,
+)
+from myst_parser.mdit_to_docutils.base import (
+    REGEX_REFERENCE_DEFINITION,
+    DocutilsRenderer,
+    is_self_contained,
+    iter_top_level_blocks,
+    registry_state,
+)
+from myst_parser.parsers.docutils_ import Parser, create_myst_config
+from myst_parser.parsers.mdit import create_md_parser
+from myst_parser.warnings_ import create_warning
+
+_REGEX_MATH_DELIMITER = re.compile(r"\$\$|\\(?:begin|end)\{")
+"""Delimiters of math blocks, which are only parsed as such once closed."""
+
+
+@dataclass
+class _Block:
+    """The record of a rendered top-level block."""
+
+    start: int
+    """The 0-based first line of the block."""
+    end: int
+    """The 0-based line after the block."""
+    parent: nodes.Element
+    """The node that the block was rendered into."""
+    children: list[nodes.Node]
+    """The nodes rendered into the parent for the block."""
+    spliceable: bool
+    """Whether the block can be re-rendered in isolation."""
+    parent_after: nodes.Element
+    """The node that subsequent blocks are rendered into."""
+    words: int
+    """The number of words in the block (as counted by the wordcount plugin)."""
+    current_line: int | None
+    """The line of the document after the block,
+    which docutils assigns to subsequent nodes without a line (e.g. comments).
+    """
+
+
+class IncrementalDocument:
+    """A parsed MyST document, which can be updated incrementally after edits.
+
+    The ``document`` is as output by the MyST docutils parser,
+    i.e. before any transforms are applied.
+    Note, it is updated in-place,
+    so should be copied before applying transforms, or writing.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        *,
+        source_path: str = "<string>",
+        settings: dict[str, Any] | None = None,
+        config: MdParserConfig | None = None,
+    ) -> None:
+        """Parse the document in full.
+
+        :param source: The source text
+        :param source_path: The path of the source, assigned to the document
+        :param settings: Overrides of the (docutils) document settings
+        :param config: The MyST configuration,
+            or None to create it from the document settings
+        """
+        self._source_path = source_path
+        self._settings = settings or {}
+        self._global_config = config
+        self.full_parses = 0
+        """The number of times the document has been fully parsed."""
+        self.incremental_updates = 0
+        """The number of edits applied by only re-rendering the affected blocks."""
+        self._parse(source)
+
+    @property
+    def source(self) -> str:
+        """The current source text."""
+        return "".join(self._lines)
+
+    def update(self, start_line: int, end_line: int, text: str) -> nodes.document:
+        """Replace lines of the source, and update the document.
+
+        :param start_line: The 0-based first line to replace
+        :param end_line: The 0-based line after the last line to replace
+            (equal to ``start_line`` to insert lines)
+        :param text: The replacement lines
+        :returns: The updated document
+        """
+        if not 0 <= start_line <= end_line <= len(self._lines):
+            raise ValueError(
+                f"Invalid line range [{start_line}, {end_line}) "
+                f"for {len(self._lines)} lines"
+            )
+        new_lines = text.splitlines(keepends=True)
+        if new_lines and not new_lines[-1].endswith("\n"):
+            new_lines[-1] += "\n"
+        lines = self._lines[:start_line] + new_lines + self._lines[end_line:]
+        if self._update(lines, start_line, end_line, len(new_lines)):
+            self.incremental_updates += 1
+        else:
+            self._parse("".join(lines))
+        return self.document
+
+    def _parse(self, source: str) -> None:
+        """Parse the document in full, recording the nodes of each top-level block."""
+        self.full_parses += 1
+        settings = get_default_settings(Parser)
+        for key, value in self._settings.items():
+            setattr(settings, key, value)
+        document = new_document(self._source_path, settings)
+
+        config = self._global_config or create_myst_config(document.settings)
+        try:
+            topmatter = read_topmatter(source)
+        except TopmatterReadError:
+            pass  # this will be reported during the render
+        else:
+            if topmatter:
+                warning = lambda wtype, msg: create_warning(
+                    document, msg, wtype, line=1, append_to=document
+                )
+                config = merge_file_level(config, topmatter, warning)
+
+        self.config = config
+        """The MyST configuration of the document (including file-level options)."""
+        self._md: MarkdownIt = create_md_parser(config, DocutilsRenderer)
+        self._md.options["document"] = document
+        renderer = cast(DocutilsRenderer, self._md.renderer)
+        self._env: MutableMapping[str, Any] = {}
+        renderer.setup_render(dict(self._md.options), self._env)
+        renderer._render_initialise()
+        self._initial_line: int | None = document.current_line
+        tokens = self._md.parse(source, self._env)
+        self._front_matter = bool(tokens) and tokens[0].type == "front_matter"
+        self._blocks = self._render_blocks(renderer, tokens, self._env)
+        del tokens
+        num_children = len(document.children)
+        renderer._render_finalise()
+        self._finalise_nodes: list[nodes.Node] = document.children[num_children:]
+        self._words: int = self._env.get("wordcount", {}).get("words", 0)
+        self._lines = source.splitlines(keepends=True)
+        self.document = document
+
+    def _render_blocks(
+        self,
+        renderer: DocutilsRenderer,
+        tokens: list[Token],
+        env: MutableMapping[str, Any],
+        line_offset: int = 0,
+    ) -> list[_Block]:
+        """Render the tokens, and return the record of each top-level block."""
+        document = renderer.document
+        messages: list[nodes.system_message] = []
+        document.reporter.attach_observer(messages.append)
+        blocks: list[_Block] = []
+        end = line_offset
+        try:
+            for block_tokens in iter_top_level_blocks(tokens):
+                if block_tokens[0].map:
+                    start = block_tokens[0].map[0] + line_offset
+                    end = block_tokens[0].map[1] + line_offset
+                else:
+                    start = end
+                parent = renderer.current_node
+                num_children = len(parent.children)
+                registry = registry_state(document)
+                num_messages = len(messages)
+                words = _count_words(block_tokens) - env.get("wordcount", {}).get(
+                    "words", 0
+                )
+                renderer._render_tokens(block_tokens, line_offset)
+                # nested parses (e.g. of directive content) add to the wordcount
+                words += env.get("wordcount", {}).get("words", 0)
+                children = parent.children[num_children:]
+                spliceable = (
+                    renderer.current_node is parent
+                    and bool(block_tokens[0].map)
+                    and block_tokens[0].type != "front_matter"
+                    and registry == registry_state(document)
+                    and len(messages) == num_messages
+                    and all(is_self_contained(child) for child in children)
+                )
+                blocks.append(
+                    _Block(
+                        start,
+                        end,
+                        parent,
+                        children,
+                        spliceable,
+                        renderer.current_node,
+                        words,
+                        document.current_line,
+                    )
+                )
+        finally:
+            document.reporter.detach_observer(messages.append)
+        return blocks
+
+    def _update(
+        self, lines: list[str], start_line: int, end_line: int, num_new: int
+    ) -> bool:
+        """Attempt to update the document, by only re-rendering the affected blocks.
+
+        :returns: False if the document must instead be fully re-parsed
+        """
+        if any("\r" in line or "\0" in line for line in lines[start_line:][:num_new]):
+            return False
+        delta = num_new - (end_line - start_line)
+        edited = (
+            lines[start_line : start_line + num_new] + self._lines[start_line:end_line]
+        )
+        if (
+            lines
+            and lines[0].startswith("---")
+            and not self._front_matter
+            and any(line.startswith(("---", "...")) for line in edited)
+        ):
+            # the edit may close (or open) front matter at the start of the source
+            return False
+
+        # find the blocks overlapping the edit (plus their unaffected neighbours)
+        first = 0
+        while first < len(self._blocks) and self._blocks[first].end <= start_line:
+            first += 1
+        last = first
+        while last < len(self._blocks) and self._blocks[last].start < max(
+            end_line, start_line + 1
+        ):
+            last += 1
+        affected = self._blocks[first:last]
+        if not all(block.spliceable for block in affected):
+            return False
+        previous = self._blocks[first - 1] if first > 0 else None
+        following = self._blocks[last] if last < len(self._blocks) else None
+
+        # reference definitions apply to the whole document,
+        # and math blocks may be closed (or opened) by distant lines
+        window_start = previous.start if previous else 0
+        old_end = following.end if following else len(self._lines)
+        old_text = "".join(self._lines[window_start:old_end])
+        window_text = "".join(lines[window_start : old_end + delta])
+        for text in (old_text, window_text):
+            if REGEX_REFERENCE_DEFINITION.search(text) or _REGEX_MATH_DELIMITER.search(
+                text
+            ):
+                return False
+
+        # re-parse the window, which starts and ends at top-level block boundaries
+        env: dict[str, Any] = {"references": self._env.get("references", {})}
+        tokens = self._md.parse(window_text, env)
+        if tokens and tokens[0].type == "front_matter" and previous is None:
+            return False
+        new_blocks = list(iter_top_level_blocks(tokens))
+        if previous is not None:
+            if not new_blocks or new_blocks[0][0].map != [
+                0,
+                previous.end - window_start,
+            ]:
+                return False
+            new_blocks = new_blocks[1:]
+        if following is not None:
+            if not new_blocks or new_blocks[-1][0].map != [
+                following.start + delta - window_start,
+                following.end + delta - window_start,
+            ]:
+                return False
+            new_blocks = new_blocks[:-1]
+
+        parent = previous.parent_after if previous else self._blocks_root()
+        if any(block.parent is not parent for block in affected):
+            return False
+        index = self._insert_index(parent, affected, last)
+        if index is None:
+            return False
+
+        # render the new blocks, in isolation
+        renderer = cast(DocutilsRenderer, self._md.renderer)
+        container = nodes.Element()
+        # so that nodes are assigned the document's current source and line
+        container.document = self.document
+        env["wordcount"] = {}
+        # nodes without a line are assigned the line of the document,
+        # which is restored to its value after the preceding block
+        self.document.current_line = (
+            previous.current_line if previous else self._initial_line
+        )
+        renderer.setup_render({**self._md.options, "current_node": container}, env)
+        try:
+            rendered = self._render_blocks(
+                renderer, [t for block in new_blocks for t in block], env, window_start
+            )
+        finally:
+            renderer.teardown_render()
+        if not all(block.spliceable for block in rendered):
+            return False
+
+        # splice the new nodes into the document
+        for block in affected:
+            for child in block.children:
+                parent.remove(child)
+        if delta:
+            for node in self.document.findall():
+                if node.line is not None and node.line > end_line:
+                    node.line += delta
+                if (
+                    isinstance(node, nodes.system_message)
+                    and node.get("line")
+                    and node["line"] > end_line
+                ):
+                    node["line"] += delta
+            for block in self._blocks[last:]:
+                block.start += delta
+                block.end += delta
+                if block.current_line is not None and block.current_line > end_line:
+                    block.current_line += delta
+        for block in rendered:
+            block.parent = block.parent_after = parent
+            for child in block.children:
+                parent.insert(index, child)
+                index += 1
+        self._blocks[first:last] = rendered
+        self._lines = lines
+        self._update_wordcount(
+            sum(block.words for block in rendered)
+            - sum(block.words for block in affected)
+        )
+        return True
+
+    def _blocks_root(self) -> nodes.Element:
+        """The node that the first top-level block is rendered into."""
+        return self._blocks[0].parent if self._blocks else self.document
+
+    def _insert_index(
+        self, parent: nodes.Element, affected: list[_Block], following: int
+    ) -> int | None:
+        """Return the index in the parent, at which to insert the new nodes."""
+        for block in affected:
+            if block.children:
+                return parent.index(block.children[0])
+        # insert before the nodes of the next block with any
+        for block in self._blocks[following:]:
+            node: nodes.Node | None
+            if block.children:
+                node = block.children[0]
+            elif block.parent_after is not block.parent:
+                # a heading, whose section was added to an ancestor
+                node = block.parent_after
+            else:
+                continue
+            while node is not None and node.parent is not parent:
+                node = node.parent
+            if node is not None:
+                return parent.index(node)
+            break
+        if parent is self.document and self._finalise_nodes:
+            if self._finalise_nodes[0].parent is not parent:
+                return None
+            return parent.index(self._finalise_nodes[0])
+        return len(parent.children)
+
+    def _update_wordcount(self, difference: int) -> None:
+        """Update the wordcount substitution definitions."""
+        if not difference:
+            return
+        self._words += difference
+        values = {
+            "words": self._words,
+            "minutes": round(self._words / self.config.words_per_minute),
+        }
+        self._env.setdefault("wordcount", {}).update(values)
+        for key, value in values.items():
+            definition = self.document.substitution_defs.get(f"wordcount-{key}")
+            if definition is not None:
+                definition.rawsource = str(value)
+                definition.children = []
+                definition += nodes.Text(str(value))
+
+
+def _count_words(tokens: list[Token]) -> int:
+    """Count the words of the tokens, as for the wordcount plugin."""
+    words = 0
+    for token in tokens:
+        if token.type == "text":
+            words += basic_count(token.content)
+        elif token.type == "inline":
+            for child in token.children or ():
+                if child.type == "text":
+                    words += basic_count(child.content)
+    return words
@@ -1,10 +1,15 @@
 """This module holds the ``create_md_parser`` function,
-which creates a parser from the config.
+which creates a parser from the config,
+and the pool of parsers reused between documents.
 """
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Iterator
+from contextlib import contextmanager
 
 from markdown_it import MarkdownIt
 from markdown_it.renderer import RendererProtocol
@@ -144,3 +149,406 @@ def create_md_parser(
     )
 
     return md
+
+
+_CHUNK_HEADING = re.compile(r"#{1,6}(?:[ \t]|$)")
+_FENCE_OPEN = re.compile(r"`{3,}|~{3,}|:{3,}")
+_HTML_OPEN = re.compile(r"<(!--|script|pre|style|textarea)", re.IGNORECASE)
+_HTML_BLOCK_OPEN = re.compile(
+    r"</?(address|article|aside|base|basefont|blockquote|body|caption|center|col"
+    r"|colgroup|dd|details|dialog|dir|div|dl|dt|fieldset|figcaption|figure|footer"
+    r"|form|frame|frameset|h[1-6]|head|header|hr|html|iframe|legend|li|link|main"
+    r"|menu|menuitem|nav|noframes|ol|optgroup|option|p|param|search|section"
+    r"|summary|table|tbody|td|tfoot|th|thead|title|tr|track|ul)(?:[ \t>]|/>|$)",
+    re.IGNORECASE,
+)
+_AMSMATH_OPEN = re.compile(r"\\begin\{([^}]*)\}")
+_DOLLAR_EQNO = re.compile(r"\$\$\s*\([^)$\r\n]+?\)$")
+_LIST_MARKER = re.compile(r"([-+*]|(\d{1,9})[.)])(?=[ \t]|$)")
+_LAZY_LIST_MARKER = re.compile(r" {0,3}(?:[-+*]|\d{1,9}[.)])(?=[ \t]|$)")
+_THEMATIC_BREAK = re.compile(r"([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+_SETEXT_UNDERLINE = re.compile(r"=+[ \t]*$")
+_FRONT_MATTER_OPEN = re.compile(r"-{3,}")
+_INTERRUPTING_LINES = (
+    ("myst_line_comment", re.compile(r"%")),
+    ("myst_block_break", re.compile(r"\+{3}")),
+    ("myst_target", re.compile(r"\(.*\)=")),
+    ("footnote_def", re.compile(r"\[\^")),
+    ("table", re.compile(r".*\|")),
+    ("fieldlist", re.compile(r":")),
+    ("deflist", re.compile(r"[:~]")),
+)
+"""Lines that may start a block interrupting a paragraph, by block rule name."""
+_MAX_SCAN_STATES = 32
+
+_Block = tuple[str, ...]
+"""A block that may contain blank lines: (kind, closing marker)."""
+_ScanState = tuple[_Block | None, tuple[int, ...], bool, bool]
+"""The state of the source scan, before a line:
+(the open block, the content indents of the open list items, each relative to
+its parent, whether the innermost list item has no content yet,
+whether the last line was paragraph text).
+An open block is always within the innermost list item.
+"""
+_LineStart = tuple[_Block | None, tuple[int, ...], bool, bool]
+"""An interpretation of a line: (the opened block, the content indents of the
+opened list items, whether the innermost opened list item is empty,
+whether the line is paragraph text).
+"""
+
+
+def iter_source_chunks(
+    text: str, chunk_lines: int, rules: Collection[str] | None = None
+) -> Iterator[tuple[int, str]]:
+    """Split the source text into chunks, that can be parsed independently.
+
+    Chunks are split only before an ATX heading at the start of a line,
+    following a blank line, and outside of front matter
+    and any fence, math or HTML block, so that no block can span across chunks.
+
+    The interpretation of a line can depend on the list items and paragraphs
+    that precede it (and on the syntax extensions in use, if not known),
+    so every possible interpretation of the source is followed,
+    and a chunk is only split where all of them agree.
+
+    :param text: The source text, with normalized line endings
+    :param chunk_lines: The minimum number of lines per chunk
+        (a non-positive number yields the full text as a single chunk)
+    :param rules: The names of the active block rules of the parser,
+        or None to assume only those of syntax extensions may be inactive
+    :yields: (0-based line offset, chunk text)
+    """
+    if chunk_lines <= 0:
+        yield 0, text
+        return
+    start = position = 0
+    start_line = line_number = 0
+    blank_before = True
+    states: set[_ScanState] | None = {(None, (), False, False)}
+    """The possible states before the current line,
+    or None if there are too many to follow (and so splitting stops).
+    """
+    if _rule_active(rules, "front_matter") is not False and (
+        match := _FRONT_MATTER_OPEN.match(text)
+    ):
+        # front matter may contain blank lines and headings
+        states = {(("front", match.group()), (), False, False)}
+        position = text.find("\n") + 1 or len(text)
+        line_number = 1
+        blank_before = False
+    while position < len(text):
+        end = text.find("\n", position)
+        end = len(text) if end == -1 else end + 1
+        line = text[position:end].rstrip("\n")
+        if (
+            states is not None
+            and blank_before
+            and line_number - start_line >= chunk_lines
+            and _CHUNK_HEADING.match(line)
+            # a heading closes any list item, and any block within it
+            and all(
+                block is None or (items and block[0] != "math")
+                for block, items, *_ in states
+            )
+        ):
+            yield start_line, text[start:position]
+            start, start_line = position, line_number
+        if states is not None:
+            expanded = line.expandtabs(4)
+            states = {
+                new for state in states for new in _scan_line(state, expanded, rules)
+            }
+            if len(states) > _MAX_SCAN_STATES:
+                states = None
+        blank_before = not line.strip()
+        position = end
+        line_number += 1
+    if start < len(text):
+        yield start_line, text[start:]
+
+
+def _scan_line(
+    state: _ScanState, line: str, rules: Collection[str] | None
+) -> list[_ScanState]:
+    """Return the possible states following a line (with tabs expanded)."""
+    block, items, item_empty, paragraph = state
+    if block is not None and block[0] == "math":
+        # math is closed by the first line ending with its marker,
+        # whatever its indentation
+        stripped = line.rstrip()
+        if stripped.endswith(block[1]):
+            return [(None, items, False, False)]
+        if block[1] == "$$" and _DOLLAR_EQNO.search(stripped):
+            # only if equation labels are allowed
+            return [(None, items, False, False), (block, items, False, False)]
+        return [(block, items, False, False)]
+    if not line.strip():
+        if block is not None and block[0] != "html_blank":
+            return [(block, items, False, False)]
+        if item_empty:
+            # a list item can begin with at most one blank line
+            return [(None, items[:-1], False, False)]
+        return [(None, items, False, False)]
+    depth = 0
+    for indent in items:
+        if len(line) - len(line.lstrip(" ")) < indent:
+            break
+        line = line[indent:]
+        depth += 1
+    if depth == len(items) and block is not None:
+        if _block_closes(block, line):
+            return [(None, items, False, False)]
+        return [(block, items, False, False)]
+    if depth == len(items):
+        starts = _line_starts(line, paragraph, rules)
+    elif block is None and paragraph and not _LAZY_LIST_MARKER.match(line):
+        # the unmatched list items are closed, unless this is a lazy continuation
+        # (which any list item interrupts)
+        text: _LineStart = (None, (), False, True)
+        starts = _line_starts(line, True, rules)
+        lazy: list[_ScanState] = []
+        if text in starts:
+            starts.remove(text)
+            lazy.append((None, items, False, True))
+            if _rule_active(rules, "deflist") is not False:
+                # the line may also be the term of a definition list
+                lazy.append((None, items[:depth], False, True))
+        return lazy + [
+            (new_block, items[:depth] + new_items, new_empty, new_paragraph)
+            for new_block, new_items, new_empty, new_paragraph in starts
+        ]
+    else:
+        starts = _line_starts(line, False, rules)
+    return [
+        (new_block, items[:depth] + new_items, new_empty, new_paragraph)
+        for new_block, new_items, new_empty, new_paragraph in starts
+    ]
+
+
+def _line_starts(
+    line: str, paragraph: bool, rules: Collection[str] | None
+) -> list[_LineStart]:
+    """Return the possible interpretations of a non-blank line,
+    outside of any block.
+
+    :param line: The line (with tabs expanded), relative to its container
+    :param paragraph: Whether the previous line was paragraph text
+    :param rules: The names of the active block rules, or None if not known
+    """
+    content = line.lstrip(" ")
+    indent = len(line) - len(content)
+    if indent >= 4:
+        # indented code, or a paragraph continuation
+        return [(None, (), False, paragraph)]
+    starts: list[_LineStart] | None = None
+    if match := _FENCE_OPEN.match(content):
+        fence = match.group()
+        if fence[0] != "`" or "`" not in content[match.end() :]:
+            rule = "colon_fence" if fence[0] == ":" else "fence"
+            starts = _block_starts(rules, rule, ("fence", fence))
+    elif content.startswith("$$") and not paragraph:
+        # a math block cannot interrupt a paragraph
+        stripped = content.rstrip()
+        block: _Block | None = ("math", "$$")
+        if len(stripped) > 3 and (
+            stripped.endswith("$$") or _DOLLAR_EQNO.search(stripped)
+        ):
+            block = None
+        starts = _math_starts(rules, "math_block", block)
+    elif match := _AMSMATH_OPEN.match(content):
+        end_marker = f"\\end{{{match.group(1)}}}"
+        block = None if content.rstrip().endswith(end_marker) else ("math", end_marker)
+        starts = _math_starts(rules, "amsmath", block)
+    elif match := _HTML_OPEN.match(content):
+        tag = match.group(1).lower()
+        end_marker = "-->" if tag == "!--" else f"</{tag}>"
+        block = (
+            None
+            if end_marker in content.lower()[match.end() :]
+            else ("html", end_marker)
+        )
+        starts = _block_starts(rules, "html_block", block)
+    elif content.startswith(("<?", "<!")):
+        end_marker = "?>" if content[1] == "?" else ">"
+        if content.startswith("<![CDATA["):
+            end_marker = "]]>"
+        block = None if end_marker in content[2:] else ("html", end_marker)
+        starts = _block_starts(rules, "html_block", block)
+    elif _HTML_BLOCK_OPEN.match(content):
+        starts = _block_starts(rules, "html_block", ("html_blank",))
+    elif content.startswith("<") and not paragraph:
+        # may be an HTML block, ending at a blank line, or paragraph text
+        starts = _block_starts(rules, "html_block", ("html_blank",))
+        if starts is not None and len(starts) == 1:
+            starts.append((None, (), False, True))
+    if starts is not None:
+        return starts
+    if _CHUNK_HEADING.match(content) or _THEMATIC_BREAK.match(content):
+        return [(None, (), False, False)]
+    if paragraph and _SETEXT_UNDERLINE.match(content):
+        return [(None, (), False, False)]
+    if content.startswith(">") or any(
+        pattern.match(content) and _rule_active(rules, name) is not False
+        for name, pattern in _INTERRUPTING_LINES
+    ):
+        # the block quote may contain paragraph text, or another block,
+        # and the other lines may also be paragraph text
+        return [(None, (), False, True), (None, (), False, False)]
+    if match := _LIST_MARKER.match(content):
+        rest = content[match.end() :]
+        item_content = rest.lstrip(" ")
+        if paragraph and (not item_content or match.group(2) not in (None, "1")):
+            # the list item cannot interrupt a paragraph
+            return [(None, (), False, True)]
+        marker_end = indent + match.end()
+        if not item_content:
+            return [(None, (marker_end + 1,), True, False)]
+        spaces = len(rest) - len(item_content)
+        if spaces > 4:
+            # the item starts with indented code
+            return [(None, (marker_end + 1,), False, False)]
+        return [
+            (new_block, (marker_end + spaces, *new_items), new_empty, new_paragraph)
+            for new_block, new_items, new_empty, new_paragraph in _line_starts(
+                item_content, False, rules
+            )
+        ]
+    return [(None, (), False, True)]
+
+
+_EXTENSION_RULES = frozenset(
+    ("amsmath", "colon_fence", "deflist", "fieldlist", "math_block")
+)
+"""Block rules that are only active for some syntax extensions."""
+
+
+def _rule_active(rules: Collection[str] | None, name: str) -> bool | None:
+    """Return whether a block rule is active, or None if not known."""
+    if rules is None:
+        return None if name in _EXTENSION_RULES else True
+    return name in rules
+
+
+def _block_starts(
+    rules: Collection[str] | None, name: str, block: _Block | None
+) -> list[_LineStart] | None:
+    """Return the possible interpretations of a line that may start a block,
+    or None if the rule parsing the block is not active.
+    """
+    active = _rule_active(rules, name)
+    if active is False:
+        return None
+    if active:
+        return [(block, (), False, False)]
+    return [(block, (), False, False), (None, (), False, True)]
+
+
+def _math_starts(
+    rules: Collection[str] | None, name: str, block: _Block | None
+) -> list[_LineStart] | None:
+    """Return the possible interpretations of a line that may start math,
+    or None if the rule parsing the math is not active.
+    """
+    starts = _block_starts(rules, name, block)
+    if starts is not None and block is not None and len(starts) == 1:
+        # the math is only parsed as such if it is closed
+        starts.append((None, (), False, True))
+    return starts
+
+
+def _block_closes(block: _Block, line: str) -> bool:
+    """Return whether the line (relative to its container) closes the block."""
+    kind = block[0]
+    if kind in ("fence", "front"):
+        content = line.lstrip(" ")
+        if kind == "front" and content == "...":
+            return True
+        if len(line) - len(content) >= 4:
+            return False
+        marker = block[1]
+        return content.startswith(marker) and not content.lstrip(marker[0]).strip()
+    if kind == "html":
+        return block[1] in line.lower()
+    return False
+
+
+class MdParserPool:
+    """A bounded (least-recently-used) pool of Markdown parsers.
+
+    Creating a parser builds the full rule chains and loads every plugin,
+    so, rather than creating one per document,
+    parsers are reused by all documents sharing the same configuration and renderer.
+
+    A parser is checked out of the pool for as long as it is in use,
+    so that re-entrant parsing (for example, a MyST file included from
+    within an rST block of another MyST file) is given its own parser.
+    """
+
+    def __init__(self, maxsize: int = 16) -> None:
+        """Initialise the pool.
+
+        :param maxsize: The maximum number of configurations to keep parsers for
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        """Number of times an existing parser was reused."""
+        self.misses = 0
+        """Number of times a new parser had to be created."""
+        self._parsers: OrderedDict[
+            tuple[str, Callable[..., RendererProtocol], bool], list[MarkdownIt]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of idle parsers in the pool."""
+        return sum(len(parsers) for parsers in self._parsers.values())
+
+    def clear(self) -> None:
+        """Remove all parsers from the pool, and reset the counters."""
+        with self._lock:
+            self._parsers.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @contextmanager
+    def acquire(
+        self,
+        config: MdParserConfig,
+        renderer: Callable[[MarkdownIt], RendererProtocol],
+    ) -> Iterator[MarkdownIt]:
+        """Check out a parser for the configuration and renderer,
+        creating one if none is available, and return it to the pool after use.
+        """
+        # the created parser also depends on whether linkify is installed
+        key = (config.fingerprint(), renderer, linkify_available())
+        md: MarkdownIt | None = None
+        with self._lock:
+            idle = self._parsers.get(key)
+            if idle:
+                md = idle.pop()
+                self._parsers.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if md is None:
+            md = create_md_parser(config, renderer)
+        # the pooled parser was created with an equal, but not necessarily
+        # identical, configuration, so point it at the one in use
+        md.options["myst_config"] = config
+        try:
+            yield md
+        finally:
+            # do not keep the (potentially large) rendered document alive
+            md.options.pop("document", None)
+            teardown = getattr(md.renderer, "teardown_render", None)
+            if teardown is not None:
+                teardown()
+            with self._lock:
+                self._parsers.setdefault(key, []).append(md)
+                self._parsers.move_to_end(key)
+                while len(self._parsers) > self.maxsize:
+                    self._parsers.popitem(last=False)
+
+
+MD_PARSER_POOL = MdParserPool()
+"""The pool of parsers shared by the docutils and sphinx parsers."""
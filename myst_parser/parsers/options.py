@@ -17,6 +17,8 @@ https://stackoverflow.com/a/21699210/5033292
 
 from __future__ import annotations
 
+import re
+from bisect import bisect_right
 from collections.abc import Iterable
 from dataclasses import dataclass, replace
 from dataclasses import field as dc_field
@@ -33,13 +35,26 @@ class Position:
 
 
 class StreamBuffer:
-    """A buffer for a stream of characters."""
+    """A buffer for a stream of characters.
+
+    The line and column of the current index are computed on demand,
+    from the precomputed start index of each line,
+    so that moving forward is independent of the number of characters.
+    """
 
     def __init__(self, stream: str):
         self._buffer = stream + _CHARS_END
         self._index = 0
-        self._line = 0
-        self._column = 0
+        self._line_starts = [0]
+        self._line_starts.extend(
+            match.end() for match in _REGEX_LINE_BREAK.finditer(self._buffer)
+        )
+        # byte order marks are not counted as columns
+        self._boms = (
+            [index for index, ch in enumerate(self._buffer) if ch == "\ufeff"]
+            if "\ufeff" in self._buffer
+            else None
+        )
 
     @property
     def index(self) -> int:
@@ -47,11 +62,21 @@ class StreamBuffer:
 
     @property
     def line(self) -> int:
-        return self._line
+        return bisect_right(self._line_starts, self._index) - 1
 
     @property
     def column(self) -> int:
-        return self._column
+        return self._line_and_column()[1]
+
+    def _line_and_column(self) -> tuple[int, int]:
+        line = bisect_right(self._line_starts, self._index) - 1
+        line_start = self._line_starts[line]
+        column = self._index - line_start
+        if self._boms is not None:
+            column -= bisect_right(self._boms, self._index - 1) - bisect_right(
+                self._boms, line_start - 1
+            )
+        return line, column
 
     def peek(self, index: int = 0) -> str:
         return self._buffer[self._index + index]
@@ -59,21 +84,16 @@ class StreamBuffer:
     def prefix(self, length: int = 1) -> str:
         return self._buffer[self._index : self._index + length]
 
+    def match_length(self, regex: re.Pattern[str]) -> int:
+        """Return the length of the match of the regex, at the current index."""
+        match = regex.match(self._buffer, self._index)
+        return 0 if match is None else match.end() - self._index
+
     def forward(self, length: int = 1) -> None:
-        while length:
-            ch = self._buffer[self._index]
-            self._index += 1
-            if ch in "\n\x85\u2028\u2029" or (
-                ch == "\r" and self._buffer[self._index] != "\n"
-            ):
-                self._line += 1
-                self._column = 0
-            elif ch != "\ufeff":
-                self._column += 1
-            length -= 1
+        self._index += length
 
     def get_position(self) -> Position:
-        return Position(self._index, self._line, self._column)
+        return Position(self._index, *self._line_and_column())
 
 
 @dataclass
@@ -194,6 +214,9 @@ def options_to_tokens(
 
     :raises: `TokenizeError`
     """
+    simple_tokens = _simple_to_tokens(text)
+    if simple_tokens is not None:
+        return simple_tokens, State()
     state = State()
     tokens = list(_to_tokens(text, state, line_offset, column_offset))
     return tokens, state
@@ -216,6 +239,53 @@ def options_to_items(
     ], state
 
 
+_REGEX_SIMPLE_OPTION = re.compile(r"([\w.+-]+):(?: +([^ |>'\"][^\n]*?))? *")
+"""A single line ``key: value`` option, with a plain key and an optional plain value."""
+
+_CHARS_NOT_SIMPLE = frozenset("#\t\r\x85\u2028\u2029\ufeff\0")
+"""Characters which require the full tokenizer (comments, tabs, other line breaks)."""
+
+
+def _simple_to_tokens(text: str) -> list[tuple[KeyToken, ValueToken | None]] | None:
+    """Parse an option block consisting only of single line ``key: value`` options,
+    or return None if the block requires the full tokenizer.
+
+    This is a fast path for the vast majority of option blocks,
+    which yields the same tokens as the full tokenizer.
+    """
+    if not _CHARS_NOT_SIMPLE.isdisjoint(text):
+        return None
+    tokens: list[tuple[KeyToken, ValueToken | None]] = []
+    lines = text.split("\n")
+    index = 0
+    for line_num, line in enumerate(lines):
+        if line:
+            match = _REGEX_SIMPLE_OPTION.fullmatch(line)
+            if match is None:
+                return None
+            key, value = match.group(1, 2)
+            key_token = KeyToken(
+                Position(index, line_num, 0),
+                Position(index + len(key), line_num, len(key)),
+                key,
+            )
+            value_token: ValueToken | None = None
+            if value is not None:
+                start, end = match.span(2)
+                value_token = ValueToken(
+                    Position(index + start, line_num, start),
+                    Position(index + end, line_num, end),
+                    value,
+                )
+            elif line_num == len(lines) - 1:
+                # an empty value at the end of the stream is still a (empty) value
+                end_mark = Position(index + len(line), line_num, len(line))
+                value_token = ValueToken(end_mark, end_mark, "")
+            tokens.append((key_token, value_token))
+        index += len(line) + 1
+    return tokens
+
+
 def _to_tokens(
     text: str, state: State, line_offset: int = 0, column_offset: int = 0
 ) -> Iterable[tuple[KeyToken, ValueToken | None]]:
@@ -304,12 +374,10 @@ def _scan_to_next_token(stream: StreamBuffer, state: State) -> None:
         stream.forward()
     found = False
     while not found:
-        while stream.peek() == " ":
-            stream.forward()
+        stream.forward(stream.match_length(_REGEX_SPACES))
         if stream.peek() == "#":
             state.record_comment(stream.line)
-            while stream.peek() not in _CHARS_END_NEWLINE:
-                stream.forward()
+            stream.forward(stream.match_length(_REGEX_LINE))
         if not _scan_line_break(stream):
             found = True
 
@@ -323,19 +391,12 @@ def _scan_plain_scalar(
     indent = 0 if is_key else 1
     spaces: list[str] = []
     while True:
-        length = 0
         if stream.peek() == "#":
             state.record_comment(stream.line)
             break
-        while True:
-            ch = stream.peek(length)
-            if ch in _CHARS_END_SPACE_TAB_NEWLINE or (
-                is_key
-                and ch == ":"
-                and stream.peek(length + 1) in _CHARS_END_SPACE_TAB_NEWLINE
-            ):
-                break
-            length += 1
+        length = stream.match_length(
+            _REGEX_PLAIN_KEY_CHUNK if is_key else _REGEX_PLAIN_VALUE_CHUNK
+        )
         if length == 0:
             break
         chunks.extend(spaces)
@@ -357,9 +418,7 @@ def _scan_plain_scalar(
 
 def _scan_plain_spaces(stream: StreamBuffer, allow_newline: bool = True) -> list[str]:
     chunks = []
-    length = 0
-    while stream.peek(length) == " ":
-        length += 1
+    length = stream.match_length(_REGEX_SPACES)
     whitespaces = stream.prefix(length)
     stream.forward(length)
     ch = stream.peek()
@@ -429,9 +488,7 @@ def _scan_flow_scalar_non_spaces(
 ) -> list[str]:
     chunks = []
     while True:
-        length = 0
-        while stream.peek(length) not in "'\"\\" + _CHARS_END_SPACE_TAB_NEWLINE:
-            length += 1
+        length = stream.match_length(_REGEX_FLOW_CHUNK)
         if length:
             chunks.append(stream.prefix(length))
             stream.forward(length)
@@ -478,9 +535,7 @@ def _scan_flow_scalar_non_spaces(
 
 def _scan_flow_scalar_spaces(stream: StreamBuffer, start_mark: Position) -> list[str]:
     chunks = []
-    length = 0
-    while stream.peek(length) in " \t":
-        length += 1
+    length = stream.match_length(_REGEX_SPACES_TABS)
     whitespaces = stream.prefix(length)
     stream.forward(length)
     ch = stream.peek()
@@ -507,8 +562,7 @@ def _scan_flow_scalar_spaces(stream: StreamBuffer, start_mark: Position) -> list
 def _scan_flow_scalar_breaks(stream: StreamBuffer) -> list[str]:
     chunks = []
     while True:
-        while stream.peek() in " \t":
-            stream.forward()
+        stream.forward(stream.match_length(_REGEX_SPACES_TABS))
         if stream.peek() in _CHARS_NEWLINE:
             chunks.append(_scan_line_break(stream))
         else:
@@ -544,9 +598,7 @@ def _scan_block_scalar(
     while stream.column == indent and stream.peek() != _CHARS_END:
         chunks.extend(breaks)
         leading_non_space = stream.peek() not in " \t"
-        length = 0
-        while stream.peek(length) not in _CHARS_END_NEWLINE:
-            length += 1
+        length = stream.match_length(_REGEX_LINE)
         chunks.append(stream.prefix(length))
         stream.forward(length)
         line_break = _scan_line_break(stream)
@@ -623,12 +675,10 @@ def _scan_block_scalar_indicators(
 def _scan_block_scalar_ignored_line(
     stream: StreamBuffer, start_mark: Position, state: State
 ) -> None:
-    while stream.peek() == " ":
-        stream.forward()
+    stream.forward(stream.match_length(_REGEX_SPACES))
     if stream.peek() == "#":
         state.record_comment(stream.line)
-        while stream.peek() not in _CHARS_END_NEWLINE:
-            stream.forward()
+        stream.forward(stream.match_length(_REGEX_LINE))
     ch = stream.peek()
     if ch not in _CHARS_END_NEWLINE:
         raise TokenizeError(
@@ -651,9 +701,8 @@ def _scan_block_scalar_indentation(
             chunks.append(_scan_line_break(stream))
             end_mark = stream.get_position()
         else:
-            stream.forward()
-            if stream.column > max_indent:
-                max_indent = stream.column
+            stream.forward(stream.match_length(_REGEX_SPACES))
+            max_indent = max(max_indent, stream.column)
     return chunks, max_indent, end_mark
 
 
@@ -662,16 +711,21 @@ def _scan_block_scalar_breaks(
 ) -> tuple[list[str], Position]:
     chunks = []
     end_mark = stream.get_position()
-    while stream.column < indent and stream.peek() == " ":
-        stream.forward()
+    _scan_indentation(stream, indent)
     while stream.peek() in _CHARS_NEWLINE:
         chunks.append(_scan_line_break(stream))
         end_mark = stream.get_position()
-        while stream.column < indent and stream.peek() == " ":
-            stream.forward()
+        _scan_indentation(stream, indent)
     return chunks, end_mark
 
 
+def _scan_indentation(stream: StreamBuffer, indent: int) -> None:
+    """Skip spaces, up to the indentation column."""
+    column = stream.column
+    if column < indent:
+        stream.forward(min(indent - column, stream.match_length(_REGEX_SPACES)))
+
+
 _CHARS_END: Final[str] = "\0"
 _CHARS_NEWLINE: Final[str] = "\r\n\x85\u2028\u2029"
 _CHARS_END_NEWLINE: Final[str] = "\0\r\n\x85\u2028\u2029"
@@ -679,6 +733,26 @@ _CHARS_SPACE_NEWLINE: Final[str] = " \r\n\x85\u2028\u2029"
 _CHARS_END_SPACE_NEWLINE: Final[str] = "\0 \r\n\x85\u2028\u2029"
 _CHARS_END_SPACE_TAB_NEWLINE: Final[str] = "\0 \t\r\n\x85\u2028\u2029"
 
+_REGEX_LINE_BREAK: Final = re.compile("[\n\x85\u2028\u2029]|\r(?!\n)")
+"""A character that ends a line (``\\r\\n`` ending at the ``\\n``)."""
+_REGEX_SPACES: Final = re.compile(" *")
+_REGEX_SPACES_TABS: Final = re.compile("[ \t]*")
+_REGEX_LINE: Final = re.compile("[^\0\r\n\x85\u2028\u2029]*")
+"""The rest of the line."""
+_REGEX_PLAIN_VALUE_CHUNK: Final = re.compile(
+    "[^\0 \t\r\n\x85\u2028\u2029]*"
+    "(?: +[^\0 \t\r\n\x85\u2028\u2029#][^\0 \t\r\n\x85\u2028\u2029]*)*"
+)
+"""A plain scalar value, up to the next comment, line break or trailing spaces."""
+_REGEX_PLAIN_KEY_CHUNK: Final = re.compile(
+    "(?:[^\0 \t\r\n\x85\u2028\u2029:]|:(?![\0 \t\r\n\x85\u2028\u2029]))*"
+)
+"""A plain scalar key, up to the next space, line break or ``:`` separator."""
+_REGEX_FLOW_CHUNK: Final = re.compile(
+    "(?:[^'\"\\\\\0 \t\r\n\x85\u2028\u2029]|[ \t]+(?=[^ \t\0\r\n\x85\u2028\u2029]))*"
+)
+"""A quoted scalar, up to the next quote, escape, line break or trailing spaces."""
+
 _ESCAPE_REPLACEMENTS: Final[dict[str, str]] = {
     "0": "\0",
     "a": "\x07",
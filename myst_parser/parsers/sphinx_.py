@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+from typing import cast
+
 from docutils import nodes
 from docutils.parsers.rst import Parser as RstParser
+from sphinx.environment import BuildEnvironment
 from sphinx.parsers import Parser as SphinxParser
 from sphinx.util import logging
 
+from myst_parser import profiling
 from myst_parser.config.main import (
     MdParserConfig,
     TopmatterReadError,
@@ -21,12 +26,21 @@ from myst_parser.mdit_to_docutils.transforms import (
     ResolveAnchorIds,
     SortFootnotes,
 )
-from myst_parser.parsers.mdit import create_md_parser
+from myst_parser.parsers.mdit import MD_PARSER_POOL
+from myst_parser.parsers.token_cache import TokenCache, get_token_cache
 from myst_parser.warnings_ import create_warning
 
 SPHINX_LOGGER = logging.getLogger(__name__)
 
 
+def sphinx_token_cache(env: BuildEnvironment) -> TokenCache:
+    """Return the token cache of a sphinx build, stored in the doctree directory."""
+    config: MdParserConfig = env.myst_config  # type: ignore[attr-defined]
+    return get_token_cache(
+        Path(env.doctreedir) / "myst_tokens", config.token_cache_max_size * 2**20
+    )
+
+
 class MystParser(SphinxParser):
     """Sphinx parser for Markedly Structured Text (MyST)."""
 
@@ -82,6 +96,24 @@ class MystParser(SphinxParser):
                 )
                 config = merge_file_level(config, topmatter, warning)
 
-        parser = create_md_parser(config, SphinxRenderer)
-        parser.options["document"] = document
-        parser.render(inputstring)
+        with (
+            profiling.document(document.settings.env.docname, config.profile),
+            MD_PARSER_POOL.acquire(config, SphinxRenderer) as parser,
+        ):
+            parser.options["document"] = document
+            if config.render_chunk_lines > 0:
+                with profiling.record("render"):
+                    cast(SphinxRenderer, parser.renderer).render_chunks(
+                        inputstring, parser.options, {}
+                    )
+                return
+            with profiling.record("parse"):
+                if config.token_cache:
+                    tokens, env = sphinx_token_cache(document.settings.env).parse(
+                        parser, inputstring, config
+                    )
+                else:
+                    env = {}
+                    tokens = parser.parse(inputstring, env)
+            with profiling.record("render"):
+                parser.renderer.render(tokens, parser.options, env)
@@ -0,0 +1,271 @@
+"""A persistent, on-disk cache of parsed markdown-it token streams.
+
+For a given source text and parser configuration, the tokens output by
+``MarkdownIt.parse`` are deterministic,
+so they can be stored between builds and re-used for unchanged documents,
+skipping the parse entirely.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+import time
+import zlib
+from collections.abc import MutableMapping
+from contextlib import suppress
+from hashlib import sha256
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+
+from myst_parser.config.main import MdParserConfig
+from myst_parser.parsers.mdit import linkify_available
+
+_PACKAGES = ("myst-parser", "markdown-it-py", "mdit-py-plugins", "linkify-it-py")
+"""Packages, whose versions may change the output of a parse."""
+
+
+def _package_versions() -> str:
+    """Return the versions of the packages that may change the output of a parse."""
+    versions = []
+    for name in _PACKAGES:
+        try:
+            versions.append(f"{name}=={version(name)}")
+        except PackageNotFoundError:
+            versions.append(f"{name}==")
+    return ";".join(versions)
+
+
+class TokenCache:
+    """An on-disk cache, mapping source text and parser configuration
+    to the token stream (and environment) output by ``MarkdownIt.parse``.
+
+    Each entry is stored as a zlib compressed pickle in a separate file,
+    and the least recently used entries are evicted,
+    once the total size exceeds ``max_size`` bytes.
+    """
+
+    suffix = ".tokens"
+
+    def __init__(self, path: str | os.PathLike[str], max_size: int) -> None:
+        """Initialise the cache.
+
+        :param path: The directory to store entries in (created on first write)
+        :param max_size: The maximum total size of the entries, in bytes
+        """
+        self.path = Path(path)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._size: int | None = None
+        self._lock = threading.Lock()
+        self._versions = _package_versions()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self.path)!r}, {self.max_size})"
+
+    def key(self, text: str, config: MdParserConfig) -> str:
+        """Return the cache key for a source text and parser configuration."""
+        hasher = sha256()
+        hasher.update(self._versions.encode("utf8"))
+        hasher.update(f";linkify={linkify_available()};".encode())
+        hasher.update(config.fingerprint().encode("utf8"))
+        hasher.update(text.encode("utf8", "surrogatepass"))
+        return hasher.hexdigest()
+
+    def get(self, key: str) -> tuple[list[Token], dict[str, Any]] | None:
+        """Return the tokens and environment of an entry, or None if not cached."""
+        entry = self.path / (key + self.suffix)
+        try:
+            tokens, env = pickle.loads(zlib.decompress(entry.read_bytes()))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (
+            OSError,
+            EOFError,
+            ValueError,
+            zlib.error,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+            TypeError,
+        ):
+            # a corrupt (e.g. partially written) or outdated entry
+            entry.unlink(missing_ok=True)
+            self._size = None
+            self.misses += 1
+            return None
+        with suppress(OSError):
+            # mark as recently used
+            self._touch(entry)
+        self.hits += 1
+        return tokens, env
+
+    def set(self, key: str, tokens: list[Token], env: MutableMapping[str, Any]) -> bool:
+        """Store the tokens and environment of an entry.
+
+        :returns: False if the entry could not be stored
+        """
+        try:
+            data = zlib.compress(
+                pickle.dumps((tokens, dict(env)), pickle.HIGHEST_PROTOCOL)
+            )
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # e.g. a plugin stored an unpicklable object in the environment
+            return False
+        if len(data) > self.max_size:
+            return False
+        entry = self.path / (key + self.suffix)
+        temp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}")
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            temp.write_bytes(data)
+            # atomic, so that concurrent builds never read a partial entry
+            os.replace(temp, entry)
+            self._touch(entry)
+        except OSError:
+            temp.unlink(missing_ok=True)
+            return False
+        self.writes += 1
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data)
+            self._evict()
+        return True
+
+    def parse(
+        self, md: MarkdownIt, text: str, config: MdParserConfig
+    ) -> tuple[list[Token], dict[str, Any]]:
+        """Parse the text, re-using the tokens of a previous parse if cached.
+
+        :param md: The parser, created from ``config``
+        :param text: The source text
+        :param config: The configuration of the parser
+        :returns: The tokens and the environment that the parse populated
+        """
+        if not config.is_fingerprint_stable():
+            # the key would not identify the configuration in another process
+            env: dict[str, Any] = {}
+            return md.parse(text, env), env
+        key = self.key(text, config)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        env = {}
+        tokens = md.parse(text, env)
+        self.set(key, tokens, env)
+        return tokens, env
+
+    def size(self) -> int:
+        """Return the total size of the entries, in bytes."""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(
+                    entry.stat().st_size for entry in self._entries(missing_ok=True)
+                )
+            return self._size
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            for entry in self._entries(missing_ok=True):
+                entry.unlink(missing_ok=True)
+            self._size = 0
+
+    def pop_counters(self) -> dict[str, int]:
+        """Return the usage counters, and reset them to zero,
+        e.g. to pass them from a worker process to the main process.
+        """
+        counters = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+        self.hits = self.misses = self.writes = self.evictions = 0
+        return counters
+
+    def add_counters(self, counters: dict[str, int]) -> None:
+        """Add usage counters, e.g. from the cache of a worker process."""
+        self.hits += counters["hits"]
+        self.misses += counters["misses"]
+        self.writes += counters["writes"]
+        self.evictions += counters["evictions"]
+        if counters["writes"] or counters["evictions"]:
+            # the entries were changed by another process
+            with self._lock:
+                self._size = None
+
+    def report(self) -> str:
+        """Return a one-line summary of the cache usage."""
+        return (
+            f"{self.hits} hits, {self.misses} misses, {self.writes} writes, "
+            f"{self.evictions} evictions ({self.size() / 2**20:.1f} MiB)"
+        )
+
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        """Set the modification time of an entry, which orders evictions.
+
+        The time is set explicitly, since file system timestamps may be coarse.
+        """
+        now = time.time_ns()
+        os.utime(entry, ns=(now, now))
+
+    def _entries(self, missing_ok: bool = False) -> list[Path]:
+        """Return the paths of the entries."""
+        if missing_ok and not self.path.is_dir():
+            return []
+        return list(self.path.glob("*" + self.suffix))
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries, until within the maximum size."""
+        if self._size is not None and self._size <= self.max_size:
+            return
+        stats = []
+        for entry in self._entries(missing_ok=True):
+            with suppress(FileNotFoundError):
+                stats.append((entry.stat(), entry))
+        size = sum(stat.st_size for stat, _ in stats)
+        stats.sort(key=lambda item: item[0].st_mtime_ns)
+        for stat, entry in stats:
+            if size <= self.max_size:
+                break
+            entry.unlink(missing_ok=True)
+            size -= stat.st_size
+            self.evictions += 1
+        self._size = size
+
+
+_TOKEN_CACHES: dict[tuple[str, int], TokenCache] = {}
+_TOKEN_CACHES_LOCK = threading.Lock()
+
+
+def get_token_cache(path: str | os.PathLike[str], max_size: int) -> TokenCache:
+    """Return the (process-wide) cache for a directory,
+    so that its usage statistics accumulate over a build.
+
+    :param path: The directory to store entries in
+    :param max_size: The maximum total size of the entries, in bytes
+    """
+    key = (os.path.abspath(path), max_size)
+    with _TOKEN_CACHES_LOCK:
+        try:
+            return _TOKEN_CACHES[key]
+        except KeyError:
+            cache = _TOKEN_CACHES[key] = TokenCache(key[0], max_size)
+            return cache
+
+
+def token_caches() -> list[TokenCache]:
+    """Return the (process-wide) caches that have been used in this process."""
+    with _TOKEN_CACHES_LOCK:
+        return list(_TOKEN_CACHES.values())
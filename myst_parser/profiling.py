@@ -0,0 +1,217 @@
+"""Opt-in profiling of the phases of parsing and rendering.
+
+Profiling is enabled by the ``myst_profile`` configuration,
+or by setting the ``MYST_PROFILE`` environment variable (to anything but ``0``).
+It records the wall time and number of calls of each phase,
+keyed by:
+
+- ``parse``: markdown-it tokenization
+- ``render``: rendering the tokens to docutils nodes
+- ``render:<type>``: each render method, by token type (including nested calls)
+- ``directive:<name>``: each directive run
+- ``directive_lookup``: each lookup of a directive class
+  (and ``directive_lookup:cached`` for each lookup served from the cache)
+- ``substitution``: rendering Jinja substitutions
+- ``transform:<name>``: each MyST transform
+
+Records are aggregated per document and across the build,
+and a summary is reported at the end of a sphinx build or docutils CLI run
+(including batch runs, whose worker processes return their records).
+At the end of a sphinx build the profiler is then discarded,
+so that it does not carry over to later builds in the same process.
+Callbacks can also be added, to receive every record as it is made::
+
+    from myst_parser import profiling
+
+    profiling.enable().add_callback(lambda document, key, seconds: ...)
+
+Note, in a parallel sphinx build, records are only made in the main process.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import wraps
+from typing import Any, TypeVar
+
+ProfileCallback = Callable[[str, str, float], None]
+"""A function called with the document name, key and seconds of each record."""
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class Profiler:
+    """Records the wall time and number of calls of each phase."""
+
+    def __init__(self) -> None:
+        self.document = ""
+        """The name of the document currently being processed."""
+        self.totals: dict[str, list[float]] = {}
+        """Mapping of key to ``[calls, seconds]``, across all documents."""
+        self.documents: dict[str, dict[str, list[float]]] = {}
+        """Mapping of document name to key to ``[calls, seconds]``."""
+        self._callbacks: list[ProfileCallback] = []
+
+    def add_callback(self, callback: ProfileCallback) -> None:
+        """Add a function, to be called with every record."""
+        self._callbacks.append(callback)
+
+    def add(self, key: str, seconds: float) -> None:
+        """Add a record of a call."""
+        for totals in (
+            self.totals,
+            self.documents.setdefault(self.document, {}),
+        ):
+            try:
+                total = totals[key]
+            except KeyError:
+                totals[key] = [1, seconds]
+            else:
+                total[0] += 1
+                total[1] += seconds
+        for callback in self._callbacks:
+            callback(self.document, key, seconds)
+
+    def merge(self, documents: dict[str, dict[str, list[float]]]) -> None:
+        """Add the records of another profiler, e.g. from a worker process.
+
+        :param documents: The ``documents`` of the other profiler
+        """
+        for document, records in documents.items():
+            for totals in (self.totals, self.documents.setdefault(document, {})):
+                for key, (calls, seconds) in records.items():
+                    try:
+                        total = totals[key]
+                    except KeyError:
+                        totals[key] = [calls, seconds]
+                    else:
+                        total[0] += calls
+                        total[1] += seconds
+
+    @contextmanager
+    def record(self, key: str) -> Iterator[None]:
+        """Record the wall time of the enclosed code."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(key, time.perf_counter() - start)
+
+    def clear(self) -> None:
+        """Remove all records."""
+        self.document = ""
+        self.totals.clear()
+        self.documents.clear()
+
+    def summary(self, limit: int = 30) -> str:
+        """Return a summary of the records, as a table.
+
+        :param limit: The maximum number of keys and of documents to list
+        """
+        lines = [f"{'key':<40} {'calls':>8} {'total (s)':>10} {'mean (ms)':>10}"]
+        for key, (calls, seconds) in sorted(
+            self.totals.items(), key=lambda item: -item[1][1]
+        )[:limit]:
+            lines.append(
+                f"{key:<40} {int(calls):>8} {seconds:>10.3f} "
+                f"{1e3 * seconds / calls:>10.3f}"
+            )
+        durations = {
+            document: sum(
+                totals[key][1] for key in ("parse", "render") if key in totals
+            )
+            for document, totals in self.documents.items()
+            if document
+        }
+        if durations:
+            lines.append("")
+            lines.append(f"{'slowest documents (parse + render)':<59} {'(s)':>10}")
+            for document, seconds in sorted(
+                durations.items(), key=lambda item: -item[1]
+            )[:limit]:
+                lines.append(f"{document:<59} {seconds:>10.3f}")
+        return "\n".join(lines)
+
+
+_PROFILER: Profiler | None = None
+
+
+def get_profiler() -> Profiler | None:
+    """Return the active profiler, or None if profiling is not enabled."""
+    return _PROFILER
+
+
+def enable() -> Profiler:
+    """Enable profiling (if not already enabled), and return the active profiler."""
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = Profiler()
+    return _PROFILER
+
+
+def disable() -> None:
+    """Disable profiling, discarding the active profiler."""
+    global _PROFILER
+    _PROFILER = None
+
+
+def enabled_by_env() -> bool:
+    """Return whether profiling is enabled by the ``MYST_PROFILE`` variable."""
+    return os.environ.get("MYST_PROFILE", "0") not in ("", "0")
+
+
+@contextmanager
+def document(name: str, enable_profiling: bool = False) -> Iterator[Profiler | None]:
+    """Record for a document, within the context.
+
+    The previous document is restored on exit,
+    so that nested parses (e.g. of included files) do not take its later records.
+
+    :param name: The name of the document
+    :param enable_profiling: Enable profiling (it is also enabled by ``MYST_PROFILE``)
+    :yields: The active profiler, or None if profiling is not enabled
+    """
+    if enable_profiling or enabled_by_env():
+        enable()
+    profiler = _PROFILER
+    if profiler is None:
+        yield None
+        return
+    previous = profiler.document
+    profiler.document = name
+    try:
+        yield profiler
+    finally:
+        profiler.document = previous
+
+
+_NO_RECORD: AbstractContextManager[None] = nullcontext()
+"""A shared (re-usable) context, for when profiling is not enabled."""
+
+
+def record(key: str) -> AbstractContextManager[None]:
+    """Record the wall time of the enclosed code, if profiling is enabled."""
+    profiler = _PROFILER
+    if profiler is None:
+        return _NO_RECORD
+    return profiler.record(key)
+
+
+def profiled(key: str) -> Callable[[_F], _F]:
+    """Decorate a function, to record its wall time if profiling is enabled."""
+
+    def _decorator(func: _F) -> _F:
+        @wraps(func)
+        def _wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _PROFILER
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.record(key):
+                return func(*args, **kwargs)
+
+        return _wrapper  # type: ignore[return-value]
+
+    return _decorator
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from copy import copy
 from typing import cast
 
 from docutils import nodes
@@ -72,10 +71,14 @@ class FigureMarkdown(SphinxDirective):
         state = cast(MockState, self.state)
 
         # ensure html image enabled
-        myst_extensions = copy(state._renderer.md_config.enable_extensions)
+        myst_extensions = state._renderer.md_config.enable_extensions
         node = nodes.Element()
         try:
-            state._renderer.md_config.enable_extensions.add("html_image")
+            # the config values may be shared, so must not be mutated in-place
+            state._renderer.md_config.enable_extensions = {
+                *myst_extensions,
+                "html_image",
+            }
             state.nested_parse(self.content, self.content_offset, node)
         finally:
             state._renderer.md_config.enable_extensions = myst_extensions
@@ -65,6 +65,9 @@ def setup_sphinx(app: Sphinx, load_parser: bool = False) -> None:
 
     app.connect("builder-inited", create_myst_config)
     app.connect("builder-inited", override_mathjax)
+    app.connect("builder-inited", clear_profile)
+    app.connect("build-finished", report_token_cache)
+    app.connect("build-finished", report_profile)
 
 
 def create_myst_config(app):
@@ -107,3 +110,43 @@ def create_myst_config(app):
             type="myst",
             subtype=MystWarnings.LINKIFY.value,
         )
+
+
+def report_token_cache(app: Sphinx, exception: Exception | None) -> None:
+    """Log the usage of the token cache, at the end of the build.
+
+    The counters are those of the main process,
+    so in a parallel build they exclude documents read by worker processes.
+    """
+    from sphinx.util import logging
+
+    from myst_parser.parsers.sphinx_ import sphinx_token_cache
+
+    config = getattr(app.env, "myst_config", None)
+    if config is None or not config.token_cache:
+        return
+    cache = sphinx_token_cache(app.env)
+    logging.getLogger(__name__).info("myst token cache: %s", cache.report())
+
+
+def clear_profile(app: Sphinx) -> None:
+    """Remove any profiling records, made before the build."""
+    from myst_parser import profiling
+
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        profiler.clear()
+
+
+def report_profile(app: Sphinx, exception: Exception | None) -> None:
+    """Log the profiling summary, at the end of the build,
+    then discard the profiler, so that it does not carry over to later builds.
+    """
+    from sphinx.util import logging
+
+    from myst_parser import profiling
+
+    profiler = profiling.get_profiler()
+    if profiler is not None:
+        logging.getLogger(__name__).info("myst profile:\n%s", profiler.summary())
+        profiling.disable()
@@ -7,7 +7,8 @@ and allows for nested syntax
 from __future__ import annotations
 
 import re
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
+from weakref import WeakKeyDictionary
 
 from docutils import nodes
 from docutils.nodes import Element, document
@@ -15,6 +16,7 @@ from markdown_it.common.normalize_url import normalizeLink
 from sphinx import addnodes
 from sphinx.addnodes import pending_xref
 from sphinx.domains.std import StandardDomain
+from sphinx.environment import BuildEnvironment
 from sphinx.errors import NoUri
 from sphinx.ext.intersphinx import InventoryAdapter
 from sphinx.transforms.post_transforms import ReferencesResolver
@@ -25,8 +27,41 @@ from myst_parser import inventory
 from myst_parser._compat import findall
 from myst_parser.warnings_ import MystWarnings
 
+if TYPE_CHECKING:
+    from sphinx.util.typing import Inventory as SphinxInventoryType
+
 LOGGER = logging.getLogger(__name__)
 
+_INTERSPHINX_INDEXES: WeakKeyDictionary[
+    BuildEnvironment,
+    tuple[list[tuple[str, SphinxInventoryType]], inventory.InventoryIndex],
+] = WeakKeyDictionary()
+
+
+def get_intersphinx_index(env: BuildEnvironment) -> inventory.InventoryIndex:
+    """Return the index of the intersphinx inventories loaded in an environment.
+
+    The index is built once per set of loaded inventories,
+    and rebuilt when intersphinx (re)loads them, which replaces their data.
+    It is kept outside the environment, so that it is not pickled with it.
+    """
+    named = list(InventoryAdapter(env).named_inventory.items())
+    cached = _INTERSPHINX_INDEXES.get(env)
+    if (
+        cached is not None
+        and len(cached[0]) == len(named)
+        and all(
+            name == cached_name and data is cached_data
+            for (name, data), (cached_name, cached_data) in zip(
+                named, cached[0], strict=True
+            )
+        )
+    ):
+        return cached[1]
+    index = inventory.InventoryIndex.from_sphinx_inventories(dict(named))
+    _INTERSPHINX_INDEXES[env] = (named, index)
+    return index
+
 
 class MystReferenceResolver(ReferencesResolver):
     """Resolves cross-references on doctrees.
@@ -400,6 +435,7 @@ class MystReferenceResolver(ReferencesResolver):
             for m in inventory.filter_sphinx_inventories(
                 InventoryAdapter(self.env).named_inventory,
                 targets=target,
+                index=get_intersphinx_index(self.env),
             )
             if only_domains is None or m.domain in only_domains
         ]
@@ -9,11 +9,20 @@ from typing import Literal
 import markdown_it.main
 import pytest
 from docutils import nodes
-from docutils.core import publish_doctree
+from docutils.core import publish_doctree, publish_string
+from docutils.parsers.rst import directives
+from docutils.parsers.rst.directives.admonitions import Note
+from docutils.utils.code_analyzer import LexerError
 from markdown_it.token import Token
 
 from myst_parser.config.main import MdParserConfig
-from myst_parser.mdit_to_docutils.base import DocutilsRenderer, make_document
+from myst_parser.mdit_to_docutils.base import (
+    _SUBSTITUTION_FRAGMENTS,
+    DocutilsRenderer,
+    compile_substitution,
+    get_pygments_lexer,
+    make_document,
+)
 from myst_parser.parsers.docutils_ import (
     Parser,
     attr_to_optparse_option,
@@ -670,3 +679,191 @@ def test_definition_list_orphan_definition():
     output = document.pformat()
     assert "no preceding term" in output
     assert "important content" in output
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_batch(tmp_path, capsys, jobs):
+    """Many files are converted, with errors reported per file."""
+    (tmp_path / "src" / "sub").mkdir(parents=True)
+    (tmp_path / "src" / "a.md").write_text("# A\n\ntext\n", encoding="utf8")
+    (tmp_path / "src" / "sub" / "b.md").write_text("# B\n", encoding="utf8")
+    (tmp_path / "src" / "bad.md").write_bytes(b"\xff\xfe")
+    with pytest.raises(SystemExit):
+        cli_html5(
+            [
+                "--batch",
+                str(tmp_path / "src"),
+                "-o",
+                str(tmp_path / "out"),
+                "-j",
+                jobs,
+                "--report=4",
+            ]
+        )
+    assert "<h1" in (tmp_path / "out" / "a.html").read_text(encoding="utf8")
+    assert (tmp_path / "out" / "sub" / "b.html").exists()
+    captured = capsys.readouterr()
+    assert f"{tmp_path / 'src' / 'bad.md'}: exited with status 1" in captured.err
+    assert "Converted 2 of 3 file(s)" in captured.err
+
+
+def test_cli_batch_collision(tmp_path, capsys):
+    """Sources that would be written to the same output are an error."""
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "index.md").write_text("# A\n", encoding="utf8")
+    with pytest.raises(SystemExit):
+        cli_html5(
+            [
+                "--batch",
+                str(tmp_path / "a" / "index.md"),
+                str(tmp_path / "b" / "index.md"),
+                "-o",
+                str(tmp_path / "out"),
+            ]
+        )
+    assert "would both be written to" in capsys.readouterr().err
+    assert not (tmp_path / "out").exists()
+    # the same source, given twice, is converted once
+    cli_html5(
+        [
+            "--batch",
+            str(tmp_path / "a"),
+            str(tmp_path / "a" / "index.md"),
+            "-o",
+            str(tmp_path / "out"),
+        ]
+    )
+    assert "Converted 1 of 1 file(s)" in capsys.readouterr().err
+    assert (tmp_path / "out" / "index.html").exists()
+
+
+def test_compile_substitution():
+    """Substitution expressions are compiled and analysed once."""
+    template, references = compile_substitution("key1 + key2 | upper + env.x")
+    assert compile_substitution("key1 + key2 | upper + env.x")[0] is template
+    assert references == {"key1", "key2"}
+    assert template.render({"key1": "a", "key2": "b", "env": {"x": "c"}}) == "aBc"
+
+
+def test_substitution_fragment_cache():
+    """Rendered substitution nodes are cached, and re-used with rebased lines."""
+    _SUBSTITUTION_FRAGMENTS.clear()
+    settings = {
+        "myst_enable_extensions": ["substitution"],
+        "myst_substitutions": {
+            "block": "```{note}\nA *shared* note.\n```",
+            "bad": "```{unknown}\n```",
+        },
+        "output_encoding": "unicode",
+        "warning_stream": io.StringIO(),
+    }
+    source = "{{ block }}\n\npara\n\n{{ block }}\n\n{{ bad }}\n"
+    document = publish_doctree(source, parser=Parser(), settings_overrides=settings)
+    assert len(_SUBSTITUTION_FRAGMENTS) == 1
+    first, second = document.findall(nodes.note)
+    assert first.deepcopy().pformat() == second.deepcopy().pformat()
+    assert second.line == first.line + 4
+    assert second.children[0].line == first.children[0].line + 4
+
+    # the cached nodes are re-used across documents
+    cached = publish_doctree(source, parser=Parser(), settings_overrides=settings)
+    assert cached.pformat() == document.pformat()
+    assert len(_SUBSTITUTION_FRAGMENTS) == 1
+
+
+def test_substitution_fragment_cache_key(monkeypatch):
+    """Cached nodes are not re-used with other settings or implementations."""
+    _SUBSTITUTION_FRAGMENTS.clear()
+    settings = {
+        "myst_enable_extensions": ["substitution"],
+        "myst_substitutions": {
+            "code": "```{code-block} python\nprint(1)\n```",
+            "note": "```{note}\nA note.\n```",
+        },
+        "warning_stream": io.StringIO(),
+    }
+    source = "{{ code }}\n\n{{ note }}\n"
+    for syntax_highlight in ("short", "long", "short"):
+        document = publish_doctree(
+            source,
+            parser=Parser(),
+            settings_overrides={**settings, "syntax_highlight": syntax_highlight},
+        )
+        classes = {
+            cls for node in document.findall(nodes.inline) for cls in node["classes"]
+        }
+        if syntax_highlight == "short":
+            assert "nb" in classes
+        else:
+            assert "builtin" in classes
+    assert len(_SUBSTITUTION_FRAGMENTS) == 4
+
+    class OverriddenNote(Note):
+        def run(self):
+            return [nodes.paragraph(text="overridden")]
+
+    monkeypatch.setitem(directives._directives, "note", OverriddenNote)
+    document = publish_doctree(source, parser=Parser(), settings_overrides=settings)
+    assert not list(document.findall(nodes.note))
+    assert "overridden" in document.astext()
+
+
+def test_highlight_code_blocks_html():
+    """Code blocks can be highlighted to a single raw HTML node."""
+    text = (
+        '```python\nx = "<a>"\n```\n\n```{code-block} python\n:linenos:\n\ny = 1\n```\n'
+    )
+    document = publish_doctree(
+        text,
+        parser=Parser(),
+        settings_overrides={"myst_highlight_code_blocks_html": True},
+    )
+    first, second = document.findall(nodes.literal_block)
+    assert [type(child) for child in first.children] == [nodes.raw]
+    assert first.children[0].astext() == (
+        '<span class="n">x</span> <span class="o">=</span> '
+        '<span class="s2">&quot;&lt;a&gt;&quot;</span>'
+    )
+    # numbered lines are still rendered as nodes
+    assert nodes.raw not in {type(child) for child in second.children}
+    html = publish_string(
+        text,
+        parser=Parser(),
+        writer="html5",
+        settings_overrides={"myst_highlight_code_blocks_html": True},
+    ).decode("utf8")
+    assert '<span class="s2">&quot;&lt;a&gt;&quot;</span>' in html
+
+
+@pytest.mark.parametrize(
+    ("writer", "expected"),
+    [
+        ("latex", r"\DUrole{n}{x}~\DUrole{o}{=}~\DUrole{mi}{1}"),
+        ("xml", '<inline classes="n">x</inline> <inline classes="o">=</inline>'),
+    ],
+)
+def test_highlight_code_blocks_html_fallback(writer, expected):
+    """Code blocks are rendered per token, without raw content or HTML output."""
+    text = "```python\nx = 1\n```\n"
+    settings = {"myst_highlight_code_blocks_html": True, "raw_enabled": False}
+    document = publish_doctree(text, parser=Parser(), settings_overrides=settings)
+    assert not list(document.findall(nodes.system_message))
+    assert nodes.inline in {
+        type(c) for c in next(document.findall(nodes.literal_block))
+    }
+    output = publish_string(
+        text,
+        parser=Parser(),
+        writer=writer,
+        settings_overrides={"myst_highlight_code_blocks_html": True},
+    ).decode("utf8")
+    assert "span" not in output
+    assert expected in output
+
+
+def test_pygments_lexer_cache():
+    """Pygments lexers are looked up once per process."""
+    assert get_pygments_lexer("python") is get_pygments_lexer("python")
+    with pytest.raises(LexerError, match='No Pygments lexer found for "unknown"'):
+        get_pygments_lexer("unknown")
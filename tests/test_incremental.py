@@ -0,0 +1,122 @@
+"""Test incremental re-parsing of documents."""
+
+from io import StringIO
+
+import pytest
+
+from myst_parser.parsers.incremental import IncrementalDocument
+
+SOURCE = """\
+# Title
+
+First paragraph,
+over two lines.
+
+- a list
+- of items
+
+## Section
+
+:::{note}
+A note
+:::
+
+Last paragraph.
+"""
+
+
+def _assert_as_full_parse(inc: IncrementalDocument) -> None:
+    """Assert that the document is the same as a full parse of its source."""
+    full = IncrementalDocument(inc.source, settings=SETTINGS)
+    assert inc.document.pformat() == full.document.pformat()
+    assert [(node.tagname, node.line) for node in inc.document.findall()] == [
+        (node.tagname, node.line) for node in full.document.findall()
+    ]
+
+
+SETTINGS = {
+    "warning_stream": StringIO(),
+    "myst_enable_extensions": ["colon_fence"],
+}
+
+
+@pytest.mark.parametrize(
+    "start,end,text",
+    [
+        pytest.param(2, 3, "Changed paragraph,\n", id="change-line"),
+        pytest.param(3, 3, "an inserted line,\n", id="insert-line"),
+        pytest.param(4, 4, "\nNew paragraph.\n", id="insert-block"),
+        pytest.param(2, 5, "", id="delete-block"),
+        pytest.param(6, 6, "- another item\n", id="extend-list"),
+        pytest.param(4, 5, "", id="join-blocks"),
+        pytest.param(11, 12, "A changed note\n", id="change-directive"),
+        pytest.param(14, 14, "\nFinal paragraph.\n", id="append"),
+        pytest.param(3, 4, "over *two* lines\n\n```\ncode\n```\n", id="add-code"),
+        pytest.param(4, 4, "% a comment\n\n", id="add-comment"),
+        pytest.param(7, 7, "\n% a comment\n", id="add-comment-after-list"),
+    ],
+)
+def test_incremental_update(start, end, text):
+    """Edits within top-level blocks are applied incrementally."""
+    inc = IncrementalDocument(SOURCE, settings=SETTINGS)
+    inc.update(start, end, text)
+    assert (inc.full_parses, inc.incremental_updates) == (1, 1)
+    _assert_as_full_parse(inc)
+
+
+@pytest.mark.parametrize(
+    "start,end,text",
+    [
+        pytest.param(0, 1, "# New title\n", id="change-heading"),
+        pytest.param(4, 4, "## New section\n\n", id="add-heading"),
+        pytest.param(4, 4, "(target)=\n\n", id="add-target"),
+        pytest.param(4, 4, "[ref]: https://example.com\n\n", id="add-definition"),
+        pytest.param(3, 4, "over two lines[^1]\n", id="add-footnote"),
+        pytest.param(4, 4, "```{unknown}\n```\n\n", id="add-warning"),
+        pytest.param(0, 0, "---\na: b\n---\n", id="add-front-matter"),
+    ],
+)
+def test_full_update(start, end, text):
+    """Edits with effects beyond their blocks trigger a full re-parse."""
+    inc = IncrementalDocument(SOURCE, settings=SETTINGS)
+    inc.update(start, end, text)
+    assert (inc.full_parses, inc.incremental_updates) == (2, 0)
+    _assert_as_full_parse(inc)
+
+
+def test_incremental_updates_sequence():
+    """Multiple edits can be applied in turn."""
+    inc = IncrementalDocument(SOURCE, settings=SETTINGS)
+    inc.update(2, 3, "Changed paragraph,\n")
+    inc.update(4, 4, "\nNew paragraph.\n")
+    inc.update(9, 9, "## Other section\n\n")
+    inc.update(11, 11, "Another paragraph.\n\n")
+    inc.update(16, 16, "A longer note\n")
+    assert (inc.full_parses, inc.incremental_updates) == (2, 4)
+    _assert_as_full_parse(inc)
+
+
+def test_incremental_comment_lines():
+    """Comments, which take the line of the preceding node, match a full parse."""
+    inc = IncrementalDocument("para\n\n% comment\n\nend\n", settings=SETTINGS)
+    inc.update(2, 3, "% changed comment\n")
+    inc.update(4, 5, "% another comment\n")
+    assert (inc.full_parses, inc.incremental_updates) == (1, 2)
+    _assert_as_full_parse(inc)
+
+
+def test_incremental_wordcount():
+    """The wordcount substitutions are updated."""
+    inc = IncrementalDocument(SOURCE, settings=SETTINGS)
+    assert inc.document.substitution_defs["wordcount-words"].astext() == "15"
+    inc.update(14, 15, "Last paragraph, with more words.\n")
+    inc.update(11, 12, "A\n")
+    assert inc.incremental_updates == 2
+    assert inc.document.substitution_defs["wordcount-words"].astext() == "17"
+    _assert_as_full_parse(inc)
+
+
+def test_invalid_range():
+    inc = IncrementalDocument(SOURCE, settings=SETTINGS)
+    with pytest.raises(ValueError, match="Invalid line range"):
+        inc.update(3, 2, "")
@@ -1,17 +1,37 @@
 """Test reading of inventory files."""
 
+import io
+import json
+import os
+import sys
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
+import yaml
+from docutils.core import publish_doctree
 
 from myst_parser.config.main import MdParserConfig
 from myst_parser.inventory import (
+    InventoryCache,
+    InventoryIndex,
+    InventoryRegistry,
+    fetch_inventory,
     filter_inventories,
+    filter_sphinx_inventories,
     from_sphinx,
+    get_inventory_registry,
     inventory_cli,
+    inventory_size,
     load,
+    match_with_wildcard,
     to_sphinx,
+    user_cache_dir,
 )
+from myst_parser.parsers.docutils_ import Parser
 
 STATIC = Path(__file__).parent.absolute() / "static"
 
@@ -51,6 +71,344 @@ def test_inv_filter_wildcard(data_regression):
     data_regression.check(output)
 
 
+@pytest.mark.parametrize(
+    "targets",
+    [None, "index", "in*", "*index", "i*d*x", "*", "", "missing", r"in\*", "in\\"],
+)
+@pytest.mark.parametrize("domains", [None, "std", "s*", "py"])
+def test_inv_filter_index(targets, domains):
+    """Filtering via the inventory index matches every target against the filters."""
+    with (STATIC / "objects_v2.inv").open("rb") as f:
+        inv = load(f)
+    inventories = {"inv": inv, "other": inv}
+    expected = [
+        (inv_name, domain, otype, name)
+        for inv_name, inv_data in inventories.items()
+        for domain, dom_data in inv_data["objects"].items()
+        if match_with_wildcard(domain, domains)
+        for otype, obj_data in dom_data.items()
+        for name in obj_data
+        if match_with_wildcard(name, targets)
+    ]
+    sphinx_inventories = {k: to_sphinx(v) for k, v in inventories.items()}
+    for filter_func, data, index in (
+        (filter_inventories, inventories, None),
+        (filter_inventories, inventories, InventoryIndex.from_inventories(inventories)),
+        (filter_sphinx_inventories, sphinx_inventories, None),
+        (
+            filter_sphinx_inventories,
+            sphinx_inventories,
+            InventoryIndex.from_sphinx_inventories(sphinx_inventories),
+        ),
+    ):
+        matches = filter_func(data, domains=domains, targets=targets, index=index)
+        assert [(m.inv, m.domain, m.otype, m.name) for m in matches] == expected
+
+
+def test_inv_filter_updated():
+    """Filtering without an index reflects in-place changes to the inventories."""
+    with (STATIC / "objects_v2.inv").open("rb") as f:
+        inv = load(f)
+    inventories = {"inv": inv}
+    assert len(list(filter_inventories(inventories, targets="index"))) == 1
+    # a change that keeps the size of the group
+    inv["objects"]["std"]["doc"] = {"new": {"loc": "new.html", "text": None}}
+    assert [m.name for m in filter_inventories(inventories, targets="new")] == ["new"]
+    assert list(filter_inventories(inventories, targets="index")) == []
+    index = InventoryIndex.from_inventories(inventories)
+    assert [m.loc for m in filter_inventories(inventories, index=index)] == [
+        m.loc for m in filter_inventories(inventories)
+    ]
+
+
+def test_load_v2_lines():
+    """Inventory lines are split into fields, with or without the regex fallback."""
+    body = (
+        "mod py:module 0 mod.html#$ -\n"
+        "a label std:label -1 page.html#a-label A  label\n"
+        "tabbed\tstd:doc\t-1\tpage.html\tTabbed\n"
+        "double std:doc 1  page.html Text\n"
+        "notype 1 page.html Text\n"
+        "\n"
+        "incomplete std:doc 1 page.html -"
+    )
+    data = (
+        b"# Sphinx inventory version 2\n# Project: proj\n# Version: 1.0\n"
+        b"# The remainder of this file is compressed using zlib.\n"
+        + zlib.compress(body.encode())
+    )
+    inv = load(io.BytesIO(data))
+    assert inv["objects"] == {
+        "py": {"module": {"mod": {"loc": "mod.html#mod", "text": None}}},
+        "std": {
+            "label": {"a label": {"loc": "page.html#a-label", "text": "A  label"}},
+            "doc": {
+                "tabbed": {"loc": "page.html", "text": "Tabbed"},
+                "double": {"loc": "", "text": "page.html Text"},
+            },
+        },
+    }
+
+
+@pytest.fixture
+def inv_server():
+    """Serve ``objects_v2.inv``, honouring ``If-None-Match`` requests."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        etag = '"v1"'
+
+        def do_GET(self):
+            requests.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == Handler.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = (STATIC / "objects_v2.inv").read_bytes()
+            self.send_response(200)
+            self.send_header("ETag", Handler.etag)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield (
+            f"http://127.0.0.1:{server.server_address[1]}/objects.inv",
+            requests,
+            Handler,
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_inventory_cache_remote(tmp_path, inv_server):
+    """Remote inventories are re-used within the TTL, then revalidated."""
+    uri, requests, handler = inv_server
+    expected = fetch_inventory(uri)
+    assert requests == [None]
+    cache = InventoryCache(tmp_path, ttl=3600)
+    assert fetch_inventory(uri, cache=cache) == expected
+    assert InventoryCache(tmp_path).fetch(uri) == expected
+    assert requests == [None, None]
+    # revalidated, but not modified
+    cache = InventoryCache(tmp_path, ttl=0)
+    assert cache.fetch(uri) == expected
+    assert requests == [None, None, '"v1"']
+    assert (cache.hits, cache.revalidations, cache.misses) == (0, 1, 0)
+    # modified
+    handler.etag = '"v2"'
+    assert cache.fetch(uri) == expected
+    assert requests == [None, None, '"v1"', '"v1"']
+    assert (cache.hits, cache.revalidations, cache.misses) == (0, 1, 1)
+    # the base URL is part of the key
+    assert cache.fetch(uri, base_url="https://example.com")["base_url"] == (
+        "https://example.com"
+    )
+    assert requests[-1] is None
+
+
+def test_inventory_cache_local(tmp_path):
+    """Local inventories are reloaded when the file changes."""
+    path = tmp_path / "objects.inv"
+    path.write_bytes((STATIC / "objects_v2.inv").read_bytes())
+    cache = InventoryCache(tmp_path / "cache")
+    assert cache.fetch(str(path)) == fetch_inventory(str(path))
+    assert cache.fetch(str(path)) == fetch_inventory(str(path))
+    assert (cache.hits, cache.misses) == (1, 1)
+    path.write_bytes((STATIC / "objects_v1.inv").read_bytes())
+    assert cache.fetch(str(path)) == fetch_inventory(str(path))
+    assert (cache.hits, cache.misses) == (1, 2)
+    # corrupt entries are discarded
+    next((tmp_path / "cache").glob("*.inventory")).write_bytes(b"corrupt")
+    assert cache.fetch(str(path)) == fetch_inventory(str(path))
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.clear()
+    assert not list((tmp_path / "cache").glob("*.inventory"))
+
+
+def test_inventory_cache_threads(tmp_path):
+    """The usage counters are not lost, when the cache is shared by threads."""
+    cache = InventoryCache(tmp_path)
+    path = str(STATIC / "objects_v2.inv")
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: cache.fetch(path), range(200)))
+    assert cache.hits + cache.misses == 200
+
+
+@pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="XDG only")
+def test_inventory_cache_default_dir(tmp_path, monkeypatch):
+    """The cache is stored in the user cache directory, by default."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert user_cache_dir() == tmp_path / "myst-parser" / "inventories"
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "objects.inv"
+    path.write_bytes((STATIC / "objects_v2.inv").read_bytes())
+    publish_doctree(
+        "<inv:inv#index>",
+        parser=Parser(),
+        settings_overrides={
+            "myst_inventories": {"inv": ("https://example.com", str(path))},
+            "myst_inventory_cache": True,
+            "warning_stream": io.StringIO(),
+        },
+    )
+    assert len(list(user_cache_dir().glob("*.inventory"))) == 1
+    assert not (tmp_path / ".myst_cache").exists()
+
+
+def test_inventory_cache_docutils(tmp_path, inv_server):
+    """The docutils renderer shares cached inventories across documents."""
+    uri, requests, _ = inv_server
+    settings = {
+        "myst_inventories": {"inv": (uri.rsplit("/", 1)[0], None)},
+        "myst_inventory_cache": True,
+        "myst_inventory_cache_dir": str(tmp_path),
+        "warning_stream": io.StringIO(),
+    }
+    for _ in range(2):
+        document = publish_doctree(
+            "<inv:inv#index>", parser=Parser(), settings_overrides=settings
+        )
+        assert "index.html" in document.pformat()
+    assert requests == [None]
+
+
+def test_inventory_registry(tmp_path):
+    """Inventories are loaded concurrently, then shared until evicted or changed."""
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"objects_{i}.inv")
+        paths[-1].write_bytes((STATIC / "objects_v2.inv").read_bytes())
+    sources = {
+        f"inv{i}": ("https://example.com", str(p), None) for i, p in enumerate(paths)
+    }
+    sources["missing"] = ("https://example.com", str(tmp_path / "missing.inv"), None)
+    registry = InventoryRegistry(2**30)
+    loaded = registry.get_many(sources)
+    assert list(loaded) == ["inv0", "inv1", "inv2", "missing"]
+    assert isinstance(loaded.pop("missing"), FileNotFoundError)
+    assert all(inv == fetch_inventory(str(paths[0])) for inv in loaded.values())
+    assert registry.size() == 3 * inventory_size(loaded["inv0"])
+    again = registry.get_many(sources)
+    assert all(again[key] is inv for key, inv in loaded.items())
+    # failures are also stored, until the file changes
+    assert isinstance(again["missing"], FileNotFoundError)
+    assert (registry.hits, registry.misses) == (4, 4)
+    # changed files are reloaded
+    paths[0].write_bytes((STATIC / "objects_v1.inv").read_bytes())
+    assert registry.get_many(sources)["inv0"] is not loaded["inv0"]
+    # the least recently used are evicted
+    registry = InventoryRegistry(2 * inventory_size(loaded["inv1"]))
+    registry.get_many({"inv1": sources["inv1"], "inv2": sources["inv2"]})
+    registry.get_many({"inv1": sources["inv1"]})
+    registry.get_many({"inv0": sources["inv0"]})
+    assert registry.evictions == 1
+    registry.get_many({"inv1": sources["inv1"], "inv2": sources["inv2"]})
+    assert (registry.hits, registry.misses) == (2, 4)
+
+
+def test_inventory_registry_set(tmp_path):
+    """The same set and index are returned, until an inventory is reloaded."""
+    path = tmp_path / "objects.inv"
+    path.write_bytes((STATIC / "objects_v2.inv").read_bytes())
+    sources = {
+        "inv": ("https://example.com", str(path), None),
+        "missing": ("https://example.com", str(tmp_path / "missing.inv"), None),
+    }
+    registry = InventoryRegistry(2**30)
+    inv_set = registry.get_set(sources)
+    assert list(inv_set.inventories) == ["inv"]
+    assert list(inv_set.errors) == ["missing"]
+    assert registry.get_set(sources) is inv_set
+    assert (
+        registry.size()
+        == inventory_size(inv_set.inventories["inv"]) + inv_set.index.size()
+    )
+    # a change to the file
+    os.utime(path, ns=(0, 0))
+    new_set = registry.get_set(sources)
+    assert new_set is not inv_set
+    assert registry.get_set(sources) is new_set
+    # the sets are removed with the inventories
+    registry = InventoryRegistry(inventory_size(inv_set.inventories["inv"]))
+    registry.get_set(sources)
+    assert registry.size() <= registry.max_size
+
+
+def test_inventory_registry_ttl(inv_server):
+    """Remote inventories are reloaded once the TTL expires."""
+    uri, requests, _ = inv_server
+    sources = {"inv": (uri.rsplit("/", 1)[0], None, None)}
+    registry = InventoryRegistry(2**30, ttl=3600)
+    inv_set = registry.get_set(sources)
+    assert registry.get_set(sources) is inv_set
+    assert len(requests) == 1
+    registry = InventoryRegistry(2**30, ttl=0)
+    inv_set = registry.get_set(sources)
+    assert registry.get_set(sources) is not inv_set
+    assert len(requests) == 3
+
+
+def test_inventory_registry_failure_ttl(monkeypatch):
+    """Failures to load remote inventories are only stored for a short time."""
+    calls = []
+
+    def _fetch_inventory(uri, **kwargs):
+        calls.append(uri)
+        raise OSError("connection refused")
+
+    monkeypatch.setattr("myst_parser.inventory.fetch_inventory", _fetch_inventory)
+    sources = {"inv": ("https://example.com", None, None)}
+    registry = InventoryRegistry(2**30, ttl=3600)
+    assert registry.failure_ttl < registry.ttl
+    error = registry.get_many(sources)["inv"]
+    assert isinstance(error, OSError)
+    assert registry.get_many(sources)["inv"] is error
+    assert len(calls) == 1
+    registry = InventoryRegistry(2**30, ttl=3600, failure_ttl=0)
+    registry.get_many(sources)
+    registry.get_many(sources)
+    assert len(calls) == 3
+
+
+def test_inventory_registry_docutils(monkeypatch):
+    """The docutils renderer shares loaded inventories across documents."""
+    settings = {
+        "myst_inventories": {
+            "inv": ("https://example.com", str(STATIC / "objects_v2.inv"))
+        },
+        "myst_inventory_max_memory": 1024,
+        "warning_stream": io.StringIO(),
+        "report_level": 1,
+    }
+    registry = get_inventory_registry(1024 * 2**20)
+    registry.clear()
+    indexes = []
+    from_inventories = InventoryIndex.from_inventories
+
+    def _from_inventories(inventories):
+        indexes.append(from_inventories(inventories))
+        return indexes[-1]
+
+    monkeypatch.setattr(InventoryIndex, "from_inventories", _from_inventories)
+    for _ in range(3):
+        document = publish_doctree(
+            "<inv:inv#index>", parser=Parser(), settings_overrides=settings
+        )
+        assert "https://example.com/index.html" in document.pformat()
+    assert (registry.hits, registry.misses) == (2, 1)
+    assert len(indexes) == 1
+    # the load is only reported when it happens
+    assert settings["warning_stream"].getvalue().count("Loading inventory") == 1
+
+
 @pytest.mark.parametrize(
     "options", [(), ("-d", "std"), ("-o", "doc"), ("-n", "ref"), ("-l", "index.html*")]
 )
@@ -64,3 +422,47 @@ def test_inv_cli_v1(capsys, file_regression):
     inventory_cli([str(STATIC / "objects_v1.inv"), "-f", "yaml"])
     text = capsys.readouterr().out.strip() + "\n"
     file_regression.check(text, extension=".yaml")
+
+
+def test_inv_cli_cache(tmp_path, capsys):
+    inventory_cli([str(STATIC / "objects_v2.inv"), "-n", "index"])
+    expected = capsys.readouterr().out
+    for _ in range(2):
+        inventory_cli(
+            [
+                str(STATIC / "objects_v2.inv"),
+                "-n",
+                "index",
+                "--cache-dir",
+                str(tmp_path),
+            ]
+        )
+        assert capsys.readouterr().out == expected
+    assert len(list(tmp_path.glob("*.inventory"))) == 1
+
+
+@pytest.mark.parametrize("fmt", ["yaml", "json"])
+def test_inv_cli_multiple(fmt, inv_server, capsys):
+    """Multiple inventories are output as they are fetched, identified by URI."""
+    uri, _, _ = inv_server
+    uris = [str(STATIC / "objects_v2.inv"), str(STATIC / "objects_v1.inv"), uri]
+    inventory_cli([*uris, "-n", "index", "-f", fmt])
+    out = capsys.readouterr().out
+    if fmt == "json":
+        outputs = [json.loads(line) for line in out.splitlines()]
+    else:
+        outputs = list(yaml.safe_load_all(out))
+    assert sorted(output["uri"] for output in outputs) == sorted(uris)
+    for output in outputs:
+        inventory_cli([output.pop("uri"), "-n", "index", "-f", "json"])
+        assert output == json.loads(capsys.readouterr().out)
+
+
+def test_inv_cli_multiple_failure(capsys):
+    """A failure to fetch one of multiple inventories does not stop the others."""
+    with pytest.raises(SystemExit) as exc_info:
+        inventory_cli(["missing.inv", str(STATIC / "objects_v2.inv"), "-f", "json"])
+    assert exc_info.value.code == 1
+    captured = capsys.readouterr()
+    assert "Failed to load inventory 'missing.inv'" in captured.err
+    assert json.loads(captured.out)["name"] == "Python"
@@ -0,0 +1,83 @@
+"""Test the profiling of the parsing and rendering phases."""
+
+import io
+
+import pytest
+from docutils.core import publish_doctree
+
+from myst_parser import profiling
+from myst_parser.parsers.docutils_ import Parser, cli_html5
+
+
+@pytest.fixture(autouse=True)
+def disable_profiling():
+    """Do not leak an enabled profiler into other tests."""
+    yield
+    profiling.disable()
+
+
+def test_profiling(monkeypatch, capsys):
+    """The time of each phase is recorded, and summarised at the end of the run."""
+    monkeypatch.setattr(
+        "sys.stdin",
+        io.TextIOWrapper(io.BytesIO(b"# title\n\ntext\n\n```{note}\nnote\n```\n")),
+    )
+    records = []
+    profiling.enable().add_callback(lambda *args: records.append(args))
+    cli_html5([])
+    profiler = profiling.get_profiler()
+    assert profiler is not None
+    for key in (
+        "parse",
+        "render",
+        "render:paragraph",
+        "directive:note",
+        "transform:AddSlugIds",
+    ):
+        assert profiler.totals[key][0] >= 1
+    assert profiler.documents["<string>"]["directive:note"][0] == 1
+    assert ("<string>", "render:heading") in {record[:2] for record in records}
+    captured = capsys.readouterr()
+    assert "MyST profile:" in captured.err
+    assert "directive:note" in captured.err
+
+
+def test_profiling_env(monkeypatch):
+    """Profiling can be enabled by an environment variable."""
+    monkeypatch.setenv("MYST_PROFILE", "1")
+    publish_doctree("text", parser=Parser())
+    profiler = profiling.get_profiler()
+    assert profiler is not None
+    assert profiler.totals["render:paragraph"][0] == 1
+    profiling.disable()
+    monkeypatch.setenv("MYST_PROFILE", "0")
+    publish_doctree("text", parser=Parser())
+    assert profiling.get_profiler() is None
+
+
+def test_profiling_nested():
+    """Nested documents restore the outer document, and no-op when disabled."""
+    assert profiling.record("a") is profiling.record("b")
+    with profiling.document("outer", enable_profiling=True) as profiler:
+        assert profiler is not None
+        with profiling.document("inner"), profiling.record("parse"):
+            pass
+        with profiling.record("render"):
+            pass
+    assert profiler.document == ""
+    assert set(profiler.documents) == {"outer", "inner"}
+    assert "render" in profiler.documents["outer"]
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_cli_batch_profile(tmp_path, monkeypatch, capsys, jobs):
+    """The profiles of all batch conversions are summarised at the end."""
+    monkeypatch.setenv("MYST_PROFILE", "1")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.md").write_text("# A\n", encoding="utf8")
+    (tmp_path / "src" / "b.md").write_text("```{note}\nB\n```\n", encoding="utf8")
+    cli_html5(["--batch", str(tmp_path / "src"), "-j", jobs])
+    captured = capsys.readouterr()
+    assert "Converted 2 of 2 file(s)" in captured.err
+    assert "MyST profile:" in captured.err
+    assert "directive:note" in captured.err
@@ -0,0 +1,133 @@
+"""Test the extension points and internals of the ``DocutilsRenderer``."""
+
+import io
+
+from docutils import nodes
+from docutils.core import publish_doctree
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+from markdown_it.tree import SyntaxTreeNode
+
+from myst_parser import profiling
+from myst_parser.config.main import MdParserConfig
+from myst_parser.mdit_to_docutils.base import (
+    DocutilsRenderer,
+    TokenNode,
+    make_document,
+    token_line,
+)
+from myst_parser.mocking import MockState
+from myst_parser.parsers.docutils_ import Parser
+from myst_parser.parsers.mdit import create_md_parser
+
+
+def render_tokens(md: MarkdownIt, tokens: list[Token]) -> nodes.document:
+    """Render tokens to a new document."""
+    document = make_document("source.md")
+    md.options["document"] = document
+    md.renderer.render(tokens, md.options, {})
+    return document
+
+
+def publish(text: str) -> nodes.document:
+    """Parse the text to a document, with the default settings."""
+    return publish_doctree(
+        text, parser=Parser(), settings_overrides={"warning_stream": io.StringIO()}
+    )
+
+
+def test_add_render_method():
+    """Render functions can be registered for third-party token types."""
+
+    class Renderer(DocutilsRenderer):
+        pass
+
+    class SubRenderer(Renderer):
+        pass
+
+    assert (
+        Renderer.get_render_methods()["paragraph"] is DocutilsRenderer.render_paragraph
+    )
+    assert "custom" not in SubRenderer.get_render_methods()
+
+    def render_custom(renderer, node):
+        renderer.current_node.append(nodes.paragraph(text=f"custom: {node.content}"))
+
+    Renderer.add_render_method("custom", render_custom)
+    assert "custom" not in DocutilsRenderer.get_render_methods()
+    assert Renderer.get_render_methods()["custom"] is render_custom
+    assert SubRenderer.get_render_methods()["custom"] is render_custom
+    assert "render_custom" in SubRenderer(MarkdownIt()).rules
+
+    md = create_md_parser(MdParserConfig(), SubRenderer)
+    tokens = [Token("custom", "", 0, content="text")]
+    assert "custom: text" in render_tokens(md, tokens).pformat()
+
+    # the deprecated rules can still be changed, for a single renderer
+    renderer = md.renderer
+    renderer.rules["render_custom"] = lambda node: renderer.current_node.append(
+        nodes.paragraph(text=f"rule: {node.content}")
+    )
+    assert "rule: text" in render_tokens(md, tokens).pformat()
+    del renderer.rules["render_paragraph"]
+    assert "render_paragraph" not in renderer.rules
+    assert "render_paragraph" in SubRenderer(MarkdownIt()).rules
+    renderer.rules = {"render_custom": renderer.rules["render_custom"]}
+    assert list(renderer.rules) == ["render_custom"]
+
+
+def test_token_node():
+    """Nodes offset the token maps, without modifying them."""
+    md = create_md_parser(MdParserConfig(), DocutilsRenderer)
+    tokens = md.parse("text\n\n- a *b*\n")
+    tree = TokenNode(tokens, line_offset=11)
+    assert tree.pretty() == SyntaxTreeNode(tokens).pretty()
+    paragraph, bullet_list = tree.children
+    assert (paragraph.type, paragraph.map) == ("paragraph", (11, 12))
+    assert bullet_list.type == "bullet_list"
+    emphasis = bullet_list.children[0].children[0].children[0].children[1]
+    assert (emphasis.type, emphasis.map) == ("em", (13, 14))
+    assert token_line(emphasis.children[0]) == 13
+    assert emphasis.children[0].children == ()
+    assert tokens[0].map == [0, 1]
+    assert paragraph.nester_tokens.opening is tokens[0]
+    assert emphasis.children[0].token.map is None
+    # the lines of other syntax tree nodes are also 1-based
+    assert token_line(SyntaxTreeNode(tokens).children[1]) == 3
+
+
+def test_directive_lookup_cache():
+    """Directive classes are looked up once per document."""
+    try:
+        profiler = profiling.enable()
+        document = publish(
+            "```{note}\na\n```\n\n```{tip}\nb\n```\n\n```{note}\nc\n```\n"
+        )
+        assert profiler.totals["directive_lookup"][0] == 2
+        assert profiler.totals["directive_lookup:cached"][0] == 1
+    finally:
+        profiling.disable()
+    assert len(list(document.findall(nodes.note))) == 2
+
+
+def test_mock_state_reuse(monkeypatch):
+    """The mock states, used to run directives, are re-used at each nesting depth."""
+    created = []
+
+    class _MockState(MockState):
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr("myst_parser.mdit_to_docutils.base.MockState", _MockState)
+    document = publish(
+        "````{note}\n```{warning}\na\n```\n````\n\n```{tip}\nb\n```\n\n"
+        "```{note}\nc\n```\n"
+    )
+    assert len(created) == 2
+    assert [node.line for node in document.findall(nodes.Admonition)] == [
+        1,
+        2,
+        7,
+        11,
+    ]
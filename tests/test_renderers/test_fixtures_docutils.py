@@ -148,3 +148,98 @@ def settings_from_cmdline(cmdline: str | None) -> dict[str, Any]:
     except Exception as err:
         raise AssertionError(f"Failed to parse commandline: {cmdline}\n{err}") from err
     return vars(pub.settings)
+
+
+def _assert_render_parity(content: str, settings: dict[str, Any]) -> None:
+    """Assert that the stream render engine and chunked rendering
+    produce the same output as the default rendering.
+    """
+    outputs = []
+    for overrides in (
+        {},
+        {"myst_render_engine": "stream"},
+        {"myst_render_chunk_lines": 1},
+    ):
+        report_stream = StringIO()
+        doctree = publish_doctree(
+            content,
+            source_path="notset",
+            parser=Parser(),
+            settings_overrides={
+                **settings,
+                **overrides,
+                "warning_stream": report_stream,
+            },
+        )
+        outputs.append((doctree.pformat(), report_stream.getvalue()))
+    assert outputs[0] == outputs[1]
+    assert outputs[0] == outputs[2]
+
+
+@pytest.mark.param_file(FIXTURE_PATH / "docutil_syntax_elements.md")
+def test_render_parity_syntax_elements(file_params: ParamTestData):
+    """Alternative render modes are equivalent to the default."""
+    _assert_render_parity(file_params.content, {})
+
+
+@pytest.mark.param_file(FIXTURE_PATH / "docutil_directives.md")
+def test_render_parity_directives(file_params: ParamTestData):
+    """Alternative render modes are equivalent to the default."""
+    _assert_render_parity(file_params.content, {})
+
+
+@pytest.mark.param_file(FIXTURE_PATH / "docutil_syntax_extensions.txt")
+def test_render_parity_syntax_extensions(file_params: ParamTestData):
+    """Alternative render modes are equivalent to the default."""
+    settings = settings_from_cmdline(file_params.description)
+    _assert_render_parity(file_params.content, settings)
+
+
+@pytest.mark.param_file(FIXTURE_PATH / "reporter_warnings.md")
+def test_render_parity_warnings(file_params: ParamTestData):
+    """Alternative render modes are equivalent to the default."""
+    _assert_render_parity(file_params.content, {})
+
+
+def test_render_parity_chunks():
+    """Block-level constructs are not split across chunks,
+    and reference definitions apply across chunks.
+    """
+    content = """\
+---
+title: x
+---
+
+# Heading 1
+
+[a] and [b][] and [^1]
+
+```
+text
+
+# not a heading
+```
+
+## Heading 2
+
+[a]: https://example.com/a
+
+$$
+a
+
+# math
+$$
+
+<!--
+
+# comment
+-->
+
+### Heading 3
+
+[b]: https://example.com/b
+[a]: https://example.com/c
+
+[^1]: footnote
+"""
+    _assert_render_parity(content, {"myst_enable_extensions": ["dollarmath"]})
@@ -0,0 +1,107 @@
+"""Test the reuse of the markdown-it parsers, and the chunking of sources."""
+
+import io
+
+import pytest
+from docutils import nodes
+from docutils.core import publish_doctree
+
+from myst_parser.config.main import MdParserConfig
+from myst_parser.mdit_to_docutils.base import DocutilsRenderer, make_document
+from myst_parser.parsers.docutils_ import Parser
+from myst_parser.parsers.mdit import MdParserPool, iter_source_chunks
+
+
+def publish(text: str, chunk_lines: int) -> nodes.document:
+    """Parse the text, rendering it in chunks of the given number of lines."""
+    return publish_doctree(
+        text,
+        parser=Parser(),
+        settings_overrides={
+            "myst_render_chunk_lines": chunk_lines,
+            "myst_enable_extensions": ["colon_fence"],
+            "warning_stream": io.StringIO(),
+        },
+    )
+
+
+def test_md_parser_pool():
+    """Parsers are reused for equal configurations, but never shared."""
+    pool = MdParserPool(maxsize=1)
+    with pool.acquire(MdParserConfig(), DocutilsRenderer) as md1:
+        md1.options["document"] = make_document("source.md")
+        md1.render("# title\n")
+        # a re-entrant parse receives its own parser
+        with pool.acquire(MdParserConfig(), DocutilsRenderer) as md2:
+            assert md2 is not md1
+    assert "document" not in md1.options
+    assert (pool.hits, pool.misses, len(pool)) == (0, 2, 2)
+    with pool.acquire(MdParserConfig(), DocutilsRenderer) as md3:
+        assert md3 in (md1, md2)
+        assert md3.options["myst_config"] == MdParserConfig()
+    assert (pool.hits, pool.misses) == (1, 2)
+    # a different configuration evicts the least recently used one
+    config = MdParserConfig(enable_extensions={"deflist"})
+    with pool.acquire(config, DocutilsRenderer) as md4:
+        assert md4 not in (md1, md2)
+        assert md4.options["myst_config"] is config
+    assert (pool.hits, pool.misses, len(pool)) == (1, 3, 1)
+    pool.clear()
+    assert (pool.hits, pool.misses, len(pool)) == (0, 0, 0)
+
+
+def test_iter_source_chunks():
+    """Chunks are split before headings, outside of blocks."""
+    text = "# a\n\n```\n\n# b\n```\n\n# c\ntext\n# d\n\n# e\n"
+    assert list(iter_source_chunks(text, 1)) == [
+        (0, "# a\n\n```\n\n# b\n```\n\n"),
+        (7, "# c\ntext\n# d\n\n"),
+        (11, "# e\n"),
+    ]
+    assert list(iter_source_chunks(text, 8)) == [
+        (0, "# a\n\n```\n\n# b\n```\n\n# c\ntext\n# d\n\n"),
+        (11, "# e\n"),
+    ]
+    assert list(iter_source_chunks(text, 0)) == [(0, text)]
+
+
+def test_iter_source_chunks_front_matter():
+    """Front matter is never split, even if its content looks like a heading."""
+    text = "---\ntitle: Title\n\n# comment\nauthor: Me\n---\n\n# a\n"
+    assert list(iter_source_chunks(text, 1)) == [
+        (0, "---\ntitle: Title\n\n# comment\nauthor: Me\n---\n\n"),
+        (7, "# a\n"),
+    ]
+    # the splitting may also be informed by the parser rules in use
+    assert len(list(iter_source_chunks(text, 1, rules=[]))) == 3
+    doctree = publish(text, chunk_lines=1)
+    assert isinstance(doctree[0], nodes.docinfo)
+    assert doctree[0].astext() == "title\n\nTitle\n\nMe"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "---\ntitle: Title\n\n# comment\nauthor: Me\n---\n\n# a\n\n# b\n",
+        "- item\n  ```\n\n# not a heading\n  ```\n\n# a\n",
+        "- item\n  - ```\n    code\n  ```\n  text\ntext\n  ```\n\n# b\n  ```\n",
+        "- item\n2. item\n  ```\n\n# b\n  ```\n",
+        "- item\n(target)=\n   ```\n\n# b\n```\n",
+        "> quote\n> ```\n\n# a\n```\n",
+        "<div>\n- item\n\n  ```\n\n# b\n  ```\n",
+    ],
+    ids=[
+        "front_matter",
+        "list_fence",
+        "nested_list_fence",
+        "list_lazy",
+        "list_target",
+        "blockquote",
+        "html_block",
+    ],
+)
+def test_render_chunks(text):
+    """Chunked rendering is equivalent to rendering the whole document."""
+    assert (
+        publish(text, chunk_lines=0).pformat() == publish(text, chunk_lines=1).pformat()
+    )
@@ -1,6 +1,9 @@
 """Test (docutils) parsing with different ``MdParserConfig`` options set."""
 
+import os
 import shlex
+import subprocess
+import sys
 from io import StringIO
 from pathlib import Path
 
@@ -9,7 +12,11 @@ from docutils import __version_info__ as docutils_version
 from docutils.core import Publisher, publish_string
 from pytest_param_files import ParamTestData
 
+from myst_parser.config.main import MdParserConfig, merge_file_level
+from myst_parser.mdit_to_docutils.base import DocutilsRenderer
 from myst_parser.parsers.docutils_ import Parser
+from myst_parser.parsers.mdit import create_md_parser
+from myst_parser.parsers.token_cache import TokenCache
 
 FIXTURE_PATH = Path(__file__).parent.joinpath("fixtures")
 INV_PATH = Path(__file__).parent.parent.absolute() / "static" / "objects_v2.inv"
@@ -45,3 +52,91 @@ def test_cmdline(file_params: ParamTestData, normalize_doctree_xml):
     if warnings:
         output += "\n" + warnings
     file_params.assert_expected(output, rstrip_lines=True)
+
+
+IMPORTABLE_SLUG_FUNC = "myst_parser.config.main._test_slug_func"
+
+
+def test_config_fingerprint():
+    """The fingerprint is content-based, cached and invalidated on update."""
+    config = MdParserConfig(
+        enable_extensions={"deflist", "dollarmath", "colon_fence"},
+        substitutions={"a": [1, {"b": 2}], "c": "d"},
+    )
+    other = MdParserConfig(
+        enable_extensions=["colon_fence", "dollarmath", "deflist"],
+        substitutions={"c": "d", "a": [1, {"b": 2}]},
+    )
+    assert config.fingerprint() == other.fingerprint()
+    assert hash(config.freeze()) == hash(other.freeze())
+    assert config.freeze() is config.freeze()
+    config.heading_anchors = 2
+    assert config.fingerprint() != other.fingerprint()
+    assert config.copy(heading_anchors=0).fingerprint() == other.fingerprint()
+    # callables are identified by their import path
+    assert (
+        MdParserConfig(heading_slug_func=IMPORTABLE_SLUG_FUNC).fingerprint()
+        != MdParserConfig().fingerprint()
+    )
+
+
+def test_config_fingerprint_callables(tmp_path):
+    """Callables that cannot be imported are identified by their object."""
+
+    def make_slug_func(suffix):
+        return lambda text: text + suffix
+
+    configs = [
+        MdParserConfig(heading_slug_func=make_slug_func(suffix)) for suffix in "ab"
+    ]
+    assert configs[0].fingerprint() != configs[1].fingerprint()
+    assert not configs[0].is_fingerprint_stable()
+    assert MdParserConfig(
+        heading_slug_func=IMPORTABLE_SLUG_FUNC
+    ).is_fingerprint_stable()
+    # such configurations are not persisted
+    md = create_md_parser(configs[0], DocutilsRenderer)
+    cache = TokenCache(tmp_path, 2**20)
+    tokens, _ = cache.parse(md, "# Title\n", configs[0])
+    assert tokens == md.parse("# Title\n")
+    assert (cache.hits, cache.misses, cache.writes) == (0, 0, 0)
+
+
+def test_config_fingerprint_stable():
+    """The fingerprint does not depend on the process hash seed."""
+    script = (
+        "from myst_parser.config.main import MdParserConfig;"
+        "print(MdParserConfig(enable_extensions={'deflist', 'dollarmath'},"
+        " heading_slug_func='github').fingerprint())"
+    )
+    fingerprints = {
+        subprocess.check_output(
+            [sys.executable, "-c", script],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            text=True,
+        )
+        for seed in ("1", "2", "3")
+    }
+    assert len(fingerprints) == 1
+
+
+def test_merge_file_level():
+    """Only updated fields are replaced, and the global config is not modified."""
+    config = MdParserConfig(substitutions={"a": "b"}, url_schemes={"x": None})
+    warnings = []
+    new = merge_file_level(
+        config,
+        {"myst": {"substitutions": {"c": "d"}, "heading_anchors": 2, "other": 1}},
+        lambda wtype, msg: warnings.append(msg),
+    )
+    assert warnings == ["Unknown field: other"]
+    assert new.substitutions == {"a": "b", "c": "d"}
+    assert new.heading_anchors == 2
+    assert new.url_schemes is config.url_schemes
+    assert config.substitutions == {"a": "b"}
+    assert config.heading_anchors == 0
+    assert new.fingerprint() != config.fingerprint()
+    assert (
+        merge_file_level(config, {"myst": {}}, warnings.append).fingerprint()
+        == config.fingerprint()
+    )
@@ -10,7 +10,12 @@ from sphinx.directives.code import CodeBlock
 
 from myst_parser.parsers.directives import MarkupError, parse_directive_text
 from myst_parser.parsers.options import (
+    Position,
+    State,
+    StreamBuffer,
     TokenizeError,
+    _simple_to_tokens,
+    _to_tokens,
     options_to_items,
     options_to_tokens,
 )
@@ -227,6 +232,46 @@ def test_as_yaml_error_line():
     assert result.body == ["body"]
 
 
+def test_parse_directive_text_cache():
+    """Identical directive texts are parsed once, with lines rebased per call."""
+    content = ":class: tip\n:foo: bar\n\nbody"
+    first = parse_directive_text(Note, "", content, line=3)
+    first.options["class"].append("mutated")
+    first.body.append("mutated")
+    second = parse_directive_text(Note, "", content, line=10)
+    assert second.options == {"class": ["tip"]}
+    assert second.body == ["body"]
+    assert [w.lineno for w in first.warnings] == [5]
+    assert [w.lineno for w in second.warnings] == [12]
+    assert [w.lineno for w in parse_directive_text(Note, "", content).warnings] == [
+        None
+    ]
+
+
+def test_parse_directive_text_cache_option_spec():
+    """Changes to the option spec of a directive class are not hidden by the cache."""
+
+    class Custom(Note):
+        option_spec = dict(Note.option_spec)
+
+    content = ":foo: bar\n\nbody"
+    assert len(parse_directive_text(Custom, "", content).warnings) == 1
+    Custom.option_spec["foo"] = str
+    result = parse_directive_text(Custom, "", content)
+    assert not result.warnings
+    assert result.options == {"foo": "bar"}
+
+    class Upper:
+        __hash__ = None
+
+        def __call__(self, value):
+            return value.upper()
+
+    # unhashable converters are parsed without caching
+    Custom.option_spec["foo"] = Upper()
+    assert parse_directive_text(Custom, "", content).options == {"foo": "BAR"}
+
+
 def test_options_to_tokens():
     """``options_to_tokens`` yields key/value token pairs with source lines."""
     text = "a: 1\nb: |\n  multi\n  line\nc:\n"
@@ -246,3 +291,77 @@ def test_options_to_tokens_comment_lines():
     _, state = options_to_tokens("# first\na: 1 # second\n# third\nb: 2\n")
     assert state.has_comments
     assert state.comment_lines == [0, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "a: 1",
+        "class: tip\nname: my-name\nlinenos:\nemphasize-lines: 1, 3\n",
+        "a:\n\nb:   some  spaced  value   \n\n",
+        "a: b: c\nd: :e:`f`\ng: {h}[i]*j\n",
+        "key.with+chars: x'y\"z\nflag:",
+        "flag:   ",
+        "ключ: значение",
+    ],
+)
+def test_options_simple_fast_path(text):
+    """Simple option blocks are tokenized by the fast path, as by the full tokenizer."""
+    tokens = _simple_to_tokens(text)
+    assert tokens is not None
+    assert tokens == list(_to_tokens(text, State()))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "a: 'quoted'",
+        'a: "quoted"',
+        "a: |\n  block",
+        "a: >\n  folded",
+        "a: multi\n  line",
+        "a: 1 # comment",
+        "a:\tb",
+        " a: 1",
+        "a : 1",
+        "'a': 1",
+        "a:1",
+    ],
+)
+def test_options_simple_fast_path_fallback(text):
+    """Other option blocks fall back to the full tokenizer."""
+    assert _simple_to_tokens(text) is None
+
+
+@pytest.mark.param_file(FIXTURE_PATH / "option_parsing.yaml", "yaml")
+def test_options_simple_fast_path_fixtures(file_params):
+    """The fast path yields the same tokens as the full tokenizer, for all fixtures."""
+    tokens = _simple_to_tokens(file_params.content)
+    if tokens is not None:
+        assert tokens == list(_to_tokens(file_params.content, State()))
+
+
+def test_stream_buffer_positions():
+    """Positions are computed from line starts, for all line break styles,
+    and byte order marks do not count as columns.
+    """
+    stream = StreamBuffer("\ufeffab\r\ncd\ref\x85g")
+    positions = []
+    while stream.peek() != "\0":
+        positions.append((stream.peek(), stream.get_position()))
+        stream.forward()
+    assert positions == [
+        ("\ufeff", Position(0, 0, 0)),
+        ("a", Position(1, 0, 0)),
+        ("b", Position(2, 0, 1)),
+        ("\r", Position(3, 0, 2)),
+        ("\n", Position(4, 0, 3)),
+        ("c", Position(5, 1, 0)),
+        ("d", Position(6, 1, 1)),
+        ("\r", Position(7, 1, 2)),
+        ("e", Position(8, 2, 0)),
+        ("f", Position(9, 2, 1)),
+        ("\x85", Position(10, 2, 2)),
+        ("g", Position(11, 3, 0)),
+    ]
@@ -0,0 +1,7 @@
+extensions = ["myst_parser"]
+exclude_patterns = ["_build"]
+myst_enable_extensions = ["substitution"]
+myst_substitutions = {
+    "snippet": "```\nx = 1\n```",
+    "block": "```{code-block}\nx = 1\n```",
+}
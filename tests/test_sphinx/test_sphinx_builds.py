@@ -11,6 +11,7 @@ import sys
 from pathlib import Path
 
 import pytest
+from docutils import nodes
 from sphinx.util.console import strip_colors
 
 SOURCE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "sourcedirs"))
@@ -116,6 +117,29 @@ def test_references(
             )
 
 
+@pytest.mark.sphinx(
+    buildername="html",
+    srcdir=os.path.join(SOURCE_DIR, "references"),
+    freshenv=True,
+    confoverrides={"myst_enable_extensions": ["dollarmath"]},
+)
+def test_intersphinx_index(app):
+    """The intersphinx index is built once, and rebuilt for reloaded inventories."""
+    from sphinx.ext.intersphinx import InventoryAdapter
+
+    from myst_parser.sphinx_ext.myst_refs import get_intersphinx_index
+
+    app.build()
+    index = get_intersphinx_index(app.env)
+    assert get_intersphinx_index(app.env) is index
+    assert any(name == "duplicate" for _, name in index.entries)
+    named = InventoryAdapter(app.env).named_inventory
+    named[next(iter(named))] = {"py:module": {"reloaded": ("p", "v", "u", "-")}}
+    reloaded = get_intersphinx_index(app.env)
+    assert reloaded is not index
+    assert any(name == "reloaded" for _, name in reloaded.entries)
+
+
 @pytest.mark.sphinx(
     buildername="singlehtml",
     srcdir=os.path.join(SOURCE_DIR, "references_singlehtml"),
@@ -784,3 +808,35 @@ def test_include_read_event(app, status, warning):
     assert len(include_read_events) == len(expected_events), "Wrong number of events"
     for evt in expected_events:
         assert evt in include_read_events
+
+
+@pytest.mark.sphinx(
+    buildername="html",
+    srcdir=os.path.join(SOURCE_DIR, "substitutions_highlight"),
+    freshenv=True,
+)
+def test_substitutions_highlight(app, status, warning, get_sphinx_app_doctree):
+    """Test that substitutions use the highlight language of each document."""
+    app.build()
+    assert "build succeeded" in status.getvalue()  # Build succeeded
+    assert warning.getvalue().strip() == ""
+    for docname, language in (("a", "c"), ("b", "ruby")):
+        doctree = get_sphinx_app_doctree(app, docname=docname)
+        blocks = list(doctree.findall(nodes.literal_block))
+        assert [block["language"] for block in blocks] == [language, language]
+
+
+@pytest.mark.sphinx(
+    buildername="html",
+    srcdir=os.path.join(SOURCE_DIR, "commonmark_only"),
+    freshenv=True,
+    confoverrides={"myst_profile": True},
+)
+def test_profile(app, status, warning):
+    """Test that the profile is reported, then discarded, at the end of the build."""
+    from myst_parser import profiling
+
+    app.build()
+    assert "build succeeded" in status.getvalue()  # Build succeeded
+    assert "myst profile:" in status.getvalue()
+    assert profiling.get_profiler() is None
@@ -0,0 +1,78 @@
+"""Test the persistent cache of parsed tokens."""
+
+import pytest
+from docutils.core import publish_doctree
+
+from myst_parser.config.main import MdParserConfig
+from myst_parser.mdit_to_docutils.base import DocutilsRenderer
+from myst_parser.parsers.docutils_ import Parser, cli_html5
+from myst_parser.parsers.mdit import create_md_parser
+from myst_parser.parsers.token_cache import TokenCache, get_token_cache
+
+
+def test_token_cache(tmp_path):
+    """Unchanged sources are rendered from cached tokens."""
+    source = "# Title\n\nA [reference].\n\n[reference]: https://example.com\n"
+    settings = {
+        "myst_token_cache": True,
+        "myst_token_cache_dir": str(tmp_path),
+        "myst_enable_extensions": ["deflist"],
+    }
+
+    def publish():
+        return publish_doctree(source, parser=Parser(), settings_overrides=settings)
+
+    cache = get_token_cache(tmp_path, 256 * 2**20)
+    uncached = publish()
+    assert (cache.hits, cache.misses, cache.writes) == (0, 1, 1)
+    cached = publish()
+    assert (cache.hits, cache.misses, cache.writes) == (1, 1, 1)
+    assert cached.pformat() == uncached.pformat()
+    # the key depends on the configuration
+    settings["myst_enable_extensions"] = ["colon_fence"]
+    publish()
+    assert (cache.hits, cache.misses, cache.writes) == (1, 2, 2)
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_token_cache_batch(tmp_path, capsys, jobs):
+    """The cache usage of all batch conversions is reported once, at the end."""
+    (tmp_path / "src").mkdir()
+    for name in ("a", "b"):
+        (tmp_path / "src" / f"{name}.md").write_text(f"# {name}\n", encoding="utf8")
+    argv = [
+        "--batch",
+        str(tmp_path / "src"),
+        "-j",
+        jobs,
+        "--myst-token-cache=true",
+        f"--myst-token-cache-dir={tmp_path / 'cache'}",
+    ]
+    cli_html5(argv)
+    assert "0 hits, 2 misses, 2 writes" in capsys.readouterr().err
+    cli_html5(argv)
+    err = capsys.readouterr().err
+    assert err.count("MyST token cache") == 1
+    assert "2 hits, 0 misses, 0 writes" in err
+
+
+def test_token_cache_eviction(tmp_path):
+    """The least recently used entries are evicted, beyond the maximum size."""
+    md = create_md_parser(MdParserConfig(), DocutilsRenderer)
+    config = MdParserConfig()
+    texts = [f"# Title {i}\n\n" + "word " * 50 for i in range(4)]
+    cache = TokenCache(tmp_path, 2**20)
+    for text in texts:
+        cache.parse(md, text, config)
+    entry_size = cache.size() // len(texts)
+    cache = TokenCache(tmp_path, entry_size * 2 + entry_size // 2)
+    assert cache.parse(md, texts[0], config)[0] == md.parse(texts[0])
+    assert cache.hits == 1
+    cache.parse(md, "new text\n", config)
+    assert cache.evictions == 3
+    assert cache.get(cache.key(texts[0], config)) is not None
+    assert all(cache.get(cache.key(text, config)) is None for text in texts[1:])
+    # corrupt entries are discarded
+    next(tmp_path.glob("*.tokens")).write_bytes(b"corrupt")
+    assert sum(cache.get(path.stem) is None for path in tmp_path.glob("*.tokens")) == 1
+    assert "evictions" in cache.report()